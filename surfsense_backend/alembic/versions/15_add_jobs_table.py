@@ -0,0 +1,91 @@
+"""Add JobStatus enum and jobs table
+
+Revision ID: 15
+Revises: 14
+"""
+
+from collections.abc import Sequence
+
+from sqlalchemy import inspect
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "15"
+down_revision: str | None = "14"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add JobStatus enum and jobs table."""
+
+    # Create JobStatus enum if it doesn't exist
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'jobstatus') THEN
+                CREATE TYPE jobstatus AS ENUM ('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED');
+            END IF;
+        END$$;
+    """
+    )
+
+    # Create jobs table if it doesn't exist
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id SERIAL PRIMARY KEY,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            task_name VARCHAR(100) NOT NULL,
+            payload JSON NOT NULL DEFAULT '{}',
+            status jobstatus NOT NULL DEFAULT 'QUEUED',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            run_after TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            locked_at TIMESTAMPTZ,
+            locked_by VARCHAR(200),
+            finished_at TIMESTAMPTZ,
+            last_error TEXT,
+            user_id UUID NOT NULL REFERENCES "user"(id) ON DELETE CASCADE
+        );
+    """
+    )
+
+    # Get existing indexes
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    existing_indexes = [idx["name"] for idx in inspector.get_indexes("jobs")]
+
+    # Create indexes only if they don't already exist
+    if "ix_jobs_id" not in existing_indexes:
+        op.create_index("ix_jobs_id", "jobs", ["id"])
+    if "ix_jobs_created_at" not in existing_indexes:
+        op.create_index("ix_jobs_created_at", "jobs", ["created_at"])
+    if "ix_jobs_task_name" not in existing_indexes:
+        op.create_index("ix_jobs_task_name", "jobs", ["task_name"])
+    if "ix_jobs_status" not in existing_indexes:
+        op.create_index("ix_jobs_status", "jobs", ["status"])
+    if "ix_jobs_run_after" not in existing_indexes:
+        op.create_index("ix_jobs_run_after", "jobs", ["run_after"])
+    if "ix_jobs_user_id" not in existing_indexes:
+        op.create_index("ix_jobs_user_id", "jobs", ["user_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove jobs table and enum."""
+
+    # Drop indexes
+    op.drop_index("ix_jobs_user_id", table_name="jobs")
+    op.drop_index("ix_jobs_run_after", table_name="jobs")
+    op.drop_index("ix_jobs_status", table_name="jobs")
+    op.drop_index("ix_jobs_task_name", table_name="jobs")
+    op.drop_index("ix_jobs_created_at", table_name="jobs")
+    op.drop_index("ix_jobs_id", table_name="jobs")
+
+    # Drop jobs table
+    op.drop_table("jobs")
+
+    # Drop enum
+    op.execute("DROP TYPE IF EXISTS jobstatus")
@@ -0,0 +1,40 @@
+"""Add sync_state column to search_source_connectors table
+
+Revision ID: 16
+Revises: 15
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "16"
+down_revision: str | None = "15"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [col["name"] for col in inspector.get_columns("search_source_connectors")]
+
+    # Only add the column if it doesn't already exist
+    if "sync_state" not in columns:
+        op.add_column(
+            "search_source_connectors",
+            sa.Column("sync_state", sa.JSON(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [col["name"] for col in inspector.get_columns("search_source_connectors")]
+
+    if "sync_state" in columns:
+        op.drop_column("search_source_connectors", "sync_state")
@@ -0,0 +1,65 @@
+"""Add embedding_hash column to chunks table
+
+Revision ID: 17
+Revises: 16
+"""
+
+import os
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "17"
+down_revision: str | None = "16"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [col["name"] for col in inspector.get_columns("chunks")]
+    existing_indexes = [idx["name"] for idx in inspector.get_indexes("chunks")]
+
+    # Only add the column if it doesn't already exist
+    if "embedding_hash" not in columns:
+        op.add_column(
+            "chunks",
+            sa.Column("embedding_hash", sa.String(length=64), nullable=True),
+        )
+
+    if "ix_chunks_embedding_hash" not in existing_indexes:
+        op.create_index("ix_chunks_embedding_hash", "chunks", ["embedding_hash"])
+
+    # Backfill hashes of existing chunks, matching
+    # app.utils.document_converters.generate_chunk_embedding_hash. Chunks are
+    # assumed to have been embedded with the currently configured model.
+    embedding_model = os.getenv("EMBEDDING_MODEL")
+    if embedding_model:
+        op.execute(
+            sa.text(
+                """
+                UPDATE chunks
+                SET embedding_hash = encode(
+                    sha256(convert_to(:model || E'\\n' || content, 'UTF8')), 'hex'
+                )
+                WHERE embedding_hash IS NULL AND embedding IS NOT NULL
+                """
+            ).bindparams(model=embedding_model)
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [col["name"] for col in inspector.get_columns("chunks")]
+    existing_indexes = [idx["name"] for idx in inspector.get_indexes("chunks")]
+
+    if "ix_chunks_embedding_hash" in existing_indexes:
+        op.drop_index("ix_chunks_embedding_hash", table_name="chunks")
+    if "embedding_hash" in columns:
+        op.drop_column("chunks", "embedding_hash")
@@ -0,0 +1,112 @@
+"""Add stored search_vector tsvector columns to chunks and documents
+
+Revision ID: 18
+Revises: 17
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "18"
+down_revision: str | None = "17"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Rows backfilled per transaction
+BACKFILL_BATCH_SIZE = 5000
+
+# Table -> (new GIN index, expression index it replaces)
+SEARCH_INDEXES = {
+    "documents": ("document_search_vector_index", "document_search_index"),
+    "chunks": ("chunks_search_vector_index", "chucks_search_index"),
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    for table in SEARCH_INDEXES:
+        columns = [col["name"] for col in inspector.get_columns(table)]
+
+        # Only add the column if it doesn't already exist
+        if "search_vector" not in columns:
+            op.add_column(table, sa.Column("search_vector", TSVECTOR(), nullable=True))
+
+        # Keep the vector of new and edited rows up to date. A generated column
+        # would rewrite the whole table in one locked statement instead of the
+        # batched backfill below.
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table}")
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_search_vector_update
+            BEFORE INSERT OR UPDATE OF content ON {table}
+            FOR EACH ROW EXECUTE FUNCTION tsvector_update_trigger(
+                search_vector, 'pg_catalog.english', content
+            )
+            """
+        )
+
+    # Backfill existing rows in batches of ids, committing each batch, then
+    # build the indexes without blocking writes
+    with op.get_context().autocommit_block():
+        for table, (index_name, old_index_name) in SEARCH_INDEXES.items():
+            last_id = 0
+            while True:
+                batch_end = bind.execute(
+                    sa.text(
+                        f"""
+                        SELECT max(id) FROM (
+                            SELECT id FROM {table}
+                            WHERE id > :last_id
+                            ORDER BY id
+                            LIMIT :batch_size
+                        ) AS batch
+                        """
+                    ),
+                    {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE},
+                ).scalar()
+                if batch_end is None:
+                    break
+
+                bind.execute(
+                    sa.text(
+                        f"""
+                        UPDATE {table}
+                        SET search_vector = to_tsvector('english', content)
+                        WHERE id > :last_id AND id <= :batch_end
+                        AND search_vector IS NULL
+                        """
+                    ),
+                    {"last_id": last_id, "batch_end": batch_end},
+                )
+                last_id = batch_end
+
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+                f"ON {table} USING gin (search_vector)"
+            )
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {old_index_name}")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    for table, (index_name, old_index_name) in SEARCH_INDEXES.items():
+        columns = [col["name"] for col in inspector.get_columns(table)]
+
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {old_index_name} "
+            f"ON {table} USING gin (to_tsvector('english', content))"
+        )
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table}")
+        if "search_vector" in columns:
+            op.drop_column(table, "search_vector")
@@ -0,0 +1,116 @@
+"""Add search_space_id and document_type columns to chunks table
+
+Revision ID: 19
+Revises: 18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "19"
+down_revision: str | None = "18"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Chunks backfilled per transaction
+BACKFILL_BATCH_SIZE = 5000
+
+INDEX_NAME = "ix_chunks_search_space_id_document_type"
+FOREIGN_KEY_NAME = "chunks_search_space_id_fkey"
+
+BACKFILL_SQL = """
+    UPDATE chunks
+    SET search_space_id = documents.search_space_id,
+        document_type = documents.document_type
+    FROM documents
+    WHERE chunks.document_id = documents.id
+    AND chunks.search_space_id IS NULL
+"""
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [col["name"] for col in inspector.get_columns("chunks")]
+
+    # Only add the columns if they don't already exist
+    if "search_space_id" not in columns:
+        op.add_column(
+            "chunks", sa.Column("search_space_id", sa.Integer(), nullable=True)
+        )
+        op.create_foreign_key(
+            FOREIGN_KEY_NAME,
+            "chunks",
+            "searchspaces",
+            ["search_space_id"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+    if "document_type" not in columns:
+        op.add_column(
+            "chunks",
+            sa.Column(
+                "document_type",
+                postgresql.ENUM(name="documenttype", create_type=False),
+                nullable=True,
+            ),
+        )
+
+    # Copy the values from the documents in batches of chunk ids, committing
+    # each batch, then catch up on chunks written meanwhile
+    with op.get_context().autocommit_block():
+        last_id = 0
+        while True:
+            batch_end = bind.execute(
+                sa.text(
+                    """
+                    SELECT max(id) FROM (
+                        SELECT id FROM chunks
+                        WHERE id > :last_id
+                        ORDER BY id
+                        LIMIT :batch_size
+                    ) AS batch
+                    """
+                ),
+                {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE},
+            ).scalar()
+            if batch_end is None:
+                break
+
+            bind.execute(
+                sa.text(
+                    BACKFILL_SQL
+                    + " AND chunks.id > :last_id AND chunks.id <= :batch_end"
+                ),
+                {"last_id": last_id, "batch_end": batch_end},
+            )
+            last_id = batch_end
+
+        op.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} "
+            "ON chunks (search_space_id, document_type)"
+        )
+
+    op.execute(BACKFILL_SQL)
+    op.alter_column("chunks", "search_space_id", nullable=False)
+    op.alter_column("chunks", "document_type", nullable=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [col["name"] for col in inspector.get_columns("chunks")]
+    existing_indexes = [idx["name"] for idx in inspector.get_indexes("chunks")]
+
+    if INDEX_NAME in existing_indexes:
+        op.drop_index(INDEX_NAME, table_name="chunks")
+    if "document_type" in columns:
+        op.drop_column("chunks", "document_type")
+    if "search_space_id" in columns:
+        op.drop_column("chunks", "search_space_id")
@@ -0,0 +1,75 @@
+"""Build the vector indexes of the configured VECTOR_INDEX_MODE
+
+Revision ID: 20
+Revises: 19
+"""
+
+import os
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20"
+down_revision: str | None = "19"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Table -> vector index name prefix
+VECTOR_INDEX_PREFIXES = {
+    "documents": "document_vector",
+    "chunks": "chucks_vector",
+}
+
+# Mode -> (index name suffix, indexed expression with its operator class)
+VECTOR_INDEX_DEFINITIONS = {
+    "full": ("", "(embedding public.vector_cosine_ops)"),
+    "halfvec": ("_halfvec", "((embedding::halfvec({dimension})) halfvec_cosine_ops)"),
+    "binary": (
+        "_binary",
+        "((binary_quantize(embedding)::bit({dimension})) bit_hamming_ops)",
+    ),
+}
+
+
+def _build_vector_indexes(mode: str) -> None:
+    bind = op.get_bind()
+    suffix, definition = VECTOR_INDEX_DEFINITIONS[mode]
+
+    # Build the new indexes before dropping the others, without blocking writes
+    with op.get_context().autocommit_block():
+        for table, prefix in VECTOR_INDEX_PREFIXES.items():
+            # The typmod of a vector column is its dimension
+            dimension = bind.execute(
+                sa.text(
+                    """
+                    SELECT atttypmod FROM pg_attribute
+                    WHERE attrelid = CAST(:table AS regclass)
+                    AND attname = 'embedding'
+                    """
+                ),
+                {"table": table},
+            ).scalar()
+
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {prefix}{suffix}_index "
+                f"ON {table} USING hnsw {definition.format(dimension=dimension)}"
+            )
+            for other_suffix, _ in VECTOR_INDEX_DEFINITIONS.values():
+                if other_suffix != suffix:
+                    op.execute(
+                        f"DROP INDEX CONCURRENTLY IF EXISTS {prefix}{other_suffix}_index"
+                    )
+
+
+def upgrade() -> None:
+    mode = os.getenv("VECTOR_INDEX_MODE", "full").lower()
+    if mode not in VECTOR_INDEX_DEFINITIONS:
+        mode = "full"
+    _build_vector_indexes(mode)
+
+
+def downgrade() -> None:
+    _build_vector_indexes("full")
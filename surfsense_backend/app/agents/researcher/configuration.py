@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, fields
+from dataclasses import dataclass, field, fields
 from enum import Enum
 
 from langchain_core.runnables import RunnableConfig
@@ -37,6 +37,12 @@ class Configuration:
     search_mode: SearchMode
     research_mode: ResearchMode
     document_ids_to_add_in_context: list[int]
+    # Retrieval profile of connector searches, overrides per connector, and
+    # overrides of the profiles' RRF weights
+    retrieval_profile: str | None = None
+    connector_retrieval_profiles: dict[str, str] = field(default_factory=dict)
+    semantic_weight: float | None = None
+    keyword_weight: float | None = None
 
     @classmethod
     def from_runnable_config(
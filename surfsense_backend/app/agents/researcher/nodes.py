@@ -10,7 +10,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 # Additional imports for document fetching
 from sqlalchemy.future import select
 
-from app.db import Document, SearchSpace
+from app.db import Document, SearchSpace, async_session_maker
+from app.retriver.documents_hybrid_search import DocumentHybridSearchRetriever
 from app.services.connector_service import ConnectorService
 from app.services.query_service import QueryService
 
@@ -61,20 +62,13 @@ async def fetch_documents_by_ids(
         documents_by_type = {}
         formatted_documents = []
 
-        for doc in documents:
-            # Fetch associated chunks for this document (similar to DocumentHybridSearchRetriever)
-            from app.db import Chunk
-
-            chunks_query = (
-                select(Chunk).where(Chunk.document_id == doc.id).order_by(Chunk.id)
-            )
-            chunks_result = await db_session.execute(chunks_query)
-            chunks = chunks_result.scalars().all()
+        # Load the concatenated chunks of all documents in one query (similar to SearchMode.DOCUMENTS approach)
+        chunks_content = await DocumentHybridSearchRetriever(
+            db_session
+        ).fetch_chunks_content([doc.id for doc in documents])
 
-            # Concatenate chunks content (similar to SearchMode.DOCUMENTS approach)
-            concatenated_chunks_content = (
-                " ".join([chunk.content for chunk in chunks]) if chunks else doc.content
-            )
+        for doc in documents:
+            concatenated_chunks_content = chunks_content.get(doc.id, doc.content)
 
             # Format to match connector service return format
             formatted_doc = {
@@ -511,6 +505,81 @@ async def write_answer_outline(
         raise
 
 
+# Maximum number of (question, connector) searches run concurrently
+MAX_CONCURRENT_CONNECTOR_SEARCHES = 8
+
+# Terminal message streamed after a connector search completes
+CONNECTOR_FOUND_MESSAGES = {
+    "YOUTUBE_VIDEO": "📹 Found {count} YouTube chunks related to your query",
+    "EXTENSION": "🧩 Found {count} Browser Extension chunks related to your query",
+    "CRAWLED_URL": "🌐 Found {count} Web Pages chunks related to your query",
+    "FILE": "📄 Found {count} Files chunks related to your query",
+    "SLACK_CONNECTOR": "💬 Found {count} Slack messages related to your query",
+    "NOTION_CONNECTOR": "📘 Found {count} Notion pages/blocks related to your query",
+    "GITHUB_CONNECTOR": "🐙 Found {count} GitHub files/issues related to your query",
+    "LINEAR_CONNECTOR": "📊 Found {count} Linear issues related to your query",
+    "TAVILY_API": "🔍 Found {count} Web Search results related to your query",
+    "LINKUP_API": "🔗 Found {count} Linkup results related to your query",
+    "DISCORD_CONNECTOR": "🗨️ Found {count} Discord messages related to your query",
+    "JIRA_CONNECTOR": "🎫 Found {count} Jira issues related to your query",
+    "CONFLUENCE_CONNECTOR": "📚 Found {count} Confluence pages related to your query",
+}
+
+# ConnectorService search method for each local (search space) connector
+LOCAL_CONNECTOR_SEARCH_METHODS = {
+    "YOUTUBE_VIDEO": "search_youtube",
+    "EXTENSION": "search_extension",
+    "CRAWLED_URL": "search_crawled_urls",
+    "FILE": "search_files",
+    "SLACK_CONNECTOR": "search_slack",
+    "NOTION_CONNECTOR": "search_notion",
+    "GITHUB_CONNECTOR": "search_github",
+    "LINEAR_CONNECTOR": "search_linear",
+    "DISCORD_CONNECTOR": "search_discord",
+    "JIRA_CONNECTOR": "search_jira",
+    "CONFLUENCE_CONNECTOR": "search_confluence",
+}
+
+
+async def _search_connector(
+    connector_service: ConnectorService,
+    connector: str,
+    query: str,
+    user_id: str,
+    search_space_id: int,
+    top_k: int,
+    search_mode: SearchMode,
+) -> tuple[Any, list[dict[str, Any]]]:
+    """
+    Run a single connector search.
+
+    Returns:
+        Tuple of (source_object, chunks); (None, []) for unknown connectors
+    """
+    if connector in LOCAL_CONNECTOR_SEARCH_METHODS:
+        search_method = getattr(
+            connector_service, LOCAL_CONNECTOR_SEARCH_METHODS[connector]
+        )
+        return await search_method(
+            user_query=query,
+            user_id=user_id,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            search_mode=search_mode,
+        )
+    elif connector == "TAVILY_API":
+        return await connector_service.search_tavily(
+            user_query=query, user_id=user_id, top_k=top_k
+        )
+    elif connector == "LINKUP_API":
+        linkup_mode = "standard"
+        return await connector_service.search_linkup(
+            user_query=query, user_id=user_id, mode=linkup_mode
+        )
+
+    return None, []
+
+
 async def fetch_relevant_documents(
     research_questions: list[str],
     user_id: str,
@@ -523,6 +592,7 @@ async def fetch_relevant_documents(
     connector_service: ConnectorService = None,
     search_mode: SearchMode = SearchMode.CHUNKS,
     user_selected_sources: list[dict[str, Any]] | None = None,
+    max_concurrent_searches: int = MAX_CONCURRENT_CONNECTOR_SEARCHES,
 ) -> list[dict[str, Any]]:
     """
     Fetch relevant documents for research questions using the provided connectors.
@@ -542,6 +612,9 @@ async def fetch_relevant_documents(
         state: The current state containing the streaming service
         top_k: Number of top results to retrieve per connector per question
         connector_service: An initialized connector service to use for searching
+        search_mode: Whether to search chunks or whole documents
+        user_selected_sources: Source objects for user-selected documents
+        max_concurrent_searches: Maximum number of connector searches running at once
 
     Returns:
         List of relevant documents
@@ -582,387 +655,147 @@ async def fetch_relevant_documents(
     all_raw_documents = []  # Store all raw documents
     all_sources = []  # Store all sources
 
-    for i, user_query in enumerate(research_questions):
-        # Stream question being researched
-        if streaming_service and writer:
-            writer(
-                {
-                    "yield_value": streaming_service.format_terminal_info_delta(
-                        f'🧠 Researching question {i + 1}/{len(research_questions)}: "{user_query[:100]}..."'
-                    )
-                }
+    # Fetch the results of the whole (question, connector) search matrix
+    # concurrently, bounded by a semaphore. Each fetch gets its own DB session
+    # since an AsyncSession cannot be shared between concurrent tasks. Source
+    # objects are only built afterwards, in matrix order.
+    semaphore = asyncio.Semaphore(max(1, max_concurrent_searches))
+
+    async def run_prefetch(query: str) -> None:
+        async with semaphore, async_session_maker() as search_session:
+            await connector_service.with_session(
+                search_session
+            ).prefetch_local_search_results(
+                user_query=query,
+                user_id=user_id,
+                search_space_id=search_space_id,
+                connectors=connectors_to_search,
+                top_k=top_k,
+                search_mode=search_mode,
             )
 
-        # Use original research question as the query
-        reformulated_query = user_query
+    # One multi-type hybrid search per question covers all local connectors
+    prefetch_tasks = [
+        asyncio.create_task(run_prefetch(user_query))
+        for user_query in research_questions
+    ]
 
-        # Process each selected connector
-        for connector in connectors_to_search:
-            # Stream connector being searched
+    async def run_fetch(question_index: int, query: str, connector: str) -> None:
+        try:
+            await prefetch_tasks[question_index]
+        except Exception as e:
+            # Searches fall back to one query per connector
+            print(f"Error prefetching local search results: {e!s}")
+
+        async with semaphore, async_session_maker() as search_session:
+            await connector_service.with_session(
+                search_session
+            ).prefetch_connector_results(
+                user_query=query,
+                user_id=user_id,
+                search_space_id=search_space_id,
+                connector=connector,
+                top_k=top_k,
+                search_mode=search_mode,
+            )
+
+    fetch_tasks = [
+        [
+            asyncio.create_task(run_fetch(i, user_query, connector))
+            for connector in connectors_to_search
+        ]
+        for i, user_query in enumerate(research_questions)
+    ]
+
+    try:
+        # Consume results in matrix order so source IDs, documents and terminal
+        # messages come out in the same deterministic order as a serial run
+        for i, user_query in enumerate(research_questions):
+            # Stream question being researched
             if streaming_service and writer:
-                connector_emoji = get_connector_emoji(connector)
-                friendly_name = get_connector_friendly_name(connector)
                 writer(
                     {
                         "yield_value": streaming_service.format_terminal_info_delta(
-                            f"{connector_emoji} Searching {friendly_name} for relevant information..."
+                            f'🧠 Researching question {i + 1}/{len(research_questions)}: "{user_query[:100]}..."'
                         )
                     }
                 )
 
-            try:
-                if connector == "YOUTUBE_VIDEO":
-                    (
-                        source_object,
-                        youtube_chunks,
-                    ) = await connector_service.search_youtube(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(youtube_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"📹 Found {len(youtube_chunks)} YouTube chunks related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "EXTENSION":
-                    (
-                        source_object,
-                        extension_chunks,
-                    ) = await connector_service.search_extension(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(extension_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🧩 Found {len(extension_chunks)} Browser Extension chunks related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "CRAWLED_URL":
-                    (
-                        source_object,
-                        crawled_urls_chunks,
-                    ) = await connector_service.search_crawled_urls(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(crawled_urls_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🌐 Found {len(crawled_urls_chunks)} Web Pages chunks related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "FILE":
-                    source_object, files_chunks = await connector_service.search_files(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(files_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"📄 Found {len(files_chunks)} Files chunks related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "SLACK_CONNECTOR":
-                    source_object, slack_chunks = await connector_service.search_slack(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(slack_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"💬 Found {len(slack_chunks)} Slack messages related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "NOTION_CONNECTOR":
-                    (
-                        source_object,
-                        notion_chunks,
-                    ) = await connector_service.search_notion(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(notion_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"📘 Found {len(notion_chunks)} Notion pages/blocks related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "GITHUB_CONNECTOR":
-                    (
-                        source_object,
-                        github_chunks,
-                    ) = await connector_service.search_github(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(github_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🐙 Found {len(github_chunks)} GitHub files/issues related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "LINEAR_CONNECTOR":
-                    (
-                        source_object,
-                        linear_chunks,
-                    ) = await connector_service.search_linear(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(linear_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"📊 Found {len(linear_chunks)} Linear issues related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "TAVILY_API":
-                    (
-                        source_object,
-                        tavily_chunks,
-                    ) = await connector_service.search_tavily(
-                        user_query=reformulated_query, user_id=user_id, top_k=top_k
-                    )
-
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(tavily_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🔍 Found {len(tavily_chunks)} Web Search results related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "LINKUP_API":
-                    linkup_mode = "standard"
-
-                    (
-                        source_object,
-                        linkup_chunks,
-                    ) = await connector_service.search_linkup(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        mode=linkup_mode,
+            for connector, fetch_task in zip(
+                connectors_to_search, fetch_tasks[i], strict=True
+            ):
+                # Stream connector being searched
+                if streaming_service and writer:
+                    connector_emoji = get_connector_emoji(connector)
+                    friendly_name = get_connector_friendly_name(connector)
+                    writer(
+                        {
+                            "yield_value": streaming_service.format_terminal_info_delta(
+                                f"{connector_emoji} Searching {friendly_name} for relevant information..."
+                            )
+                        }
                     )
 
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(linkup_chunks)
-
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🔗 Found {len(linkup_chunks)} Linkup results related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "DISCORD_CONNECTOR":
-                    (
-                        source_object,
-                        discord_chunks,
-                    ) = await connector_service.search_discord(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(discord_chunks)
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🗨️ Found {len(discord_chunks)} Discord messages related to your query"
-                                )
-                            }
-                        )
-
-                elif connector == "JIRA_CONNECTOR":
-                    source_object, jira_chunks = await connector_service.search_jira(
-                        user_query=reformulated_query,
+                try:
+                    try:
+                        await fetch_task
+                    except Exception as e:
+                        # The search below runs the query itself instead
+                        print(f"Error prefetching {connector} results: {e!s}")
+
+                    # Build the sources from the fetched results on the shared
+                    # counter, in matrix order
+                    source_object, chunks = await _search_connector(
+                        connector_service=connector_service,
+                        connector=connector,
+                        query=user_query,
                         user_id=user_id,
                         search_space_id=search_space_id,
                         top_k=top_k,
                         search_mode=search_mode,
                     )
+                except Exception as e:
+                    error_message = f"Error searching connector {connector}: {e!s}"
+                    print(error_message)
 
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(jira_chunks)
-
-                    # Stream found document count
+                    # Stream error message
                     if streaming_service and writer:
+                        friendly_name = get_connector_friendly_name(connector)
                         writer(
                             {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"🎫 Found {len(jira_chunks)} Jira issues related to your query"
+                                "yield_value": streaming_service.format_error(
+                                    f"Error searching {friendly_name}: {e!s}"
                                 )
                             }
                         )
-                elif connector == "CONFLUENCE_CONNECTOR":
-                    (
-                        source_object,
-                        confluence_chunks,
-                    ) = await connector_service.search_confluence(
-                        user_query=reformulated_query,
-                        user_id=user_id,
-                        search_space_id=search_space_id,
-                        top_k=top_k,
-                        search_mode=search_mode,
-                    )
 
-                    # Add to sources and raw documents
-                    if source_object:
-                        all_sources.append(source_object)
-                    all_raw_documents.extend(confluence_chunks)
+                    # Continue with other connectors on error
+                    continue
 
-                    # Stream found document count
-                    if streaming_service and writer:
-                        writer(
-                            {
-                                "yield_value": streaming_service.format_terminal_info_delta(
-                                    f"📚 Found {len(confluence_chunks)} Confluence pages related to your query"
-                                )
-                            }
-                        )
+                if connector not in CONNECTOR_FOUND_MESSAGES:
+                    continue
 
-            except Exception as e:
-                error_message = f"Error searching connector {connector}: {e!s}"
-                print(error_message)
+                # Add to sources and raw documents
+                if source_object:
+                    all_sources.append(source_object)
+                all_raw_documents.extend(chunks)
 
-                # Stream error message
+                # Stream found document count
                 if streaming_service and writer:
-                    friendly_name = get_connector_friendly_name(connector)
                     writer(
                         {
-                            "yield_value": streaming_service.format_error(
-                                f"Error searching {friendly_name}: {e!s}"
+                            "yield_value": streaming_service.format_terminal_info_delta(
+                                CONNECTOR_FOUND_MESSAGES[connector].format(
+                                    count=len(chunks)
+                                )
                             )
                         }
                     )
-
-                # Continue with other connectors on error
-                continue
+    finally:
+        # Don't leave searches running if we were cancelled or failed midway
+        for task in [*prefetch_tasks, *(task for row in fetch_tasks for task in row)]:
+            if not task.done():
+                task.cancel()
 
     # Deduplicate source objects by ID before streaming
     deduplicated_sources = []
@@ -1198,7 +1031,12 @@ async def process_sections(
 
         # Create connector service using state db_session
         connector_service = ConnectorService(
-            state.db_session, user_id=configuration.user_id
+            state.db_session,
+            user_id=configuration.user_id,
+            retrieval_profile=configuration.retrieval_profile,
+            connector_retrieval_profiles=configuration.connector_retrieval_profiles,
+            semantic_weight=configuration.semantic_weight,
+            keyword_weight=configuration.keyword_weight,
         )
         await connector_service.initialize_counter()
 
@@ -1624,7 +1462,12 @@ async def handle_qna_workflow(
 
         # Create connector service using state db_session
         connector_service = ConnectorService(
-            state.db_session, user_id=configuration.user_id
+            state.db_session,
+            user_id=configuration.user_id,
+            retrieval_profile=configuration.retrieval_profile,
+            connector_retrieval_profiles=configuration.connector_retrieval_profiles,
+            semantic_weight=configuration.semantic_weight,
+            keyword_weight=configuration.keyword_weight,
         )
         await connector_service.initialize_counter()
 
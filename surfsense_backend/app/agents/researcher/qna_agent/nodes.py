@@ -63,7 +63,7 @@ async def rerank_documents(state: State, config: RunnableConfig) -> dict[str, An
             ]
 
             # Rerank documents using the user's query
-            reranked_docs = reranker_service.rerank_documents(
+            reranked_docs = await reranker_service.rerank_documents(
                 user_query + "\n" + reformulated_query, reranker_input_docs
             )
 
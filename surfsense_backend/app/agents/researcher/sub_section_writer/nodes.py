@@ -70,7 +70,7 @@ async def rerank_documents(state: State, config: RunnableConfig) -> dict[str, An
             ]
 
             # Rerank documents using the section title
-            reranked_docs = reranker_service.rerank_documents(
+            reranked_docs = await reranker_service.rerank_documents(
                 rerank_query, reranker_input_docs
             )
 
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import Depends, FastAPI
@@ -8,15 +9,31 @@ from app.config import config
 from app.db import User, create_db_and_tables, get_async_session
 from app.routes import router as crud_router
 from app.schemas import UserCreate, UserRead, UserUpdate
+from app.tasks.job_queue import JobWorker
 from app.users import SECRET, auth_backend, current_active_user, fastapi_users
+from app.utils.http_client import close_http_client
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Not needed if you setup a migration system like Alembic
     await create_db_and_tables()
+
+    # Consume queued ingestion jobs in-process unless dedicated workers do it
+    job_worker = None
+    job_worker_task = None
+    if config.JOB_QUEUE_EMBEDDED_WORKER:
+        job_worker = JobWorker()
+        job_worker_task = asyncio.create_task(job_worker.run())
+
     yield
 
+    if job_worker is not None:
+        job_worker.stop()
+        await job_worker_task
+
+    await close_http_client()
+
 
 app = FastAPI(lifespan=lifespan)
 
@@ -73,3 +90,12 @@ async def authenticated_route(
     session: AsyncSession = Depends(get_async_session),
 ):
     return {"message": "Token is valid"}
+
+
+@app.get("/stats/embeddings")
+async def embedding_stats(user: User = Depends(current_active_user)):
+    """Throughput counters for the embedding pipeline and query embedding cache."""
+    return {
+        "embedding_service": config.embedding_service.get_stats(),
+        "query_embedding_cache": config.query_embedding_cache.get_stats(),
+    }
@@ -0,0 +1,106 @@
+"""
+Benchmark of chunk persistence: ORM inserts through the ``Document.chunks``
+relationship versus the bulk path of ``app.utils.document_persistence``.
+
+Every run writes documents with random embeddings into an existing search
+space and rolls the transaction back, so nothing is left in the database.
+
+    python -m app.benchmarks.chunk_inserts --search-space-id 1 --chunks 10000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+from app.config import config
+from app.db import Chunk, Document, DocumentType, async_session_maker
+from app.utils.document_persistence import create_document
+
+
+def make_chunks(count: int, dimension: int, rng: random.Random) -> list[Chunk]:
+    """Chunks with unique texts and random embeddings."""
+    return [
+        Chunk(
+            content=f"Benchmark chunk {i} {uuid.uuid4().hex}",
+            embedding=[rng.random() for _ in range(dimension)],
+            embedding_hash=uuid.uuid4().hex,
+        )
+        for i in range(count)
+    ]
+
+
+def document_fields(search_space_id: int, dimension: int, rng: random.Random):
+    """Column values of a benchmark document with a unique content hash."""
+    return {
+        "search_space_id": search_space_id,
+        "title": "Chunk insert benchmark",
+        "document_type": DocumentType.FILE,
+        "document_metadata": {},
+        "content": "Chunk insert benchmark",
+        "content_hash": uuid.uuid4().hex,
+        "embedding": [rng.random() for _ in range(dimension)],
+    }
+
+
+async def insert_with_orm(session, chunks, fields) -> None:
+    """The previous path: one INSERT per chunk through the relationship cascade."""
+    for chunk in chunks:
+        chunk.search_space_id = fields["search_space_id"]
+        chunk.document_type = fields["document_type"]
+    session.add(Document(chunks=chunks, **fields))
+    await session.flush()
+
+
+async def insert_in_bulk(session, chunks, fields) -> None:
+    """The bulk path: one document INSERT and one COPY of its chunks."""
+    await create_document(session, chunks, **fields)
+
+
+async def measure(strategy, args, dimension: int, rng: random.Random) -> float:
+    """Insert all chunks with a strategy and return the rows per second."""
+    batches = [
+        make_chunks(args.chunks_per_document, dimension, rng)
+        for _ in range(args.chunks // args.chunks_per_document)
+    ]
+    rows = sum(len(chunks) for chunks in batches)
+
+    async with async_session_maker() as session:
+        try:
+            started = time.perf_counter()
+            for chunks in batches:
+                await strategy(
+                    session,
+                    chunks,
+                    document_fields(args.search_space_id, dimension, rng),
+                )
+            elapsed = time.perf_counter() - started
+        finally:
+            await session.rollback()
+
+    return rows / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--search-space-id", type=int, required=True)
+    parser.add_argument("--chunks", type=int, default=10000)
+    parser.add_argument("--chunks-per-document", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dimension = config.embedding_model_instance.dimension
+    rng = random.Random(args.seed)
+    print(
+        f"Inserting {args.chunks} chunks ({args.chunks_per_document} per document, "
+        f"{dimension} dimensions)"
+    )
+
+    for name, strategy in (("orm", insert_with_orm), ("bulk", insert_in_bulk)):
+        rows_per_second = await measure(strategy, args, dimension, rng)
+        print(f"{name:>5}: {rows_per_second:,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,337 @@
+"""
+Benchmark of the chunk and document retrievers: latency, throughput and
+recall@k against an exact brute-force search.
+
+A synthetic corpus is loaded into new search spaces of an existing user. Its
+texts and embeddings are generated from a seed around a number of topics, and
+queries get fake embeddings near their topic instead of calling the embedding
+model. Every retriever runs each query once per combination of top_k,
+hnsw.ef_search and RRF k, overriding those of a retrieval profile, and its
+results are compared with the same search run with index scans disabled.
+The transaction is rolled back at the end, so nothing is left in the
+database.
+
+    python -m app.benchmarks.retrieval --user-id <uuid> --documents 1000 \\
+        --profile balanced --ef-search 40 100 200 --top-k 10 20 --rrf-k 60
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, replace
+
+import numpy as np
+from sqlalchemy import text
+
+from app.config import config
+from app.db import Chunk, DocumentType, SearchSpace, async_session_maker
+from app.retriver.chunks_hybrid_search import ChucksHybridSearchRetriever
+from app.retriver.documents_hybrid_search import DocumentHybridSearchRetriever
+from app.retriver.retrieval_profiles import RETRIEVAL_PROFILES, RetrievalProfile
+from app.utils.document_persistence import create_document
+
+# Words per topic vocabulary, and of the vocabulary shared by all topics
+TOPIC_VOCABULARY_SIZE = 50
+SHARED_VOCABULARY_SIZE = 500
+
+# Words per chunk and per query, and the share of chunk words from its topic
+CHUNK_WORDS = 40
+QUERY_WORDS = 2
+TOPIC_WORD_SHARE = 0.6
+
+# Scale of the noise added to topic centroids, relative to the centroids
+EMBEDDING_NOISE = 1.0
+
+
+@dataclass
+class BenchmarkQuery:
+    text: str
+    embedding: np.ndarray
+    search_space_id: int | None = None
+
+
+class FakeQueryEmbeddings:
+    """Stands in for the query embedding cache with the generated embeddings."""
+
+    def __init__(self, queries: list[BenchmarkQuery]):
+        self.embeddings = {query.text: query.embedding for query in queries}
+
+    async def get_embedding(self, query_text: str):
+        # Queries with the same text share the embedding generated last
+        return self.embeddings[query_text]
+
+
+class SyntheticCorpus:
+    """Deterministic texts and embeddings clustered around random topics."""
+
+    def __init__(self, topics: int, dimension: int, seed: int):
+        self.rng = np.random.default_rng(seed)
+        self.dimension = dimension
+        self.centroids = self.rng.standard_normal((topics, dimension))
+        self.topic_words = [
+            [self._word() for _ in range(TOPIC_VOCABULARY_SIZE)] for _ in range(topics)
+        ]
+        self.shared_words = [self._word() for _ in range(SHARED_VOCABULARY_SIZE)]
+
+    def _word(self) -> str:
+        letters = self.rng.integers(0, 26, size=8)
+        return "".join(chr(ord("a") + letter) for letter in letters)
+
+    def topic(self) -> int:
+        return int(self.rng.integers(len(self.centroids)))
+
+    def embedding(self, topic: int) -> np.ndarray:
+        noise = self.rng.standard_normal(self.dimension) * EMBEDDING_NOISE
+        embedding = self.centroids[topic] + noise
+        return (embedding / np.linalg.norm(embedding)).astype(np.float32)
+
+    def words(self, topic: int, count: int, topic_share: float) -> str:
+        topic_count = round(count * topic_share)
+        words = list(self.rng.choice(self.topic_words[topic], size=topic_count))
+        words += list(self.rng.choice(self.shared_words, size=count - topic_count))
+        self.rng.shuffle(words)
+        return " ".join(words)
+
+    def query(self, search_space_id: int) -> BenchmarkQuery:
+        topic = self.topic()
+        return BenchmarkQuery(
+            text=self.words(topic, QUERY_WORDS, 1.0),
+            embedding=self.embedding(topic),
+            search_space_id=search_space_id,
+        )
+
+
+async def load_corpus(session, corpus: SyntheticCorpus, args) -> list[int]:
+    """Create the search spaces and their documents, returning the space IDs."""
+    search_space_ids = []
+    for space in range(args.search_spaces):
+        search_space = SearchSpace(
+            name=f"Retrieval benchmark {space}", user_id=args.user_id
+        )
+        session.add(search_space)
+        await session.flush()
+        search_space_ids.append(search_space.id)
+
+        for document in range(args.documents):
+            topic = corpus.topic()
+            chunks = [
+                Chunk(
+                    content=corpus.words(topic, CHUNK_WORDS, TOPIC_WORD_SHARE),
+                    embedding=corpus.embedding(topic),
+                )
+                for _ in range(args.chunks_per_document)
+            ]
+            embedding = np.mean([chunk.embedding for chunk in chunks], axis=0)
+            await create_document(
+                session,
+                chunks,
+                search_space_id=search_space.id,
+                title=f"Benchmark document {document}",
+                document_type=DocumentType.FILE,
+                document_metadata={},
+                content="\n".join(chunk.content for chunk in chunks),
+                content_hash=uuid.uuid4().hex,
+                embedding=(embedding / np.linalg.norm(embedding)).astype(np.float32),
+            )
+
+    await session.execute(text("ANALYZE documents"))
+    await session.execute(text("ANALYZE chunks"))
+    return search_space_ids
+
+
+@dataclass
+class RetrieverTarget:
+    name: str
+    uses_vector_index: bool
+    uses_rrf: bool
+
+    async def search(
+        self, session, query, top_k, user_id, profile: RetrievalProfile
+    ) -> list[int]:
+        """Run the search and return the IDs of the results in order."""
+        family, method = self.name.split(".")
+        if family == "chunks":
+            retriever = ChucksHybridSearchRetriever(session)
+        else:
+            retriever = DocumentHybridSearchRetriever(session)
+
+        args = (query.text, top_k, user_id, query.search_space_id)
+        if method == "hybrid":
+            results = await retriever.hybrid_search(*args, profile=profile)
+            key = "chunk_id" if family == "chunks" else "document_id"
+            return [result[key] for result in results]
+        if method == "vector":
+            results = await retriever.vector_search(*args, profile=profile)
+        else:
+            results = await retriever.full_text_search(*args)
+        return [result.id for result in results]
+
+
+TARGETS = [
+    RetrieverTarget("chunks.vector", uses_vector_index=True, uses_rrf=False),
+    RetrieverTarget("chunks.full_text", uses_vector_index=False, uses_rrf=False),
+    RetrieverTarget("chunks.hybrid", uses_vector_index=True, uses_rrf=True),
+    RetrieverTarget("documents.vector", uses_vector_index=True, uses_rrf=False),
+    RetrieverTarget("documents.full_text", uses_vector_index=False, uses_rrf=False),
+    RetrieverTarget("documents.hybrid", uses_vector_index=True, uses_rrf=True),
+]
+
+
+async def exact_results(session, target, queries, top_k, user_id, profile):
+    """Results of every query with sequential scans and full precision distances."""
+    vector_index_mode = config.VECTOR_INDEX_MODE
+    config.VECTOR_INDEX_MODE = "full"
+    await session.execute(text("SET LOCAL enable_indexscan = off"))
+    try:
+        return [
+            await target.search(session, query, top_k, user_id, profile)
+            for query in queries
+        ]
+    finally:
+        await session.execute(text("SET LOCAL enable_indexscan = on"))
+        config.VECTOR_INDEX_MODE = vector_index_mode
+
+
+def recall_at_k(results: list[int], expected: list[int]) -> float | None:
+    if not expected:
+        return None
+    return len(set(results) & set(expected)) / len(expected)
+
+
+async def measure(session, target, queries, expected, top_k, user_id, profile):
+    """Latencies in milliseconds and mean recall@k of every query."""
+    latencies = []
+    recalls = []
+    for query, query_expected in zip(queries, expected, strict=True):
+        started = time.perf_counter()
+        results = await target.search(session, query, top_k, user_id, profile)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        recall = recall_at_k(results, query_expected)
+        if recall is not None:
+            recalls.append(recall)
+
+    return latencies, (float(np.mean(recalls)) if recalls else None)
+
+
+def print_row(target, top_k, ef_search, rrf_k, latencies, recall) -> None:
+    p50, p95 = np.percentile(latencies, [50, 95])
+    queries_per_second = len(latencies) / (sum(latencies) / 1000)
+    recall_text = f"{recall:.3f}" if recall is not None else "-"
+    print(
+        f"{target.name:<20} {top_k:>5} {ef_search or '-':>9} {rrf_k or '-':>5} "
+        f"{p50:>8.1f} {p95:>8.1f} {queries_per_second:>8.1f} {recall_text:>8}"
+    )
+
+
+async def run(session, queries, args) -> None:
+    base_profile = RETRIEVAL_PROFILES[args.profile]
+    print(
+        f"{'retriever':<20} {'top_k':>5} {'ef_search':>9} {'rrf_k':>5} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'qps':>8} {'recall':>8}"
+    )
+    for target in TARGETS:
+        if args.retrievers and target.name not in args.retrievers:
+            continue
+
+        for top_k in args.top_k:
+            for rrf_k in (
+                (args.rrf_k or [base_profile.rrf_k]) if target.uses_rrf else [None]
+            ):
+                expected = await exact_results(
+                    session,
+                    target,
+                    queries,
+                    top_k,
+                    args.user_id,
+                    replace(base_profile, rrf_k=rrf_k or base_profile.rrf_k),
+                )
+                for ef_search in (
+                    (args.ef_search or [base_profile.ef_search])
+                    if target.uses_vector_index
+                    else [None]
+                ):
+                    profile = replace(
+                        base_profile,
+                        ef_search=ef_search or base_profile.ef_search,
+                        rrf_k=rrf_k or base_profile.rrf_k,
+                    )
+
+                    # Warm up caches and plans before timing
+                    await measure(
+                        session,
+                        target,
+                        queries[: args.warmup],
+                        expected[: args.warmup],
+                        top_k,
+                        args.user_id,
+                        profile,
+                    )
+                    latencies, recall = await measure(
+                        session,
+                        target,
+                        queries,
+                        expected,
+                        top_k,
+                        args.user_id,
+                        profile,
+                    )
+                    print_row(target, top_k, ef_search, rrf_k, latencies, recall)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--user-id", type=uuid.UUID, required=True)
+    parser.add_argument("--search-spaces", type=int, default=1)
+    parser.add_argument("--documents", type=int, default=1000)
+    parser.add_argument("--chunks-per-document", type=int, default=10)
+    parser.add_argument("--topics", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--top-k", type=int, nargs="+", default=[10])
+    parser.add_argument(
+        "--profile",
+        choices=list(RETRIEVAL_PROFILES),
+        default="balanced",
+        help="Retrieval profile whose settings the sweeps override",
+    )
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[40, 100, 200])
+    parser.add_argument(
+        "--rrf-k", type=int, nargs="+", help="RRF k values (default: the profile's)"
+    )
+    parser.add_argument(
+        "--retrievers",
+        nargs="+",
+        choices=[target.name for target in TARGETS],
+        help="Retrievers to benchmark (default: all)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dimension = config.embedding_model_instance.dimension
+    corpus = SyntheticCorpus(args.topics, dimension, args.seed)
+    print(
+        f"Loading {args.search_spaces} search space(s) of {args.documents} documents "
+        f"with {args.chunks_per_document} chunks each ({dimension} dimensions, "
+        f"vector index mode {config.VECTOR_INDEX_MODE})"
+    )
+
+    async with async_session_maker() as session:
+        try:
+            started = time.perf_counter()
+            search_space_ids = await load_corpus(session, corpus, args)
+            print(f"Loaded in {time.perf_counter() - started:.1f}s")
+
+            queries = [
+                corpus.query(search_space_ids[i % len(search_space_ids)])
+                for i in range(args.queries)
+            ]
+            config.query_embedding_cache = FakeQueryEmbeddings(queries)
+            await run(session, queries, args)
+        finally:
+            await session.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
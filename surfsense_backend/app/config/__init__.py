@@ -6,6 +6,10 @@ from chonkie import AutoEmbeddings, CodeChunker, RecursiveChunker
 from dotenv import load_dotenv
 from rerankers import Reranker
 
+from app.services.embedding_service import EmbeddingService
+from app.services.query_embedding_cache import QueryEmbeddingCache
+from app.services.reranker_service import RerankerService
+
 # Get the base directory of the project
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -60,6 +64,48 @@ class Config:
         chunk_size=getattr(embedding_model_instance, "max_seq_length", 512)
     )
 
+    # Batched embedding pipeline running on its own worker pool
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+    EMBEDDING_MAX_WORKERS = int(os.getenv("EMBEDDING_MAX_WORKERS", "1"))
+    EMBEDDING_STATS_LOG_INTERVAL = float(
+        os.getenv("EMBEDDING_STATS_LOG_INTERVAL", "300")
+    )
+    embedding_service = EmbeddingService(
+        embedding_model_instance,
+        batch_size=EMBEDDING_BATCH_SIZE,
+        max_workers=EMBEDDING_MAX_WORKERS,
+        stats_log_interval_seconds=EMBEDDING_STATS_LOG_INTERVAL,
+    )
+
+    # Query embedding cache shared by the retrievers, optionally backed by Redis
+    QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))
+    QUERY_EMBEDDING_CACHE_TTL = int(os.getenv("QUERY_EMBEDDING_CACHE_TTL", "3600"))
+    QUERY_EMBEDDING_CACHE_REDIS_URL = os.getenv("QUERY_EMBEDDING_CACHE_REDIS_URL")
+    query_embedding_cache_backend = None
+    if QUERY_EMBEDDING_CACHE_REDIS_URL:
+        import redis.asyncio as redis
+
+        query_embedding_cache_backend = redis.from_url(QUERY_EMBEDDING_CACHE_REDIS_URL)
+    query_embedding_cache = QueryEmbeddingCache(
+        embedding_service,
+        model_name=EMBEDDING_MODEL,
+        max_size=QUERY_EMBEDDING_CACHE_SIZE,
+        ttl_seconds=QUERY_EMBEDDING_CACHE_TTL,
+        backend=query_embedding_cache_backend,
+    )
+
+    # Filtered HNSW scans (pgvector >= 0.8): keep scanning the index until enough
+    # rows pass the search space/document type filters ("strict_order",
+    # "relaxed_order" or "off"), reading at most HNSW_MAX_SCAN_TUPLES tuples
+    HNSW_ITERATIVE_SCAN = os.getenv("HNSW_ITERATIVE_SCAN", "strict_order")
+    HNSW_MAX_SCAN_TUPLES = int(os.getenv("HNSW_MAX_SCAN_TUPLES", "20000"))
+
+    # What the HNSW vector indexes store ("full", "halfvec" or "binary"; the
+    # quantized modes need pgvector >= 0.7). Quantized searches read
+    # VECTOR_RESCORE_FACTOR times more candidates and re-score them exactly.
+    VECTOR_INDEX_MODE = os.getenv("VECTOR_INDEX_MODE", "full")
+    VECTOR_RESCORE_FACTOR = int(os.getenv("VECTOR_RESCORE_FACTOR", "4"))
+
     # Reranker's Configuration | Pinecode, Cohere etc. Read more at https://github.com/AnswerDotAI/rerankers?tab=readme-ov-file#usage
     RERANKERS_MODEL_NAME = os.getenv("RERANKERS_MODEL_NAME")
     RERANKERS_MODEL_TYPE = os.getenv("RERANKERS_MODEL_TYPE")
@@ -68,6 +114,80 @@ class Config:
         model_type=RERANKERS_MODEL_TYPE,
     )
 
+    # Reranker inference pool shared by all agents
+    RERANKER_MAX_WORKERS = int(os.getenv("RERANKER_MAX_WORKERS", "1"))
+    RERANKER_MAX_CONCURRENCY = int(
+        os.getenv("RERANKER_MAX_CONCURRENCY", str(RERANKER_MAX_WORKERS))
+    )
+    # Concurrent rerank requests are pooled into micro-batches of up to
+    # RERANKER_BATCH_SIZE (query, chunk) pairs, collected for at most
+    # RERANKER_BATCH_WINDOW_MS; off by default for listwise rerankers, whose
+    # scores depend on the documents ranked together
+    RERANKER_BATCH_SIZE = int(
+        os.getenv(
+            "RERANKER_BATCH_SIZE",
+            "0" if RERANKERS_MODEL_TYPE in ("rankgpt", "rankllm") else "256",
+        )
+    )
+    RERANKER_BATCH_WINDOW_MS = float(os.getenv("RERANKER_BATCH_WINDOW_MS", "5"))
+    RERANKER_CACHE_SIZE = int(os.getenv("RERANKER_CACHE_SIZE", "50000"))
+    RERANKER_CACHE_TTL = int(os.getenv("RERANKER_CACHE_TTL", "3600"))
+    reranker_service = RerankerService(
+        reranker_instance,
+        max_workers=RERANKER_MAX_WORKERS,
+        max_concurrency=RERANKER_MAX_CONCURRENCY,
+        batch_size=RERANKER_BATCH_SIZE,
+        batch_window_ms=RERANKER_BATCH_WINDOW_MS,
+        cache_size=RERANKER_CACHE_SIZE,
+        cache_ttl_seconds=RERANKER_CACHE_TTL,
+    )
+
+    # Job queue for background ingestion. Set JOB_QUEUE_EMBEDDED_WORKER=FALSE when
+    # jobs are consumed by dedicated worker processes (python worker.py)
+    JOB_QUEUE_EMBEDDED_WORKER = (
+        os.getenv("JOB_QUEUE_EMBEDDED_WORKER", "TRUE").upper() == "TRUE"
+    )
+    JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))
+    JOB_MAX_RUNNING_PER_USER = int(os.getenv("JOB_MAX_RUNNING_PER_USER", "0"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1"))
+
+    # Pooled async HTTP client shared by the Linear, Jira and Confluence connectors
+    CONNECTOR_HTTP_MAX_CONNECTIONS = int(
+        os.getenv("CONNECTOR_HTTP_MAX_CONNECTIONS", "100")
+    )
+    CONNECTOR_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(
+        os.getenv("CONNECTOR_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")
+    )
+    CONNECTOR_HTTP_TIMEOUT_SECONDS = float(
+        os.getenv("CONNECTOR_HTTP_TIMEOUT_SECONDS", "30")
+    )
+    CONNECTOR_HTTP2 = os.getenv("CONNECTOR_HTTP2", "TRUE").upper() == "TRUE"
+    # Concurrent API requests per Jira/Confluence sync; 429s back off and retry
+    CONNECTOR_MAX_CONCURRENCY = int(os.getenv("CONNECTOR_MAX_CONCURRENCY", "8"))
+
+    # Staged connector indexing pipeline: items waiting between two stages,
+    # documents summarized/embedded at once, and documents per batch commit
+    INDEXING_QUEUE_SIZE = int(os.getenv("INDEXING_QUEUE_SIZE", "16"))
+    INDEXING_SUMMARIZE_CONCURRENCY = int(
+        os.getenv("INDEXING_SUMMARIZE_CONCURRENCY", "4")
+    )
+    INDEXING_EMBED_CONCURRENCY = int(os.getenv("INDEXING_EMBED_CONCURRENCY", "4"))
+    INDEXING_COMMIT_BATCH_SIZE = int(os.getenv("INDEXING_COMMIT_BATCH_SIZE", "50"))
+    # Items whose content hashes are checked against the database in one query,
+    # and whether each indexing run builds a bloom filter of the search space's
+    # content hashes to skip querying hashes it certainly does not hold
+    INDEXING_DEDUPE_BATCH_SIZE = int(os.getenv("INDEXING_DEDUPE_BATCH_SIZE", "64"))
+    CONTENT_HASH_FILTER_ENABLED = (
+        os.getenv("CONTENT_HASH_FILTER_ENABLED", "TRUE").upper() == "TRUE"
+    )
+
+    # Seconds a fetched Slack user directory is reused across syncs, 0 to refetch
+    # on every sync
+    SLACK_USER_DIRECTORY_TTL_SECONDS = int(
+        os.getenv("SLACK_USER_DIRECTORY_TTL_SECONDS", "86400")
+    )
+
     # OAuth JWT
     SECRET_KEY = os.getenv("SECRET_KEY")
 
@@ -82,6 +202,9 @@ class Config:
         # LlamaCloud API Key
         LLAMA_CLOUD_API_KEY = os.getenv("LLAMA_CLOUD_API_KEY")
 
+    # Concurrent LLM calls when summarizing a large document section by section
+    DOCLING_SUMMARY_CONCURRENCY = int(os.getenv("DOCLING_SUMMARY_CONCURRENCY", "4"))
+
     # Firecrawl API Key
     FIRECRAWL_API_KEY = os.getenv("FIRECRAWL_API_KEY", None)
 
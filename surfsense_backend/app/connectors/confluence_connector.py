@@ -5,10 +5,16 @@ A module for retrieving data from Confluence.
 Allows fetching pages and their comments from specified spaces.
 """
 
+import asyncio
 import base64
+import logging
 from typing import Any
 
-import requests
+import httpx
+
+from app.utils.http_client import ConnectorRequestLimiter, get_http_client
+
+logger = logging.getLogger(__name__)
 
 
 class ConfluenceConnector:
@@ -19,6 +25,8 @@ class ConfluenceConnector:
         base_url: str | None = None,
         email: str | None = None,
         api_token: str | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        max_concurrency: int = 8,
     ):
         """
         Initialize the ConfluenceConnector class.
@@ -27,11 +35,16 @@ class ConfluenceConnector:
             base_url: Confluence instance base URL (e.g., 'https://yourcompany.atlassian.net') (optional)
             email: Confluence account email address (optional)
             api_token: Confluence API token (optional)
+            http_client: Async HTTP client to use (optional, defaults to the
+                shared pooled client)
+            max_concurrency: Maximum number of concurrent API requests
         """
         self.base_url = base_url.rstrip("/") if base_url else None
         self.email = email
         self.api_token = api_token
         self.api_version = "v2"  # Confluence Cloud API version
+        self.http_client = http_client
+        self.request_limiter = ConnectorRequestLimiter(max_concurrency)
 
     def set_credentials(self, base_url: str, email: str, api_token: str) -> None:
         """
@@ -90,7 +103,7 @@ class ConfluenceConnector:
             "Accept": "application/json",
         }
 
-    def make_api_request(
+    async def make_api_request(
         self, endpoint: str, params: dict[str, Any] | None = None
     ) -> dict[str, Any]:
         """
@@ -115,14 +128,17 @@ class ConfluenceConnector:
         url = f"{self.base_url}/wiki/api/{self.api_version}/{endpoint}"
         headers = self.get_headers()
 
+        client = self.http_client or get_http_client()
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = await self.request_limiter.request(
+                client, "GET", url, headers=headers, params=params
+            )
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise Exception(f"Confluence API request failed: {e!s}") from e
 
-    def get_all_spaces(self) -> list[dict[str, Any]]:
+    async def get_all_spaces(self) -> list[dict[str, Any]]:
         """
         Fetch all spaces from Confluence.
 
@@ -144,7 +160,7 @@ class ConfluenceConnector:
             if cursor:
                 params["cursor"] = cursor
 
-            result = self.make_api_request("spaces", params)
+            result = await self.make_api_request("spaces", params)
 
             if not isinstance(result, dict) or "results" not in result:
                 raise Exception("Invalid response from Confluence API")
@@ -166,7 +182,7 @@ class ConfluenceConnector:
 
         return all_spaces
 
-    def get_pages_in_space(
+    async def get_pages_in_space(
         self, space_id: str, include_body: bool = True
     ) -> list[dict[str, Any]]:
         """
@@ -197,7 +213,7 @@ class ConfluenceConnector:
             if cursor:
                 params["cursor"] = cursor
 
-            result = self.make_api_request(f"spaces/{space_id}/pages", params)
+            result = await self.make_api_request(f"spaces/{space_id}/pages", params)
 
             if not isinstance(result, dict) or "results" not in result:
                 raise Exception("Invalid response from Confluence API")
@@ -219,7 +235,7 @@ class ConfluenceConnector:
 
         return all_pages
 
-    def get_page_comments(self, page_id: str) -> list[dict[str, Any]]:
+    async def get_page_comments(self, page_id: str) -> list[dict[str, Any]]:
         """
         Fetch all comments for a specific page (both footer and inline comments).
 
@@ -233,19 +249,15 @@ class ConfluenceConnector:
             ValueError: If credentials have not been set
             Exception: If the API request fails
         """
-        all_comments = []
+        # Get footer and inline comments concurrently
+        footer_comments, inline_comments = await asyncio.gather(
+            self._get_comments_for_page(page_id, "footer-comments"),
+            self._get_comments_for_page(page_id, "inline-comments"),
+        )
 
-        # Get footer comments
-        footer_comments = self._get_comments_for_page(page_id, "footer-comments")
-        all_comments.extend(footer_comments)
-
-        # Get inline comments
-        inline_comments = self._get_comments_for_page(page_id, "inline-comments")
-        all_comments.extend(inline_comments)
-
-        return all_comments
+        return footer_comments + inline_comments
 
-    def _get_comments_for_page(
+    async def _get_comments_for_page(
         self, page_id: str, comment_type: str
     ) -> list[dict[str, Any]]:
         """
@@ -270,7 +282,9 @@ class ConfluenceConnector:
             if cursor:
                 params["cursor"] = cursor
 
-            result = self.make_api_request(f"pages/{page_id}/{comment_type}", params)
+            result = await self.make_api_request(
+                f"pages/{page_id}/{comment_type}", params
+            )
 
             if not isinstance(result, dict) or "results" not in result:
                 break  # No comments or invalid response
@@ -292,7 +306,7 @@ class ConfluenceConnector:
 
         return all_comments
 
-    def get_pages_by_date_range(
+    async def get_pages_by_date_range(
         self,
         start_date: str,
         end_date: str,
@@ -315,9 +329,14 @@ class ConfluenceConnector:
             all_pages = []
 
             if space_ids:
-                # Fetch pages from specific spaces
-                for space_id in space_ids:
-                    pages = self.get_pages_in_space(space_id, include_body=True)
+                # Fetch pages from specific spaces concurrently
+                space_pages = await asyncio.gather(
+                    *(
+                        self.get_pages_in_space(space_id, include_body=True)
+                        for space_id in space_ids
+                    )
+                )
+                for pages in space_pages:
                     all_pages.extend(pages)
             else:
                 # Fetch all pages (this might be expensive for large instances)
@@ -331,7 +350,7 @@ class ConfluenceConnector:
                     if cursor:
                         params["cursor"] = cursor
 
-                    result = self.make_api_request("pages", params)
+                    result = await self.make_api_request("pages", params)
                     if not isinstance(result, dict) or "results" not in result:
                         break
 
@@ -348,7 +367,31 @@ class ConfluenceConnector:
                     else:
                         break
 
+            if include_comments:
+                await self._attach_page_comments(all_pages)
+
             return all_pages, None
 
         except Exception as e:
             return [], f"Error fetching pages: {e!s}"
+
+    async def _attach_page_comments(self, pages: list[dict[str, Any]]) -> None:
+        """
+        Fetch the comments of all pages concurrently and store them under each
+        page's "comments" key. Pages whose comments fail to load get none.
+
+        Args:
+            pages: Page objects to add comments to
+        """
+        page_comments = await asyncio.gather(
+            *(self.get_page_comments(page["id"]) for page in pages),
+            return_exceptions=True,
+        )
+
+        for page, comments in zip(pages, page_comments, strict=True):
+            if isinstance(comments, Exception):
+                logger.warning(
+                    f"Failed to fetch comments for Confluence page {page['id']}: {comments!s}"
+                )
+                comments = []
+            page["comments"] = comments
@@ -210,6 +210,7 @@ class DiscordConnector(commands.Bot):
         channel_id: str,
         start_date: str | None = None,
         end_date: str | None = None,
+        after_id: str | None = None,
     ) -> list[dict]:
         """
         Fetch message history from a text channel.
@@ -218,6 +219,8 @@ class DiscordConnector(commands.Bot):
             channel_id (str): The ID of the channel to fetch messages from.
             start_date (str): Optional start date in ISO format (YYYY-MM-DD).
             end_date (str): Optional end date in ISO format (YYYY-MM-DD).
+            after_id (str): Optional ID of a message; only messages posted after
+                it are fetched, instead of from start_date.
 
         Returns:
             list[dict]: A list of messages with their ID, author ID, author name,
@@ -252,6 +255,9 @@ class DiscordConnector(commands.Bot):
             except ValueError:
                 logger.warning(f"Invalid start_date format: {start_date}. Ignoring.")
 
+        if after_id:
+            after = discord.Object(id=int(after_id))
+
         if end_date:
             try:
                 end_datetime = datetime.datetime.fromisoformat(f"{end_date}").replace(
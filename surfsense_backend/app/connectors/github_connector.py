@@ -1,11 +1,15 @@
+import asyncio
 import base64
 import logging
 from typing import Any
 
+import httpx
 from github3 import exceptions as github_exceptions, login as github_login
 from github3.exceptions import ForbiddenError, NotFoundError
 from github3.repos.contents import Contents
 
+from app.utils.http_client import ConnectorRequestLimiter, get_http_client
+
 logger = logging.getLogger(__name__)
 
 # List of common code file extensions to target
@@ -58,6 +62,8 @@ DOC_EXTENSIONS = {
 # Maximum file size in bytes (e.g., 1MB)
 MAX_FILE_SIZE = 1 * 1024 * 1024
 
+GITHUB_API_URL = "https://api.github.com"
+
 
 class GitHubConnector:
     """Connector for interacting with the GitHub API."""
@@ -89,15 +95,26 @@ class GitHubConnector:
         # Add other project-specific irrelevant directories if needed
     }
 
-    def __init__(self, token: str):
+    def __init__(
+        self,
+        token: str,
+        http_client: httpx.AsyncClient | None = None,
+        max_concurrency: int = 8,
+    ):
         """
         Initializes the GitHub connector.
 
         Args:
             token: GitHub Personal Access Token (PAT).
+            http_client: Async HTTP client used for blob downloads (optional,
+                defaults to the shared pooled client).
+            max_concurrency: Maximum number of concurrent blob downloads.
         """
         if not token:
             raise ValueError("GitHub token cannot be empty.")
+        self.token = token
+        self.http_client = http_client
+        self.request_limiter = ConnectorRequestLimiter(max_concurrency)
         try:
             self.gh = github_login(token=token)
             # Try a simple authenticated call to check token validity
@@ -139,7 +156,96 @@ class GitHubConnector:
         self, repo_full_name: str, path: str = ""
     ) -> list[dict[str, Any]]:
         """
-        Recursively fetches details of relevant files (code, docs) within a repository path.
+        Fetches details of relevant files (code, docs) within a repository path.
+
+        The whole default branch is listed with a single recursive Git Trees
+        API call. If GitHub truncates the tree (very large repositories), this
+        falls back to walking the directories one by one.
+
+        Args:
+            repo_full_name: The full name of the repository (e.g., 'owner/repo').
+            path: The starting path within the repository (default is root).
+
+        Returns:
+            A list of dictionaries, each containing file details (path, sha, url, size).
+            Returns an empty list if the repository or path is not found or on error.
+        """
+        try:
+            owner, repo_name = repo_full_name.split("/")
+            repo = self.gh.repository(owner, repo_name)
+            if not repo:
+                logger.warning(f"Repository '{repo_full_name}' not found.")
+                return []
+
+            branch = repo.default_branch
+            tree = repo.tree(branch, recursive=True)
+            if tree.as_dict().get("truncated"):
+                logger.info(
+                    f"Git tree of '{repo_full_name}' is truncated. Listing directories individually."
+                )
+                return self._get_directory_files(repo_full_name, path)
+
+            prefix = f"{path.strip('/')}/" if path.strip("/") else ""
+            files_list = []
+            for entry in tree.tree:
+                if entry.type != "blob" or not entry.path.startswith(prefix):
+                    continue
+
+                # Skip files inside any of the skipped directories
+                directories = entry.path.split("/")[:-1]
+                if any(directory in self.SKIPPED_DIRS for directory in directories):
+                    continue
+
+                file_info = self._get_file_info(
+                    entry.path,
+                    entry.sha,
+                    f"{repo.html_url}/blob/{branch}/{entry.path}",
+                    entry.size or 0,
+                )
+                if file_info:
+                    files_list.append(file_info)
+
+            return files_list
+
+        except (NotFoundError, ForbiddenError) as e:
+            logger.warning(f"Cannot access path '{path}' in '{repo_full_name}': {e}")
+        except Exception as e:
+            logger.error(
+                f"Failed to get files for {repo_full_name} at path '{path}': {e}"
+            )
+
+        return []
+
+    def _get_file_info(
+        self, file_path: str, sha: str, url: str, size: int
+    ) -> dict[str, Any] | None:
+        """Build the file details for a code or doc file within the size limit."""
+        file_name = file_path.rsplit("/", 1)[-1]
+        file_extension = (
+            "." + file_name.split(".")[-1].lower() if "." in file_name else ""
+        )
+        is_code = file_extension in CODE_EXTENSIONS
+        is_doc = file_extension in DOC_EXTENSIONS
+
+        if (is_code or is_doc) and size <= MAX_FILE_SIZE:
+            return {
+                "path": file_path,
+                "sha": sha,
+                "url": url,
+                "size": size,
+                "type": "code" if is_code else "doc",
+            }
+        elif size > MAX_FILE_SIZE:
+            logger.debug(f"Skipping large file: {file_path} ({size} bytes)")
+        else:
+            logger.debug(f"Skipping irrelevant file type: {file_path}")
+        return None
+
+    def _get_directory_files(
+        self, repo_full_name: str, path: str = ""
+    ) -> list[dict[str, Any]]:
+        """
+        Recursively fetches relevant files by listing one directory per API call.
 
         Args:
             repo_full_name: The full name of the repository (e.g., 'owner/repo').
@@ -173,38 +279,19 @@ class GitHubConnector:
 
                     # Recursively fetch contents of subdirectory
                     files_list.extend(
-                        self.get_repository_files(
+                        self._get_directory_files(
                             repo_full_name, path=content_item.path
                         )
                     )
                 elif content_item.type == "file":
-                    # Check if the file extension is relevant and size is within limits
-                    file_extension = (
-                        "." + content_item.name.split(".")[-1].lower()
-                        if "." in content_item.name
-                        else ""
+                    file_info = self._get_file_info(
+                        content_item.path,
+                        content_item.sha,
+                        content_item.html_url,
+                        content_item.size,
                     )
-                    is_code = file_extension in CODE_EXTENSIONS
-                    is_doc = file_extension in DOC_EXTENSIONS
-
-                    if (is_code or is_doc) and content_item.size <= MAX_FILE_SIZE:
-                        files_list.append(
-                            {
-                                "path": content_item.path,
-                                "sha": content_item.sha,
-                                "url": content_item.html_url,
-                                "size": content_item.size,
-                                "type": "code" if is_code else "doc",
-                            }
-                        )
-                    elif content_item.size > MAX_FILE_SIZE:
-                        logger.debug(
-                            f"Skipping large file: {content_item.path} ({content_item.size} bytes)"
-                        )
-                    else:
-                        logger.debug(
-                            f"Skipping irrelevant file type: {content_item.path}"
-                        )
+                    if file_info:
+                        files_list.append(file_info)
 
         except (NotFoundError, ForbiddenError) as e:
             logger.warning(f"Cannot access path '{path}' in '{repo_full_name}': {e}")
@@ -258,26 +345,9 @@ class GitHubConnector:
 
             # Content is base64 encoded
             if content_item.content:
-                try:
-                    decoded_content = base64.b64decode(content_item.content).decode(
-                        "utf-8"
-                    )
-                    return decoded_content
-                except UnicodeDecodeError:
-                    logger.warning(
-                        f"Could not decode file '{file_path}' in '{repo_full_name}' as UTF-8. Trying with 'latin-1'."
-                    )
-                    try:
-                        # Try a fallback encoding
-                        decoded_content = base64.b64decode(content_item.content).decode(
-                            "latin-1"
-                        )
-                        return decoded_content
-                    except Exception as decode_err:
-                        logger.error(
-                            f"Failed to decode file '{file_path}' with fallback encoding: {decode_err}"
-                        )
-                        return None  # Give up if fallback fails
+                return self._decode_content(
+                    base64.b64decode(content_item.content), repo_full_name, file_path
+                )
             else:
                 logger.warning(
                     f"No content returned for file '{file_path}' in '{repo_full_name}'. It might be empty."
@@ -294,3 +364,75 @@ class GitHubConnector:
                 f"Failed to get content for file '{file_path}' in '{repo_full_name}': {e}"
             )
             return None
+
+    async def get_file_contents(
+        self, repo_full_name: str, files: list[dict[str, Any]]
+    ) -> dict[str, str | None]:
+        """
+        Fetches the decoded contents of several files concurrently by blob SHA.
+
+        Blobs are downloaded raw through the Git Data API, bounded by the
+        connector's max_concurrency and retried when rate limited.
+
+        Args:
+            repo_full_name: The full name of the repository (e.g., 'owner/repo').
+            files: File details as returned by get_repository_files.
+
+        Returns:
+            A dictionary mapping each file path to its decoded content, or None
+            if fetching or decoding that file failed.
+        """
+        client = self.http_client or get_http_client()
+        headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Accept": "application/vnd.github.raw",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+
+        async def fetch_blob(file_info: dict[str, Any]) -> str | None:
+            file_path = file_info["path"]
+            url = (
+                f"{GITHUB_API_URL}/repos/{repo_full_name}/git/blobs/{file_info['sha']}"
+            )
+            try:
+                response = await self.request_limiter.request(
+                    client, "GET", url, headers=headers
+                )
+            except httpx.HTTPError as e:
+                logger.error(
+                    f"Failed to get content for file '{file_path}' in '{repo_full_name}': {e}"
+                )
+                return None
+
+            if response.status_code != 200:
+                logger.warning(
+                    f"Cannot access file '{file_path}' in '{repo_full_name}': {response.status_code} {response.text}"
+                )
+                return None
+
+            return self._decode_content(response.content, repo_full_name, file_path)
+
+        contents = await asyncio.gather(*(fetch_blob(file_info) for file_info in files))
+        return {
+            file_info["path"]: content
+            for file_info, content in zip(files, contents, strict=True)
+        }
+
+    def _decode_content(
+        self, raw_content: bytes, repo_full_name: str, file_path: str
+    ) -> str | None:
+        """Decode file bytes as UTF-8, falling back to latin-1."""
+        try:
+            return raw_content.decode("utf-8")
+        except UnicodeDecodeError:
+            logger.warning(
+                f"Could not decode file '{file_path}' in '{repo_full_name}' as UTF-8. Trying with 'latin-1'."
+            )
+            try:
+                # Try a fallback encoding
+                return raw_content.decode("latin-1")
+            except Exception as decode_err:
+                logger.error(
+                    f"Failed to decode file '{file_path}' with fallback encoding: {decode_err}"
+                )
+                return None  # Give up if fallback fails
@@ -5,11 +5,14 @@ A module for retrieving data from Jira.
 Allows fetching issue lists and their comments, projects and more.
 """
 
+import asyncio
 import base64
 from datetime import datetime
 from typing import Any
 
-import requests
+import httpx
+
+from app.utils.http_client import ConnectorRequestLimiter, get_http_client
 
 
 class JiraConnector:
@@ -20,6 +23,8 @@ class JiraConnector:
         base_url: str | None = None,
         email: str | None = None,
         api_token: str | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        max_concurrency: int = 8,
     ):
         """
         Initialize the JiraConnector class.
@@ -28,11 +33,16 @@ class JiraConnector:
             base_url: Jira instance base URL (e.g., 'https://yourcompany.atlassian.net') (optional)
             email: Jira account email address (optional)
             api_token: Jira API token (optional)
+            http_client: Async HTTP client to use (optional, defaults to the
+                shared pooled client)
+            max_concurrency: Maximum number of concurrent API requests
         """
         self.base_url = base_url.rstrip("/") if base_url else None
         self.email = email
         self.api_token = api_token
         self.api_version = "3"  # Jira Cloud API version
+        self.http_client = http_client
+        self.request_limiter = ConnectorRequestLimiter(max_concurrency)
 
     def set_credentials(self, base_url: str, email: str, api_token: str) -> None:
         """
@@ -91,7 +101,7 @@ class JiraConnector:
             "Accept": "application/json",
         }
 
-    def make_api_request(
+    async def make_api_request(
         self, endpoint: str, params: dict[str, Any] | None = None
     ) -> dict[str, Any]:
         """
@@ -116,7 +126,10 @@ class JiraConnector:
         url = f"{self.base_url}/rest/api/{self.api_version}/{endpoint}"
         headers = self.get_headers()
 
-        response = requests.get(url, headers=headers, params=params, timeout=500)
+        client = self.http_client or get_http_client()
+        response = await self.request_limiter.request(
+            client, "GET", url, headers=headers, params=params, timeout=500
+        )
 
         if response.status_code == 200:
             return response.json()
@@ -125,7 +138,51 @@ class JiraConnector:
                 f"API request failed with status code {response.status_code}: {response.text}"
             )
 
-    def get_all_projects(self) -> dict[str, Any]:
+    async def search_all_issues(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        Fetch every page of an issue search.
+
+        The first page reports the total, after which the remaining pages are
+        requested concurrently, bounded by the connector's max_concurrency.
+
+        Args:
+            params: Search query parameters, including maxResults
+
+        Returns:
+            List of issue objects in result order
+
+        Raises:
+            ValueError: If credentials have not been set
+            Exception: If the API request fails or returns an invalid response
+        """
+        first_page = await self.make_api_request("search", {**params, "startAt": 0})
+        if not isinstance(first_page, dict) or "issues" not in first_page:
+            raise Exception("Invalid response from Jira API")
+
+        all_issues = list(first_page["issues"])
+        total = first_page.get("total", 0)
+        # Jira may return fewer results per page than requested
+        page_size = len(all_issues)
+        if page_size == 0 or page_size >= total:
+            return all_issues
+
+        async def fetch_page(start_at: int) -> list[dict[str, Any]]:
+            result = await self.make_api_request(
+                "search", {**params, "startAt": start_at}
+            )
+            if not isinstance(result, dict) or "issues" not in result:
+                raise Exception("Invalid response from Jira API")
+            return result["issues"]
+
+        pages = await asyncio.gather(
+            *(fetch_page(start_at) for start_at in range(page_size, total, page_size))
+        )
+        for issues in pages:
+            all_issues.extend(issues)
+
+        return all_issues
+
+    async def get_all_projects(self) -> dict[str, Any]:
         """
         Fetch all projects from Jira.
 
@@ -136,9 +193,11 @@ class JiraConnector:
             ValueError: If credentials have not been set
             Exception: If the API request fails
         """
-        return self.make_api_request("project/search")
+        return await self.make_api_request("project/search")
 
-    def get_all_issues(self, project_key: str | None = None) -> list[dict[str, Any]]:
+    async def get_all_issues(
+        self, project_key: str | None = None
+    ) -> list[dict[str, Any]]:
         """
         Fetch all issues from Jira.
 
@@ -176,30 +235,9 @@ class JiraConnector:
             "startAt": 0,
         }
 
-        all_issues = []
-        start_at = 0
-
-        while True:
-            params["startAt"] = start_at
-            result = self.make_api_request("search", params)
-
-            if not isinstance(result, dict) or "issues" not in result:
-                raise Exception("Invalid response from Jira API")
-
-            issues = result["issues"]
-            all_issues.extend(issues)
-
-            print(f"Fetched {len(issues)} issues (startAt={start_at})")
-
-            total = result.get("total", 0)
-            if start_at + len(issues) >= total:
-                break
+        return await self.search_all_issues(params)
 
-            start_at += len(issues)
-
-        return all_issues
-
-    def get_issues_by_date_range(
+    async def get_issues_by_date_range(
         self,
         start_date: str,
         end_date: str,
@@ -256,26 +294,7 @@ class JiraConnector:
                 "startAt": 0,
             }
 
-            all_issues = []
-            start_at = 0
-
-            while True:
-                params["startAt"] = start_at
-
-                result = self.make_api_request("search", params)
-
-                if not isinstance(result, dict) or "issues" not in result:
-                    return [], "Invalid response from Jira API"
-
-                issues = result["issues"]
-                all_issues.extend(issues)
-
-                # Check if there are more issues to fetch
-                total = result.get("total", 0)
-                if start_at + len(issues) >= total:
-                    break
-
-                start_at += len(issues)
+            all_issues = await self.search_all_issues(params)
 
             if not all_issues:
                 return [], "No issues found in the specified date range."
@@ -8,21 +8,33 @@ Allows fetching issue lists and their comments with date range filtering.
 from datetime import datetime
 from typing import Any
 
-import requests
+import httpx
+
+from app.utils.http_client import ConnectorRequestLimiter, get_http_client
 
 
 class LinearConnector:
     """Class for retrieving issues and comments from Linear."""
 
-    def __init__(self, token: str | None = None):
+    def __init__(
+        self,
+        token: str | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        max_concurrency: int = 8,
+    ):
         """
         Initialize the LinearConnector class.
 
         Args:
             token: Linear API token (optional, can be set later with set_token)
+            http_client: Async HTTP client to use (optional, defaults to the
+                shared pooled client)
+            max_concurrency: Maximum number of concurrent API requests
         """
         self.token = token
         self.api_url = "https://api.linear.app/graphql"
+        self.http_client = http_client
+        self.request_limiter = ConnectorRequestLimiter(max_concurrency)
 
     def set_token(self, token: str) -> None:
         """
@@ -48,7 +60,7 @@ class LinearConnector:
 
         return {"Content-Type": "application/json", "Authorization": self.token}
 
-    def execute_graphql_query(
+    async def execute_graphql_query(
         self, query: str, variables: dict[str, Any] | None = None
     ) -> dict[str, Any]:
         """
@@ -74,7 +86,10 @@ class LinearConnector:
         if variables:
             payload["variables"] = variables
 
-        response = requests.post(self.api_url, headers=headers, json=payload)
+        client = self.http_client or get_http_client()
+        response = await self.request_limiter.request(
+            client, "POST", self.api_url, headers=headers, json=payload
+        )
 
         if response.status_code == 200:
             return response.json()
@@ -83,7 +98,9 @@ class LinearConnector:
                 f"Query failed with status code {response.status_code}: {response.text}"
             )
 
-    def get_all_issues(self, include_comments: bool = True) -> list[dict[str, Any]]:
+    async def get_all_issues(
+        self, include_comments: bool = True
+    ) -> list[dict[str, Any]]:
         """
         Fetch all issues from Linear.
 
@@ -146,7 +163,7 @@ class LinearConnector:
         }}
         """
 
-        result = self.execute_graphql_query(query)
+        result = await self.execute_graphql_query(query)
 
         # Extract issues from the response
         if (
@@ -158,7 +175,7 @@ class LinearConnector:
 
         return []
 
-    def get_issues_by_date_range(
+    async def get_issues_by_date_range(
         self, start_date: str, end_date: str, include_comments: bool = True
     ) -> tuple[list[dict[str, Any]], str | None]:
         """
@@ -258,7 +275,7 @@ class LinearConnector:
                 # Handle pagination to get all issues
                 while has_next_page:
                     variables = {"after": cursor} if cursor else {}
-                    result = self.execute_graphql_query(query, variables)
+                    result = await self.execute_graphql_query(query, variables)
 
                     # Check for errors
                     if "errors" in result:
@@ -458,7 +475,7 @@ if __name__ == "__main__":
     
     try:
         # Get all issues with comments
-        issues = linear.get_all_issues()
+        issues = await linear.get_all_issues()
         print(f"Retrieved {len(issues)} issues")
         
         # Format and print the first issue as markdown
@@ -470,7 +487,7 @@ if __name__ == "__main__":
         # Get issues by date range
         start_date = "2023-01-01"
         end_date = "2023-01-31"
-        date_issues, error = linear.get_issues_by_date_range(start_date, end_date)
+        date_issues, error = await linear.get_issues_by_date_range(start_date, end_date)
         
         if error:
             print(f"Error: {error}")
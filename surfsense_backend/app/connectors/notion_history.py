@@ -1,27 +1,101 @@
-from notion_client import Client
+import asyncio
+import logging
+
+from notion_client import AsyncClient
+from notion_client.errors import APIErrorCode, APIResponseError
+
+from app.utils.rate_limiter import TokenBucketRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Notion allows an average of three requests per second per integration
+NOTION_REQUESTS_PER_SECOND = 3
+DEFAULT_RETRY_AFTER_SECONDS = 1
 
 
 class NotionHistoryConnector:
-    def __init__(self, token):
+    def __init__(self, token, max_concurrency=8):
         """
         Initialize the NotionPageFetcher with a token.
 
         Args:
             token (str): Notion integration token
+            max_concurrency (int): Maximum number of pages fetched at once
+        """
+        self.notion = AsyncClient(auth=token)
+        self.rate_limiter = TokenBucketRateLimiter(
+            NOTION_REQUESTS_PER_SECOND, capacity=NOTION_REQUESTS_PER_SECOND
+        )
+        self.max_concurrency = max(1, max_concurrency)
+
+    async def close(self):
+        """Close the underlying HTTP client."""
+        await self.notion.aclose()
+
+    async def call_api(self, endpoint, **kwargs):
+        """
+        Calls a Notion API endpoint within the rate limit, waiting and retrying
+        when Notion answers with rate_limited.
+
+        Args:
+            endpoint (callable): Endpoint method, e.g. self.notion.search
+            **kwargs: Arguments for the endpoint
+
+        Returns:
+            dict: The API response
         """
-        self.notion = Client(auth=token)
+        while True:
+            await self.rate_limiter.acquire()
+            try:
+                return await endpoint(**kwargs)
+            except APIResponseError as e:
+                if e.code != APIErrorCode.RateLimited:
+                    raise
+                try:
+                    wait_time = float(e.headers.get("Retry-After"))
+                except (TypeError, ValueError):
+                    wait_time = DEFAULT_RETRY_AFTER_SECONDS
+                logger.warning(
+                    f"Rate limited by Notion. Retrying after {wait_time} seconds."
+                )
+                self.rate_limiter.pause(wait_time)
 
-    def get_all_pages(self, start_date=None, end_date=None):
+    async def get_all_pages(self, start_date=None, end_date=None, skip_unchanged=None):
         """
         Fetches all pages shared with your integration and their content.
 
         Args:
             start_date (str, optional): ISO 8601 date string (e.g., "2023-01-01T00:00:00Z")
             end_date (str, optional): ISO 8601 date string (e.g., "2023-12-31T23:59:59Z")
+            skip_unchanged (callable, optional): Called with a page ID and its
+                last_edited_time; pages for which it returns True are listed
+                without fetching their content
 
         Returns:
             list: List of dictionaries containing page data
         """
+        return [
+            page async for page in self.iter_pages(start_date, end_date, skip_unchanged)
+        ]
+
+    async def iter_pages(self, start_date=None, end_date=None, skip_unchanged=None):
+        """
+        Yields the pages shared with your integration as their content is fetched.
+
+        Search results are paginated in full. The pages of each search result
+        page are fetched concurrently and yielded in completion order, so
+        callers can start processing before every page has been downloaded.
+
+        Args:
+            start_date (str, optional): ISO 8601 date string (e.g., "2023-01-01T00:00:00Z")
+            end_date (str, optional): ISO 8601 date string (e.g., "2023-12-31T23:59:59Z")
+            skip_unchanged (callable, optional): Called with a page ID and its
+                last_edited_time; pages for which it returns True are yielded
+                without fetching their content
+
+        Yields:
+            dict: Page data with page_id, title, last_edited_time and content
+        """
         # Build the filter for the search
         # Note: Notion API requires specific filter structure
         search_params = {}
@@ -46,27 +120,50 @@ class NotionHistoryConnector:
                     "timestamp": "last_edited_time",
                 }
 
-        # First, get a list of all pages the integration has access to
-        search_results = self.notion.search(**search_params)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
 
-        pages = search_results["results"]
-        all_page_data = []
-
-        for page in pages:
+        async def fetch_page(page):
             page_id = page["id"]
+            last_edited_time = page.get("last_edited_time")
+
+            # Get detailed page information, unless the page is unchanged
+            if skip_unchanged and skip_unchanged(page_id, last_edited_time):
+                page_content = []
+            else:
+                async with semaphore:
+                    page_content = await self.get_page_content(page_id)
 
-            # Get detailed page information
-            page_content = self.get_page_content(page_id)
+            return {
+                "page_id": page_id,
+                "title": self.get_page_title(page),
+                "last_edited_time": last_edited_time,
+                "content": page_content,
+            }
 
-            all_page_data.append(
-                {
-                    "page_id": page_id,
-                    "title": self.get_page_title(page),
-                    "content": page_content,
-                }
+        # Page through every search result the integration has access to
+        cursor = None
+        while True:
+            if cursor:
+                search_params["start_cursor"] = cursor
+            search_results = await self.call_api(
+                self.notion.search, page_size=100, **search_params
             )
 
-        return all_page_data
+            tasks = [
+                asyncio.create_task(fetch_page(page))
+                for page in search_results["results"]
+            ]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    yield await task
+            finally:
+                # Stop outstanding fetches if the caller stops early or a fetch fails
+                for task in tasks:
+                    task.cancel()
+
+            if not search_results.get("has_more"):
+                break
+            cursor = search_results["next_cursor"]
 
     def get_page_title(self, page):
         """
@@ -90,7 +187,7 @@ class NotionHistoryConnector:
         # If no title found, return the page ID as fallback
         return f"Untitled page ({page['id']})"
 
-    def get_page_content(self, page_id):
+    async def get_page_content(self, page_id):
         """
         Fetches the content (blocks) of a specific page.
 
@@ -100,6 +197,21 @@ class NotionHistoryConnector:
         Returns:
             list: List of processed blocks from the page
         """
+        blocks = await self.get_block_children(page_id)
+
+        # Process nested blocks concurrently
+        return list(await asyncio.gather(*(self.process_block(b) for b in blocks)))
+
+    async def get_block_children(self, block_id):
+        """
+        Fetches all child blocks of a block or page, following pagination.
+
+        Args:
+            block_id (str): The ID of the parent block or page
+
+        Returns:
+            list: List of raw child blocks
+        """
         blocks = []
         has_more = True
         cursor = None
@@ -107,11 +219,15 @@ class NotionHistoryConnector:
         # Paginate through all blocks
         while has_more:
             if cursor:
-                response = self.notion.blocks.children.list(
-                    block_id=page_id, start_cursor=cursor
+                response = await self.call_api(
+                    self.notion.blocks.children.list,
+                    block_id=block_id,
+                    start_cursor=cursor,
                 )
             else:
-                response = self.notion.blocks.children.list(block_id=page_id)
+                response = await self.call_api(
+                    self.notion.blocks.children.list, block_id=block_id
+                )
 
             blocks.extend(response["results"])
             has_more = response["has_more"]
@@ -119,15 +235,9 @@ class NotionHistoryConnector:
             if has_more:
                 cursor = response["next_cursor"]
 
-        # Process nested blocks recursively
-        processed_blocks = []
-        for block in blocks:
-            processed_block = self.process_block(block)
-            processed_blocks.append(processed_block)
+        return blocks
 
-        return processed_blocks
-
-    def process_block(self, block):
+    async def process_block(self, block):
         """
         Processes a block and recursively fetches any child blocks.
 
@@ -149,9 +259,10 @@ class NotionHistoryConnector:
 
         if has_children:
             # Fetch and process child blocks
-            children_response = self.notion.blocks.children.list(block_id=block_id)
-            for child_block in children_response["results"]:
-                child_blocks.append(self.process_block(child_block))
+            children = await self.get_block_children(block_id)
+            child_blocks = list(
+                await asyncio.gather(*(self.process_block(c) for c in children))
+            )
 
         return {
             "id": block_id,
@@ -226,7 +337,7 @@ class NotionHistoryConnector:
 #     fetcher = NotionPageFetcher(token)
 
 #     try:
-#         pages = fetcher.get_all_pages(args.start_date, args.end_date)
+#         pages = asyncio.run(fetcher.get_all_pages(args.start_date, args.end_date))
 #         print(f"Fetched {len(pages)} pages from Notion")
 #         for page in pages:
 #             print(f"- {page['title']}")
@@ -0,0 +1,130 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+from app.connectors.confluence_connector import ConfluenceConnector
+
+
+class StubConfluenceHandler(BaseHTTPRequestHandler):
+    """
+    Serves two pages of results for /spaces/SPACE/pages, one page for
+    /spaces/LIMITED/pages after rate limiting the first request, one footer
+    comment per page and 404 otherwise.
+    """
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        self.server.requests.append((parsed.path, query))
+
+        if parsed.path == "/wiki/api/v2/spaces/LIMITED/pages":
+            limited_requests = [
+                path for path, _ in self.server.requests if path == parsed.path
+            ]
+            if len(limited_requests) == 1:
+                self._send(429, {"message": "Too many requests"}, {"Retry-After": "0"})
+            else:
+                self._send(200, {"results": [{"id": "3"}], "_links": {}})
+        elif parsed.path.endswith("/footer-comments"):
+            page_id = parsed.path.split("/")[-2]
+            self._send(200, {"results": [{"id": f"comment-{page_id}"}]})
+        elif parsed.path.endswith("/inline-comments"):
+            self._send(200, {"results": []})
+        elif parsed.path == "/wiki/api/v2/spaces/SPACE/pages":
+            if query.get("cursor") == ["page2"]:
+                body = {"results": [{"id": "2"}], "_links": {}}
+            else:
+                body = {
+                    "results": [{"id": "1"}],
+                    "_links": {"next": "/wiki/api/v2/spaces/SPACE/pages?cursor=page2"},
+                }
+            self._send(200, body)
+        else:
+            self._send(404, {"message": "Not found"})
+
+    def _send(self, status, body, headers=None):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestConfluenceConnector(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubConfluenceHandler)
+        cls.server.requests = []
+        cls.server_thread = threading.Thread(
+            target=cls.server.serve_forever, daemon=True
+        )
+        cls.server_thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    async def asyncSetUp(self):
+        self.server.requests.clear()
+        self.http_client = httpx.AsyncClient()
+        self.connector = ConfluenceConnector(
+            base_url=self.base_url,
+            email="user@example.com",
+            api_token="token",
+            http_client=self.http_client,
+        )
+
+    async def asyncTearDown(self):
+        await self.http_client.aclose()
+
+    async def test_get_pages_in_space_follows_cursor(self):
+        pages = await self.connector.get_pages_in_space("SPACE")
+
+        self.assertEqual([page["id"] for page in pages], ["1", "2"])
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.server.requests[0][1]["body-format"], ["storage"])
+        self.assertEqual(self.server.requests[1][1]["cursor"], ["page2"])
+
+    async def test_get_pages_by_date_range_fetches_spaces_and_comments(self):
+        pages, error = await self.connector.get_pages_by_date_range(
+            "2024-01-01", "2024-01-31", space_ids=["SPACE", "LIMITED"]
+        )
+
+        self.assertIsNone(error)
+        self.assertEqual([page["id"] for page in pages], ["1", "2", "3"])
+        for page in pages:
+            self.assertEqual(page["comments"], [{"id": f"comment-{page['id']}"}])
+
+    async def test_make_api_request_retries_when_rate_limited(self):
+        result = await self.connector.make_api_request("spaces/LIMITED/pages")
+
+        self.assertEqual(result["results"], [{"id": "3"}])
+        self.assertEqual(len(self.server.requests), 2)
+
+    async def test_make_api_request_raises_on_error_status(self):
+        with self.assertRaises(Exception) as context:
+            await self.connector.make_api_request("spaces/MISSING/pages")
+
+        self.assertIn("Confluence API request failed", str(context.exception))
+
+    async def test_make_api_request_requires_credentials(self):
+        connector = ConfluenceConnector(http_client=self.http_client)
+
+        with self.assertRaises(ValueError):
+            await connector.make_api_request("spaces")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 from datetime import datetime
 from unittest.mock import Mock, patch
 
+import httpx
 from github3.exceptions import ForbiddenError  # Import the specific exception
 
 # Adjust the import path based on the actual location if test_github_connector.py
@@ -183,6 +184,93 @@ class TestGitHubConnector(unittest.TestCase):
             mock_logger.error.call_args[0][0],
         )
 
+    @patch("surfsense_backend.app.connectors.github_connector.github_login")
+    def test_get_repository_files_uses_single_recursive_tree(self, mock_github_login):
+        mock_gh_instance = Mock()
+        mock_github_login.return_value = mock_gh_instance
+        mock_gh_instance.me.return_value = Mock()
+
+        def tree_entry(path, entry_type="blob", size=10):
+            entry = Mock()
+            entry.path = path
+            entry.type = entry_type
+            entry.sha = f"sha-{path}"
+            entry.size = size
+            return entry
+
+        mock_tree = Mock()
+        mock_tree.as_dict.return_value = {"truncated": False}
+        mock_tree.tree = [
+            tree_entry("src", entry_type="tree", size=None),
+            tree_entry("src/app.py"),
+            tree_entry("README.md"),
+            tree_entry("image.png"),
+            tree_entry("big.py", size=2 * 1024 * 1024),
+            tree_entry("node_modules/lib/index.js"),
+        ]
+
+        mock_repo = Mock()
+        mock_repo.default_branch = "main"
+        mock_repo.html_url = "https://github.com/user/repo"
+        mock_repo.tree.return_value = mock_tree
+        mock_gh_instance.repository.return_value = mock_repo
+
+        connector = GitHubConnector(token="fake_token")
+        files = connector.get_repository_files("user/repo")
+
+        mock_repo.tree.assert_called_once_with("main", recursive=True)
+        mock_repo.directory_contents.assert_not_called()
+        self.assertEqual(
+            files,
+            [
+                {
+                    "path": "src/app.py",
+                    "sha": "sha-src/app.py",
+                    "url": "https://github.com/user/repo/blob/main/src/app.py",
+                    "size": 10,
+                    "type": "code",
+                },
+                {
+                    "path": "README.md",
+                    "sha": "sha-README.md",
+                    "url": "https://github.com/user/repo/blob/main/README.md",
+                    "size": 10,
+                    "type": "doc",
+                },
+            ],
+        )
+
+
+class TestGitHubConnectorFileContents(unittest.IsolatedAsyncioTestCase):
+    @patch("surfsense_backend.app.connectors.github_connector.github_login")
+    async def test_get_file_contents_fetches_blobs_by_sha(self, mock_github_login):
+        mock_github_login.return_value = Mock()
+        requested_urls = []
+
+        def handler(request):
+            requested_urls.append(str(request.url))
+            self.assertEqual(request.headers["Authorization"], "Bearer fake_token")
+            if request.url.path.endswith("/missing"):
+                return httpx.Response(404, json={"message": "Not Found"})
+            return httpx.Response(200, content=b"print('hi')")
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as http_client:
+            connector = GitHubConnector(token="fake_token", http_client=http_client)
+            contents = await connector.get_file_contents(
+                "user/repo",
+                [
+                    {"path": "app.py", "sha": "abc123"},
+                    {"path": "gone.py", "sha": "missing"},
+                ],
+            )
+
+        self.assertEqual(contents, {"app.py": "print('hi')", "gone.py": None})
+        self.assertIn(
+            "https://api.github.com/repos/user/repo/git/blobs/abc123", requested_urls
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import Mock, call, patch
+from unittest.mock import AsyncMock, Mock, call, patch
 
 from slack_sdk.errors import SlackApiError
 
@@ -7,14 +7,29 @@ from slack_sdk.errors import SlackApiError
 from .slack_history import SlackHistory
 
 
-class TestSlackHistoryGetAllChannels(unittest.TestCase):
+def mock_async_client(mock_async_web_client, **methods):
+    """Give the patched AsyncWebClient instance AsyncMock API methods."""
+    mock_client_instance = mock_async_web_client.return_value
+    for name, method in methods.items():
+        setattr(mock_client_instance, name, method)
+    return mock_client_instance
+
+
+def mock_rate_limiter(mock_rate_limiter_class):
+    """Make the patched TokenBucketRateLimiter instances never wait."""
+    mock_limiter_instance = mock_rate_limiter_class.return_value
+    mock_limiter_instance.acquire = AsyncMock()
+    return mock_limiter_instance
+
+
+class TestSlackHistoryGetAllChannels(unittest.IsolatedAsyncioTestCase):
     @patch("surfsense_backend.app.connectors.slack_history.logger")
-    @patch("surfsense_backend.app.connectors.slack_history.time.sleep")
-    @patch("slack_sdk.WebClient")
-    def test_get_all_channels_pagination_with_delay(
-        self, mock_web_client, mock_sleep, mock_logger
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_get_all_channels_pagination_is_rate_limited(
+        self, mock_web_client, mock_limiter_class, mock_logger
     ):
-        mock_client_instance = mock_web_client.return_value
+        mock_limiter = mock_rate_limiter(mock_limiter_class)
 
         # Mock API responses now include is_private and is_member
         page1_response = {
@@ -30,14 +45,13 @@ class TestSlackHistoryGetAllChannels(unittest.TestCase):
             ],
             "response_metadata": {"next_cursor": ""},
         }
-
-        mock_client_instance.conversations_list.side_effect = [
-            page1_response,
-            page2_response,
-        ]
+        mock_client_instance = mock_async_client(
+            mock_web_client,
+            conversations_list=AsyncMock(side_effect=[page1_response, page2_response]),
+        )
 
         slack_history = SlackHistory(token="fake_token")
-        channels_list = slack_history.get_all_channels(include_private=True)
+        channels_list = await slack_history.get_all_channels(include_private=True)
 
         expected_channels_list = [
             {"id": "C1", "name": "general", "is_private": False, "is_member": True},
@@ -46,9 +60,7 @@ class TestSlackHistoryGetAllChannels(unittest.TestCase):
         ]
 
         self.assertEqual(len(channels_list), 3)
-        self.assertListEqual(
-            channels_list, expected_channels_list
-        )  # Assert list equality
+        self.assertListEqual(channels_list, expected_channels_list)
 
         expected_calls = [
             call(types="public_channel,private_channel", cursor=None, limit=1000),
@@ -59,18 +71,17 @@ class TestSlackHistoryGetAllChannels(unittest.TestCase):
         mock_client_instance.conversations_list.assert_has_calls(expected_calls)
         self.assertEqual(mock_client_instance.conversations_list.call_count, 2)
 
-        mock_sleep.assert_called_once_with(3)
-        mock_logger.info.assert_called_once_with(
-            "Paginating for channels, waiting 3 seconds before next call. Cursor: cursor123"
-        )
+        # Every page waits for the rate limiter instead of a fixed sleep
+        self.assertEqual(mock_limiter.acquire.await_count, 2)
+        mock_limiter.pause.assert_not_called()
 
     @patch("surfsense_backend.app.connectors.slack_history.logger")
-    @patch("surfsense_backend.app.connectors.slack_history.time.sleep")
-    @patch("slack_sdk.WebClient")
-    def test_get_all_channels_rate_limit_with_retry_after(
-        self, mock_web_client, mock_sleep, mock_logger
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_get_all_channels_rate_limit_with_retry_after(
+        self, mock_web_client, mock_limiter_class, mock_logger
     ):
-        mock_client_instance = mock_web_client.return_value
+        mock_limiter = mock_rate_limiter(mock_limiter_class)
 
         mock_error_response = Mock()
         mock_error_response.status_code = 429
@@ -82,14 +93,18 @@ class TestSlackHistoryGetAllChannels(unittest.TestCase):
             ],
             "response_metadata": {"next_cursor": ""},
         }
-
-        mock_client_instance.conversations_list.side_effect = [
-            SlackApiError(message="ratelimited", response=mock_error_response),
-            successful_response,
-        ]
+        mock_client_instance = mock_async_client(
+            mock_web_client,
+            conversations_list=AsyncMock(
+                side_effect=[
+                    SlackApiError(message="ratelimited", response=mock_error_response),
+                    successful_response,
+                ]
+            ),
+        )
 
         slack_history = SlackHistory(token="fake_token")
-        channels_list = slack_history.get_all_channels(include_private=True)
+        channels_list = await slack_history.get_all_channels(include_private=True)
 
         expected_channels_list = [
             {"id": "C1", "name": "general", "is_private": False, "is_member": True}
@@ -97,9 +112,9 @@ class TestSlackHistoryGetAllChannels(unittest.TestCase):
         self.assertEqual(len(channels_list), 1)
         self.assertListEqual(channels_list, expected_channels_list)
 
-        mock_sleep.assert_called_once_with(5)
+        mock_limiter.pause.assert_called_once_with(5)
         mock_logger.warning.assert_called_once_with(
-            "Slack API rate limit hit while fetching channels. Waiting for 5 seconds. Cursor: None"
+            "Rate limited by Slack on conversations_list. Retrying after 5 seconds."
         )
 
         expected_calls = [
@@ -110,12 +125,12 @@ class TestSlackHistoryGetAllChannels(unittest.TestCase):
         self.assertEqual(mock_client_instance.conversations_list.call_count, 2)
 
     @patch("surfsense_backend.app.connectors.slack_history.logger")
-    @patch("surfsense_backend.app.connectors.slack_history.time.sleep")
-    @patch("slack_sdk.WebClient")
-    def test_get_all_channels_rate_limit_no_retry_after_valid_header(
-        self, mock_web_client, mock_sleep, mock_logger
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_get_all_channels_rate_limit_no_retry_after_valid_header(
+        self, mock_web_client, mock_limiter_class, mock_logger
     ):
-        mock_client_instance = mock_web_client.return_value
+        mock_limiter = mock_rate_limiter(mock_limiter_class)
 
         mock_error_response = Mock()
         mock_error_response.status_code = 429
@@ -127,32 +142,36 @@ class TestSlackHistoryGetAllChannels(unittest.TestCase):
             ],
             "response_metadata": {"next_cursor": ""},
         }
-
-        mock_client_instance.conversations_list.side_effect = [
-            SlackApiError(message="ratelimited", response=mock_error_response),
-            successful_response,
-        ]
+        mock_client_instance = mock_async_client(
+            mock_web_client,
+            conversations_list=AsyncMock(
+                side_effect=[
+                    SlackApiError(message="ratelimited", response=mock_error_response),
+                    successful_response,
+                ]
+            ),
+        )
 
         slack_history = SlackHistory(token="fake_token")
-        channels_list = slack_history.get_all_channels(include_private=True)
+        channels_list = await slack_history.get_all_channels(include_private=True)
 
         expected_channels_list = [
             {"id": "C1", "name": "general", "is_private": False, "is_member": True}
         ]
         self.assertListEqual(channels_list, expected_channels_list)
-        mock_sleep.assert_called_once_with(60)  # Default fallback
+        mock_limiter.pause.assert_called_once_with(60)  # Default fallback
         mock_logger.warning.assert_called_once_with(
-            "Slack API rate limit hit while fetching channels. Waiting for 60 seconds. Cursor: None"
+            "Rate limited by Slack on conversations_list. Retrying after 60 seconds."
         )
         self.assertEqual(mock_client_instance.conversations_list.call_count, 2)
 
     @patch("surfsense_backend.app.connectors.slack_history.logger")
-    @patch("surfsense_backend.app.connectors.slack_history.time.sleep")
-    @patch("slack_sdk.WebClient")
-    def test_get_all_channels_rate_limit_no_retry_after_header(
-        self, mock_web_client, mock_sleep, mock_logger
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_get_all_channels_rate_limit_no_retry_after_header(
+        self, mock_web_client, mock_limiter_class, mock_logger
     ):
-        mock_client_instance = mock_web_client.return_value
+        mock_limiter = mock_rate_limiter(mock_limiter_class)
 
         mock_error_response = Mock()
         mock_error_response.status_code = 429
@@ -164,32 +183,36 @@ class TestSlackHistoryGetAllChannels(unittest.TestCase):
             ],
             "response_metadata": {"next_cursor": ""},
         }
-
-        mock_client_instance.conversations_list.side_effect = [
-            SlackApiError(message="ratelimited", response=mock_error_response),
-            successful_response,
-        ]
+        mock_client_instance = mock_async_client(
+            mock_web_client,
+            conversations_list=AsyncMock(
+                side_effect=[
+                    SlackApiError(message="ratelimited", response=mock_error_response),
+                    successful_response,
+                ]
+            ),
+        )
 
         slack_history = SlackHistory(token="fake_token")
-        channels_list = slack_history.get_all_channels(include_private=True)
+        channels_list = await slack_history.get_all_channels(include_private=True)
 
         expected_channels_list = [
             {"id": "C1", "name": "general", "is_private": False, "is_member": True}
         ]
         self.assertListEqual(channels_list, expected_channels_list)
-        mock_sleep.assert_called_once_with(60)  # Default fallback
+        mock_limiter.pause.assert_called_once_with(60)  # Default fallback
         mock_logger.warning.assert_called_once_with(
-            "Slack API rate limit hit while fetching channels. Waiting for 60 seconds. Cursor: None"
+            "Rate limited by Slack on conversations_list. Retrying after 60 seconds."
         )
         self.assertEqual(mock_client_instance.conversations_list.call_count, 2)
 
     @patch("surfsense_backend.app.connectors.slack_history.logger")
-    @patch("surfsense_backend.app.connectors.slack_history.time.sleep")
-    @patch("slack_sdk.WebClient")
-    def test_get_all_channels_other_slack_api_error(
-        self, mock_web_client, mock_sleep, mock_logger
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_get_all_channels_other_slack_api_error(
+        self, mock_web_client, mock_limiter_class, mock_logger
     ):
-        mock_client_instance = mock_web_client.return_value
+        mock_limiter = mock_rate_limiter(mock_limiter_class)
 
         mock_error_response = Mock()
         mock_error_response.status_code = 500
@@ -199,28 +222,30 @@ class TestSlackHistoryGetAllChannels(unittest.TestCase):
         original_error = SlackApiError(
             message="server error", response=mock_error_response
         )
-        mock_client_instance.conversations_list.side_effect = original_error
+        mock_client_instance = mock_async_client(
+            mock_web_client, conversations_list=AsyncMock(side_effect=original_error)
+        )
 
         slack_history = SlackHistory(token="fake_token")
 
         with self.assertRaises(SlackApiError) as context:
-            slack_history.get_all_channels(include_private=True)
+            await slack_history.get_all_channels(include_private=True)
 
         self.assertEqual(context.exception.response.status_code, 500)
         self.assertIn("server error", str(context.exception))
-        mock_sleep.assert_not_called()
+        mock_limiter.pause.assert_not_called()
         mock_logger.warning.assert_not_called()  # Ensure no rate limit log
         mock_client_instance.conversations_list.assert_called_once_with(
             types="public_channel,private_channel", cursor=None, limit=1000
         )
 
     @patch("surfsense_backend.app.connectors.slack_history.logger")
-    @patch("surfsense_backend.app.connectors.slack_history.time.sleep")
-    @patch("slack_sdk.WebClient")
-    def test_get_all_channels_handles_missing_name_id_gracefully(
-        self, mock_web_client, mock_sleep, mock_logger
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_get_all_channels_handles_missing_name_id_gracefully(
+        self, mock_web_client, mock_limiter_class, mock_logger
     ):
-        mock_client_instance = mock_web_client.return_value
+        mock_limiter = mock_rate_limiter(mock_limiter_class)
 
         response_with_malformed_data = {
             "channels": [
@@ -235,13 +260,13 @@ class TestSlackHistoryGetAllChannels(unittest.TestCase):
             ],
             "response_metadata": {"next_cursor": ""},
         }
-
-        mock_client_instance.conversations_list.return_value = (
-            response_with_malformed_data
+        mock_client_instance = mock_async_client(
+            mock_web_client,
+            conversations_list=AsyncMock(return_value=response_with_malformed_data),
         )
 
         slack_history = SlackHistory(token="fake_token")
-        channels_list = slack_history.get_all_channels(include_private=True)
+        channels_list = await slack_history.get_all_channels(include_private=True)
 
         expected_channels_list = [
             {
@@ -262,89 +287,105 @@ class TestSlackHistoryGetAllChannels(unittest.TestCase):
             "Channel found with missing name or id. Data: {'name': 'channel_missing_id', 'is_private': False, 'is_member': True}"
         )
 
-        mock_sleep.assert_not_called()
+        mock_limiter.pause.assert_not_called()
         mock_client_instance.conversations_list.assert_called_once_with(
             types="public_channel,private_channel", cursor=None, limit=1000
         )
 
 
-if __name__ == "__main__":
-    unittest.main()
-
-
-class TestSlackHistoryGetConversationHistory(unittest.TestCase):
+class TestSlackHistoryGetConversationHistory(unittest.IsolatedAsyncioTestCase):
     @patch("surfsense_backend.app.connectors.slack_history.logger")
-    @patch("surfsense_backend.app.connectors.slack_history.time.sleep")
-    @patch("slack_sdk.WebClient")
-    def test_proactive_delay_single_page(
-        self, mock_web_client, mock_time_sleep, mock_logger
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_rate_limiter_single_page(
+        self, mock_web_client, mock_limiter_class, mock_logger
     ):
-        mock_client_instance = mock_web_client.return_value
-        mock_client_instance.conversations_history.return_value = {
-            "messages": [{"text": "msg1"}],
-            "has_more": False,
-        }
+        mock_limiter = mock_rate_limiter(mock_limiter_class)
+        mock_async_client(
+            mock_web_client,
+            conversations_history=AsyncMock(
+                return_value={"messages": [{"text": "msg1"}], "has_more": False}
+            ),
+        )
 
         slack_history = SlackHistory(token="fake_token")
-        slack_history.get_conversation_history(channel_id="C123")
+        await slack_history.get_conversation_history(channel_id="C123")
 
-        mock_time_sleep.assert_called_once_with(1.2)  # Proactive delay
+        mock_limiter.acquire.assert_awaited_once()
 
     @patch("surfsense_backend.app.connectors.slack_history.logger")
-    @patch("surfsense_backend.app.connectors.slack_history.time.sleep")
-    @patch("slack_sdk.WebClient")
-    def test_proactive_delay_multiple_pages(
-        self, mock_web_client, mock_time_sleep, mock_logger
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_rate_limiter_multiple_pages(
+        self, mock_web_client, mock_limiter_class, mock_logger
     ):
-        mock_client_instance = mock_web_client.return_value
-        mock_client_instance.conversations_history.side_effect = [
-            {
-                "messages": [{"text": "msg1"}],
-                "has_more": True,
-                "response_metadata": {"next_cursor": "cursor1"},
-            },
-            {"messages": [{"text": "msg2"}], "has_more": False},
-        ]
+        mock_limiter = mock_rate_limiter(mock_limiter_class)
+        mock_client_instance = mock_async_client(
+            mock_web_client,
+            conversations_history=AsyncMock(
+                side_effect=[
+                    {
+                        "messages": [{"text": "msg1"}],
+                        "has_more": True,
+                        "response_metadata": {"next_cursor": "cursor1"},
+                    },
+                    {"messages": [{"text": "msg2"}], "has_more": False},
+                ]
+            ),
+        )
 
         slack_history = SlackHistory(token="fake_token")
-        slack_history.get_conversation_history(channel_id="C123")
-
-        # Expected calls: 1.2 (page1), 1.2 (page2)
-        self.assertEqual(mock_time_sleep.call_count, 2)
-        mock_time_sleep.assert_has_calls([call(1.2), call(1.2)])
+        messages = await slack_history.get_conversation_history(channel_id="C123")
+
+        self.assertEqual([msg["text"] for msg in messages], ["msg1", "msg2"])
+        self.assertEqual(mock_limiter.acquire.await_count, 2)
+        mock_client_instance.conversations_history.assert_has_calls(
+            [
+                call(channel="C123", limit=1000),
+                call(channel="C123", limit=1000, cursor="cursor1"),
+            ]
+        )
 
     @patch("surfsense_backend.app.connectors.slack_history.logger")
-    @patch("surfsense_backend.app.connectors.slack_history.time.sleep")
-    @patch("slack_sdk.WebClient")
-    def test_retry_after_logic(self, mock_web_client, mock_time_sleep, mock_logger):
-        mock_client_instance = mock_web_client.return_value
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_retry_after_logic(
+        self, mock_web_client, mock_limiter_class, mock_logger
+    ):
+        mock_limiter = mock_rate_limiter(mock_limiter_class)
 
         mock_error_response = Mock()
         mock_error_response.status_code = 429
         mock_error_response.headers = {"Retry-After": "5"}
 
-        mock_client_instance.conversations_history.side_effect = [
-            SlackApiError(message="ratelimited", response=mock_error_response),
-            {"messages": [{"text": "msg1"}], "has_more": False},
-        ]
+        mock_async_client(
+            mock_web_client,
+            conversations_history=AsyncMock(
+                side_effect=[
+                    SlackApiError(message="ratelimited", response=mock_error_response),
+                    {"messages": [{"text": "msg1"}], "has_more": False},
+                ]
+            ),
+        )
 
         slack_history = SlackHistory(token="fake_token")
-        messages = slack_history.get_conversation_history(channel_id="C123")
+        messages = await slack_history.get_conversation_history(channel_id="C123")
 
         self.assertEqual(len(messages), 1)
         self.assertEqual(messages[0]["text"], "msg1")
 
-        # Expected sleep calls: 1.2 (proactive for 1st attempt), 5 (rate limit), 1.2 (proactive for 2nd attempt)
-        mock_time_sleep.assert_has_calls(
-            [call(1.2), call(5), call(1.2)], any_order=False
-        )
+        # The rate-limited tier is paused for Retry-After, then the call is retried
+        mock_limiter.pause.assert_called_once_with(5)
+        self.assertEqual(mock_limiter.acquire.await_count, 2)
         mock_logger.warning.assert_called_once()  # Check that a warning was logged for rate limiting
 
     @patch("surfsense_backend.app.connectors.slack_history.logger")
-    @patch("surfsense_backend.app.connectors.slack_history.time.sleep")
-    @patch("slack_sdk.WebClient")
-    def test_not_in_channel_error(self, mock_web_client, mock_time_sleep, mock_logger):
-        mock_client_instance = mock_web_client.return_value
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_not_in_channel_error(
+        self, mock_web_client, mock_limiter_class, mock_logger
+    ):
+        mock_rate_limiter(mock_limiter_class)
 
         mock_error_response = Mock()
         mock_error_response.status_code = (
@@ -352,29 +393,30 @@ class TestSlackHistoryGetConversationHistory(unittest.TestCase):
         )
         mock_error_response.data = {"ok": False, "error": "not_in_channel"}
 
-        # This error is now raised by the inner try-except, then caught by the outer one
-        mock_client_instance.conversations_history.side_effect = SlackApiError(
-            message="not_in_channel error", response=mock_error_response
+        mock_async_client(
+            mock_web_client,
+            conversations_history=AsyncMock(
+                side_effect=SlackApiError(
+                    message="not_in_channel error", response=mock_error_response
+                )
+            ),
         )
 
         slack_history = SlackHistory(token="fake_token")
-        messages = slack_history.get_conversation_history(channel_id="C123")
+        messages = await slack_history.get_conversation_history(channel_id="C123")
 
         self.assertEqual(messages, [])
         mock_logger.warning.assert_called_with(
             "Bot is not in channel 'C123'. Cannot fetch history. Please add the bot to this channel."
         )
-        mock_time_sleep.assert_called_once_with(
-            1.2
-        )  # Proactive delay before the API call
 
     @patch("surfsense_backend.app.connectors.slack_history.logger")
-    @patch("surfsense_backend.app.connectors.slack_history.time.sleep")
-    @patch("slack_sdk.WebClient")
-    def test_other_slack_api_error_propagates(
-        self, mock_web_client, mock_time_sleep, mock_logger
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_other_slack_api_error_propagates(
+        self, mock_web_client, mock_limiter_class, mock_logger
     ):
-        mock_client_instance = mock_web_client.return_value
+        mock_limiter = mock_rate_limiter(mock_limiter_class)
 
         mock_error_response = Mock()
         mock_error_response.status_code = 500
@@ -383,33 +425,37 @@ class TestSlackHistoryGetConversationHistory(unittest.TestCase):
             message="server error", response=mock_error_response
         )
 
-        mock_client_instance.conversations_history.side_effect = original_error
+        mock_async_client(
+            mock_web_client, conversations_history=AsyncMock(side_effect=original_error)
+        )
 
         slack_history = SlackHistory(token="fake_token")
 
         with self.assertRaises(SlackApiError) as context:
-            slack_history.get_conversation_history(channel_id="C123")
+            await slack_history.get_conversation_history(channel_id="C123")
 
         self.assertIn(
             "Error retrieving history for channel C123", str(context.exception)
         )
         self.assertIs(context.exception.response, mock_error_response)
-        mock_time_sleep.assert_called_once_with(1.2)  # Proactive delay
+        mock_limiter.pause.assert_not_called()
 
     @patch("surfsense_backend.app.connectors.slack_history.logger")
-    @patch("surfsense_backend.app.connectors.slack_history.time.sleep")
-    @patch("slack_sdk.WebClient")
-    def test_general_exception_propagates(
-        self, mock_web_client, mock_time_sleep, mock_logger
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_general_exception_propagates(
+        self, mock_web_client, mock_limiter_class, mock_logger
     ):
-        mock_client_instance = mock_web_client.return_value
+        mock_rate_limiter(mock_limiter_class)
         original_error = Exception("Something broke")
-        mock_client_instance.conversations_history.side_effect = original_error
+        mock_async_client(
+            mock_web_client, conversations_history=AsyncMock(side_effect=original_error)
+        )
 
         slack_history = SlackHistory(token="fake_token")
 
         with self.assertRaises(Exception) as context:  # Check for generic Exception
-            slack_history.get_conversation_history(channel_id="C123")
+            await slack_history.get_conversation_history(channel_id="C123")
 
         self.assertIs(
             context.exception, original_error
@@ -417,15 +463,45 @@ class TestSlackHistoryGetConversationHistory(unittest.TestCase):
         mock_logger.error.assert_called_once_with(
             "Unexpected error in get_conversation_history for channel C123: Something broke"
         )
-        mock_time_sleep.assert_called_once_with(1.2)  # Proactive delay
 
+    @patch("surfsense_backend.app.connectors.slack_history.logger")
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_history_by_date_range_starts_after_cursor(
+        self, mock_web_client, mock_limiter_class, mock_logger
+    ):
+        mock_rate_limiter(mock_limiter_class)
+        mock_conversations_history = AsyncMock(
+            return_value={"messages": [{"ts": "1700000100.000200"}], "has_more": False}
+        )
+        mock_async_client(
+            mock_web_client, conversations_history=mock_conversations_history
+        )
 
-class TestSlackHistoryGetUserInfo(unittest.TestCase):
+        slack_history = SlackHistory(token="fake_token")
+        messages, error = await slack_history.get_history_by_date_range(
+            channel_id="C123",
+            start_date="2023-11-01",
+            end_date="2023-11-30",
+            after_ts="1700000000.000100",
+        )
+
+        self.assertIsNone(error)
+        self.assertEqual(messages, [{"ts": "1700000100.000200"}])
+        self.assertEqual(
+            mock_conversations_history.await_args.kwargs["oldest"],
+            "1700000000.000100",
+        )
+
+
+class TestSlackHistoryGetUserInfo(unittest.IsolatedAsyncioTestCase):
     @patch("surfsense_backend.app.connectors.slack_history.logger")
-    @patch("surfsense_backend.app.connectors.slack_history.time.sleep")
-    @patch("slack_sdk.WebClient")
-    def test_retry_after_logic(self, mock_web_client, mock_time_sleep, mock_logger):
-        mock_client_instance = mock_web_client.return_value
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_retry_after_logic(
+        self, mock_web_client, mock_limiter_class, mock_logger
+    ):
+        mock_limiter = mock_rate_limiter(mock_limiter_class)
 
         mock_error_response = Mock()
         mock_error_response.status_code = 429
@@ -433,20 +509,27 @@ class TestSlackHistoryGetUserInfo(unittest.TestCase):
 
         successful_user_data = {"id": "U123", "name": "testuser"}
 
-        mock_client_instance.users_info.side_effect = [
-            SlackApiError(message="ratelimited_userinfo", response=mock_error_response),
-            {"user": successful_user_data},
-        ]
+        mock_client_instance = mock_async_client(
+            mock_web_client,
+            users_info=AsyncMock(
+                side_effect=[
+                    SlackApiError(
+                        message="ratelimited_userinfo", response=mock_error_response
+                    ),
+                    {"user": successful_user_data},
+                ]
+            ),
+        )
 
         slack_history = SlackHistory(token="fake_token")
-        user_info = slack_history.get_user_info(user_id="U123")
+        user_info = await slack_history.get_user_info(user_id="U123")
 
         self.assertEqual(user_info, successful_user_data)
 
-        # Assert that time.sleep was called for the rate limit
-        mock_time_sleep.assert_called_once_with(3)
+        # Assert that the tier was paused for the rate limit
+        mock_limiter.pause.assert_called_once_with(3)
         mock_logger.warning.assert_called_once_with(
-            "Rate limited by Slack on users.info for user U123. Retrying after 3 seconds."
+            "Rate limited by Slack on users_info. Retrying after 3 seconds."
         )
         # Assert users_info was called twice (original + retry)
         self.assertEqual(mock_client_instance.users_info.call_count, 2)
@@ -455,14 +538,12 @@ class TestSlackHistoryGetUserInfo(unittest.TestCase):
         )
 
     @patch("surfsense_backend.app.connectors.slack_history.logger")
-    @patch(
-        "surfsense_backend.app.connectors.slack_history.time.sleep"
-    )  # time.sleep might be called by other logic, but not expected here
-    @patch("slack_sdk.WebClient")
-    def test_other_slack_api_error_propagates(
-        self, mock_web_client, mock_time_sleep, mock_logger
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_other_slack_api_error_propagates(
+        self, mock_web_client, mock_limiter_class, mock_logger
     ):
-        mock_client_instance = mock_web_client.return_value
+        mock_limiter = mock_rate_limiter(mock_limiter_class)
 
         mock_error_response = Mock()
         mock_error_response.status_code = 500  # Some other error
@@ -471,32 +552,36 @@ class TestSlackHistoryGetUserInfo(unittest.TestCase):
             message="internal server error", response=mock_error_response
         )
 
-        mock_client_instance.users_info.side_effect = original_error
+        mock_async_client(
+            mock_web_client, users_info=AsyncMock(side_effect=original_error)
+        )
 
         slack_history = SlackHistory(token="fake_token")
 
         with self.assertRaises(SlackApiError) as context:
-            slack_history.get_user_info(user_id="U123")
+            await slack_history.get_user_info(user_id="U123")
 
         # Check that the raised error is the one we expect
         self.assertIn("Error retrieving user info for U123", str(context.exception))
         self.assertIs(context.exception.response, mock_error_response)
-        mock_time_sleep.assert_not_called()  # No rate limit sleep
+        mock_limiter.pause.assert_not_called()  # No rate limit pause
 
     @patch("surfsense_backend.app.connectors.slack_history.logger")
-    @patch("surfsense_backend.app.connectors.slack_history.time.sleep")
-    @patch("slack_sdk.WebClient")
-    def test_general_exception_propagates(
-        self, mock_web_client, mock_time_sleep, mock_logger
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_general_exception_propagates(
+        self, mock_web_client, mock_limiter_class, mock_logger
     ):
-        mock_client_instance = mock_web_client.return_value
+        mock_limiter = mock_rate_limiter(mock_limiter_class)
         original_error = Exception("A very generic problem")
-        mock_client_instance.users_info.side_effect = original_error
+        mock_async_client(
+            mock_web_client, users_info=AsyncMock(side_effect=original_error)
+        )
 
         slack_history = SlackHistory(token="fake_token")
 
         with self.assertRaises(Exception) as context:
-            slack_history.get_user_info(user_id="U123")
+            await slack_history.get_user_info(user_id="U123")
 
         self.assertIs(
             context.exception, original_error
@@ -504,4 +589,84 @@ class TestSlackHistoryGetUserInfo(unittest.TestCase):
         mock_logger.error.assert_called_once_with(
             "Unexpected error in get_user_info for user U123: A very generic problem"
         )
-        mock_time_sleep.assert_not_called()  # No rate limit sleep
+        mock_limiter.pause.assert_not_called()  # No rate limit pause
+
+
+class TestSlackHistoryUserDirectory(unittest.IsolatedAsyncioTestCase):
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_format_message_uses_paginated_user_directory(
+        self, mock_web_client, mock_limiter_class
+    ):
+        mock_rate_limiter(mock_limiter_class)
+        mock_client_instance = mock_async_client(
+            mock_web_client,
+            users_info=AsyncMock(),
+            users_list=AsyncMock(
+                side_effect=[
+                    {
+                        "members": [
+                            {
+                                "id": "U1",
+                                "real_name": "Alice",
+                                "profile": {"email": "alice@example.com"},
+                            }
+                        ],
+                        "response_metadata": {"next_cursor": "cursor_2"},
+                    },
+                    {
+                        "members": [{"id": "U2", "real_name": "Bob", "profile": {}}],
+                        "response_metadata": {"next_cursor": ""},
+                    },
+                ]
+            ),
+        )
+
+        slack_history = SlackHistory(token="fake_token")
+        messages = [
+            {"text": "hi", "ts": "1700000000.0", "user": "U1"},
+            {"text": "hello", "ts": "1700000001.0", "user": "U2"},
+            {"text": "again", "ts": "1700000002.0", "user": "U1"},
+        ]
+        formatted = [
+            await slack_history.format_message(msg, include_user_info=True)
+            for msg in messages
+        ]
+
+        self.assertEqual(
+            [msg["user_name"] for msg in formatted], ["Alice", "Bob", "Alice"]
+        )
+        self.assertEqual(formatted[0]["user_email"], "alice@example.com")
+        mock_client_instance.users_list.assert_has_calls(
+            [call(limit=200, cursor=None), call(limit=200, cursor="cursor_2")]
+        )
+        mock_client_instance.users_info.assert_not_called()
+
+    @patch("surfsense_backend.app.connectors.slack_history.TokenBucketRateLimiter")
+    @patch("surfsense_backend.app.connectors.slack_history.AsyncWebClient")
+    async def test_format_message_falls_back_to_users_info_once(
+        self, mock_web_client, mock_limiter_class
+    ):
+        mock_rate_limiter(mock_limiter_class)
+        mock_client_instance = mock_async_client(
+            mock_web_client,
+            users_list=AsyncMock(),
+            users_info=AsyncMock(
+                return_value={"user": {"id": "U9", "real_name": "Guest", "profile": {}}}
+            ),
+        )
+
+        slack_history = SlackHistory(token="fake_token", user_directory={})
+        for _ in range(3):
+            formatted = await slack_history.format_message(
+                {"text": "hi", "ts": "1700000000.0", "user": "U9"},
+                include_user_info=True,
+            )
+
+        self.assertEqual(formatted["user_name"], "Guest")
+        mock_client_instance.users_list.assert_not_called()
+        mock_client_instance.users_info.assert_called_once_with(user="U9")
+
+
+if __name__ == "__main__":
+    unittest.main()
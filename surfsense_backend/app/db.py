@@ -13,18 +13,26 @@ from sqlalchemy import (
     Column,
     Enum as SQLAlchemyEnum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     text,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, relationship
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    declared_attr,
+    deferred,
+    relationship,
+)
 
 from app.config import config
 from app.retriver.chunks_hybrid_search import ChucksHybridSearchRetriever
 from app.retriver.documents_hybrid_search import DocumentHybridSearchRetriever
+from app.retriver.vector_index import get_vector_index_mode, get_vector_index_sql
 
 if config.AUTH_TYPE == "GOOGLE":
     from fastapi_users.db import SQLAlchemyBaseOAuthAccountTableUUID
@@ -105,6 +113,13 @@ class LogStatus(str, Enum):
     FAILED = "FAILED"
 
 
+class JobStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -151,6 +166,9 @@ class Document(BaseModel, TimestampMixin):
     content = Column(Text, nullable=False)
     content_hash = Column(String, nullable=False, index=True, unique=True)
     embedding = Column(Vector(config.embedding_model_instance.dimension))
+    # to_tsvector('english', content), kept up to date by a trigger (see
+    # setup_indexes) so full-text ranking doesn't re-parse the content
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
 
     search_space_id = Column(
         Integer, ForeignKey("searchspaces.id", ondelete="CASCADE"), nullable=False
@@ -166,12 +184,31 @@ class Chunk(BaseModel, TimestampMixin):
 
     content = Column(Text, nullable=False)
     embedding = Column(Vector(config.embedding_model_instance.dimension))
+    # Hash of (embedding model, content) used to reuse embeddings across ingestions
+    embedding_hash = Column(String(64), nullable=True, index=True)
+    # to_tsvector('english', content), kept up to date by a trigger
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
 
     document_id = Column(
         Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
     )
     document = relationship("Document", back_populates="chunks")
 
+    # Copied from the document so searches filter chunks without joining
+    # documents, before (not after) walking the vector index
+    search_space_id = Column(
+        Integer, ForeignKey("searchspaces.id", ondelete="CASCADE"), nullable=False
+    )
+    document_type = Column(SQLAlchemyEnum(DocumentType), nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_chunks_search_space_id_document_type",
+            "search_space_id",
+            "document_type",
+        ),
+    )
+
 
 class Podcast(BaseModel, TimestampMixin):
     __tablename__ = "podcasts"
@@ -232,6 +269,8 @@ class SearchSourceConnector(BaseModel, TimestampMixin):
     )
     is_indexable = Column(Boolean, nullable=False, default=False)
     last_indexed_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    # Per-item versions and document IDs for incremental re-indexing
+    sync_state = Column(JSON, nullable=True)
     config = Column(JSON, nullable=False)
 
     user_id = Column(
@@ -280,6 +319,38 @@ class Log(BaseModel, TimestampMixin):
     search_space = relationship("SearchSpace", back_populates="logs")
 
 
+class Job(BaseModel, TimestampMixin):
+    __tablename__ = "jobs"
+
+    task_name = Column(String(100), nullable=False, index=True)
+    payload = Column(JSON, nullable=False, default={})
+    status = Column(
+        SQLAlchemyEnum(JobStatus),
+        nullable=False,
+        default=JobStatus.QUEUED,
+        index=True,
+    )
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+        index=True,
+    )
+    locked_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    locked_by = Column(String(200), nullable=True)
+    finished_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+
 if config.AUTH_TYPE == "GOOGLE":
 
     class OAuthAccount(SQLAlchemyBaseOAuthAccountTableUUID, Base):
@@ -360,30 +431,57 @@ async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
 
 async def setup_indexes():
+    # Vector indexes hold full, half precision or binary quantized embeddings
+    # as configured by VECTOR_INDEX_MODE
+    vector_index_suffix, vector_index_definition = get_vector_index_sql(
+        get_vector_index_mode(), config.embedding_model_instance.dimension
+    )
+
     async with engine.begin() as conn:
         # Create indexes
         # Document Summary Indexes
         await conn.execute(
             text(
-                "CREATE INDEX IF NOT EXISTS document_vector_index ON documents USING hnsw (embedding public.vector_cosine_ops)"
+                f"CREATE INDEX IF NOT EXISTS document_vector{vector_index_suffix}_index ON documents USING hnsw {vector_index_definition}"
             )
         )
         await conn.execute(
             text(
-                "CREATE INDEX IF NOT EXISTS document_search_index ON documents USING gin (to_tsvector('english', content))"
+                "CREATE INDEX IF NOT EXISTS document_search_vector_index ON documents USING gin (search_vector)"
             )
         )
         # Document Chuck Indexes
         await conn.execute(
             text(
-                "CREATE INDEX IF NOT EXISTS chucks_vector_index ON chunks USING hnsw (embedding public.vector_cosine_ops)"
+                f"CREATE INDEX IF NOT EXISTS chucks_vector{vector_index_suffix}_index ON chunks USING hnsw {vector_index_definition}"
             )
         )
         await conn.execute(
             text(
-                "CREATE INDEX IF NOT EXISTS chucks_search_index ON chunks USING gin (to_tsvector('english', content))"
+                "CREATE INDEX IF NOT EXISTS chunks_search_vector_index ON chunks USING gin (search_vector)"
             )
         )
+        # Full-text search vectors, computed when content is written
+        for table in ("documents", "chunks"):
+            await conn.execute(
+                text(
+                    f"""
+                    DO $$
+                    BEGIN
+                        IF NOT EXISTS (
+                            SELECT 1 FROM pg_trigger
+                            WHERE tgname = '{table}_search_vector_update'
+                        ) THEN
+                            CREATE TRIGGER {table}_search_vector_update
+                            BEFORE INSERT OR UPDATE OF content ON {table}
+                            FOR EACH ROW EXECUTE FUNCTION tsvector_update_trigger(
+                                search_vector, 'pg_catalog.english', content
+                            );
+                        END IF;
+                    END $$;
+                    """
+                )
+            )
 
 
 async def create_db_and_tables():
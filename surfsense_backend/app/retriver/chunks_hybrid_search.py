@@ -1,3 +1,10 @@
+from app.retriver.retrieval_profiles import (
+    RetrievalProfile,
+    apply_retrieval_profile,
+    get_retrieval_profile,
+)
+
+
 class ChucksHybridSearchRetriever:
     def __init__(self, db_session):
         """
@@ -14,6 +21,7 @@ class ChucksHybridSearchRetriever:
         top_k: int,
         user_id: str,
         search_space_id: int | None = None,
+        profile: RetrievalProfile | str | None = None,
     ) -> list:
         """
         Perform vector similarity search on chunks.
@@ -23,6 +31,7 @@ class ChucksHybridSearchRetriever:
             top_k: Number of results to return
             user_id: The ID of the user performing the search
             search_space_id: Optional search space ID to filter results
+            profile: Retrieval profile (or its name) setting the HNSW search depth
 
         Returns:
             List of chunks sorted by vector similarity
@@ -31,27 +40,34 @@ class ChucksHybridSearchRetriever:
         from sqlalchemy.orm import joinedload
 
         from app.config import config
-        from app.db import Chunk, Document, SearchSpace
-
-        # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = embedding_model.embed(query_text)
+        from app.db import Chunk, Document
+        from app.retriver.vector_index import select_nearest
+        from app.retriver.vector_scan import enable_filtered_vector_scan
+
+        # Get embedding for the query, reusing cached embeddings of repeated queries
+        query_embedding = await config.query_embedding_cache.get_embedding(query_text)
+
+        # Nearest chunks with user ownership check, re-scored by exact distance
+        nearest = select_nearest(
+            Chunk.id,
+            Chunk.embedding,
+            self._search_space_conditions(user_id, search_space_id),
+            query_embedding,
+            top_k,
+        )
 
-        # Build the base query with user ownership check
+        # Load the chunks in vector similarity order
         query = (
             select(Chunk)
             .options(joinedload(Chunk.document).joinedload(Document.search_space))
-            .join(Document, Chunk.document_id == Document.id)
-            .join(SearchSpace, Document.search_space_id == SearchSpace.id)
-            .where(SearchSpace.user_id == user_id)
+            .join(nearest, Chunk.id == nearest.c.id)
+            .order_by(nearest.c.distance)
         )
 
-        # Add search space filter if provided
-        if search_space_id is not None:
-            query = query.where(Document.search_space_id == search_space_id)
-
-        # Add vector similarity ordering
-        query = query.order_by(Chunk.embedding.op("<=>")(query_embedding)).limit(top_k)
+        # Keep scanning the vector index until enough chunks pass the filters
+        await enable_filtered_vector_scan(self.db_session)
+        # Search the vector index as deep as the profile asks
+        await apply_retrieval_profile(self.db_session, get_retrieval_profile(profile))
 
         # Execute the query
         result = await self.db_session.execute(query)
@@ -81,28 +97,22 @@ class ChucksHybridSearchRetriever:
         from sqlalchemy import func, select
         from sqlalchemy.orm import joinedload
 
-        from app.db import Chunk, Document, SearchSpace
+        from app.db import Chunk, Document
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Chunk.content)
+        # Stored tsvector column and tsquery for PostgreSQL full-text search
+        tsvector = Chunk.search_vector
         tsquery = func.plainto_tsquery("english", query_text)
 
         # Build the base query with user ownership check
         query = (
             select(Chunk)
             .options(joinedload(Chunk.document).joinedload(Document.search_space))
-            .join(Document, Chunk.document_id == Document.id)
-            .join(SearchSpace, Document.search_space_id == SearchSpace.id)
-            .where(SearchSpace.user_id == user_id)
+            .where(*self._search_space_conditions(user_id, search_space_id))
             .where(
                 tsvector.op("@@")(tsquery)
             )  # Only include results that match the query
         )
 
-        # Add search space filter if provided
-        if search_space_id is not None:
-            query = query.where(Document.search_space_id == search_space_id)
-
         # Add text search ranking
         query = query.order_by(func.ts_rank_cd(tsvector, tsquery).desc()).limit(top_k)
 
@@ -119,6 +129,7 @@ class ChucksHybridSearchRetriever:
         user_id: str,
         search_space_id: int | None = None,
         document_type: str | None = None,
+        profile: RetrievalProfile | str | None = None,
     ) -> list:
         """
         Combine vector similarity and full-text search results using Reciprocal Rank Fusion.
@@ -129,6 +140,8 @@ class ChucksHybridSearchRetriever:
             user_id: The ID of the user performing the search
             search_space_id: Optional search space ID to filter results
             document_type: Optional document type to filter results (e.g., "FILE", "CRAWLED_URL")
+            profile: Retrieval profile (or its name) setting the HNSW search depth,
+                candidates per branch and RRF weights
 
         Returns:
             List of dictionaries containing chunk data and relevance scores
@@ -137,26 +150,23 @@ class ChucksHybridSearchRetriever:
         from sqlalchemy.orm import joinedload
 
         from app.config import config
-        from app.db import Chunk, Document, DocumentType, SearchSpace
+        from app.db import Chunk, DocumentType
+        from app.retriver.vector_index import select_nearest
+        from app.retriver.vector_scan import enable_filtered_vector_scan
 
-        # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = embedding_model.embed(query_text)
+        # Get embedding for the query, reusing cached embeddings of repeated queries
+        query_embedding = await config.query_embedding_cache.get_embedding(query_text)
 
-        # Constants for RRF calculation
-        k = 60  # Constant for RRF calculation
-        n_results = top_k * 2  # Get more results for better fusion
+        # Get more results than needed from each branch for better fusion
+        profile = get_retrieval_profile(profile)
+        n_results = profile.candidate_count(top_k)
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Chunk.content)
+        # Stored tsvector column and tsquery for PostgreSQL full-text search
+        tsvector = Chunk.search_vector
         tsquery = func.plainto_tsquery("english", query_text)
 
-        # Base conditions for document filtering
-        base_conditions = [SearchSpace.user_id == user_id]
-
-        # Add search space filter if provided
-        if search_space_id is not None:
-            base_conditions.append(Document.search_space_id == search_space_id)
+        # Base conditions for chunk filtering, on the chunks' own columns
+        base_conditions = self._search_space_conditions(user_id, search_space_id)
 
         # Add document type filter if provided
         if document_type is not None:
@@ -164,31 +174,22 @@ class ChucksHybridSearchRetriever:
             if isinstance(document_type, str):
                 try:
                     doc_type_enum = DocumentType[document_type]
-                    base_conditions.append(Document.document_type == doc_type_enum)
+                    base_conditions.append(Chunk.document_type == doc_type_enum)
                 except KeyError:
                     # If the document type doesn't exist in the enum, return empty results
                     return []
             else:
-                base_conditions.append(Document.document_type == document_type)
+                base_conditions.append(Chunk.document_type == document_type)
 
-        # CTE for semantic search with user ownership check
-        semantic_search_cte = (
-            select(
-                Chunk.id,
-                func.rank()
-                .over(order_by=Chunk.embedding.op("<=>")(query_embedding))
-                .label("rank"),
-            )
-            .join(Document, Chunk.document_id == Document.id)
-            .join(SearchSpace, Document.search_space_id == SearchSpace.id)
-            .where(*base_conditions)
-        )
-
-        semantic_search_cte = (
-            semantic_search_cte.order_by(Chunk.embedding.op("<=>")(query_embedding))
-            .limit(n_results)
-            .cte("semantic_search")
+        # CTE for semantic search with user ownership check, ranked by exact
+        # distance after the (possibly quantized) index scan
+        nearest = select_nearest(
+            Chunk.id, Chunk.embedding, base_conditions, query_embedding, n_results
         )
+        semantic_search_cte = select(
+            nearest.c.id,
+            func.rank().over(order_by=nearest.c.distance).label("rank"),
+        ).cte("semantic_search")
 
         # CTE for keyword search with user ownership check
         keyword_search_cte = (
@@ -198,8 +199,6 @@ class ChucksHybridSearchRetriever:
                 .over(order_by=func.ts_rank_cd(tsvector, tsquery).desc())
                 .label("rank"),
             )
-            .join(Document, Chunk.document_id == Document.id)
-            .join(SearchSpace, Document.search_space_id == SearchSpace.id)
             .where(*base_conditions)
             .where(tsvector.op("@@")(tsquery))
         )
@@ -214,9 +213,8 @@ class ChucksHybridSearchRetriever:
         final_query = (
             select(
                 Chunk,
-                (
-                    func.coalesce(1.0 / (k + semantic_search_cte.c.rank), 0.0)
-                    + func.coalesce(1.0 / (k + keyword_search_cte.c.rank), 0.0)
+                profile.rrf_score(
+                    semantic_search_cte.c.rank, keyword_search_cte.c.rank
                 ).label("score"),
             )
             .select_from(
@@ -236,6 +234,11 @@ class ChucksHybridSearchRetriever:
             .limit(top_k)
         )
 
+        # Keep scanning the vector index until enough chunks pass the filters
+        await enable_filtered_vector_scan(self.db_session)
+        # Search the vector index as deep as the profile asks
+        await apply_retrieval_profile(self.db_session, profile)
+
         # Execute the query
         result = await self.db_session.execute(final_query)
         chunks_with_scores = result.all()
@@ -245,22 +248,209 @@ class ChucksHybridSearchRetriever:
             return []
 
         # Convert to serializable dictionaries if no reranker is available or if reranking failed
-        serialized_results = []
-        for chunk, score in chunks_with_scores:
-            serialized_results.append(
-                {
-                    "chunk_id": chunk.id,
-                    "content": chunk.content,
-                    "score": float(score),  # Ensure score is a Python float
-                    "document": {
-                        "id": chunk.document.id,
-                        "title": chunk.document.title,
-                        "document_type": chunk.document.document_type.value
-                        if hasattr(chunk.document, "document_type")
-                        else None,
-                        "metadata": chunk.document.document_metadata,
-                    },
-                }
+        return [
+            self._serialize_chunk(chunk, score) for chunk, score in chunks_with_scores
+        ]
+
+    async def hybrid_search_multi(
+        self,
+        query_text: str,
+        top_k: int,
+        user_id: str,
+        document_types: list[str],
+        search_space_id: int | None = None,
+        profile: RetrievalProfile | str | None = None,
+    ) -> dict[str, list]:
+        """
+        Run hybrid search for several document types in a single query.
+
+        The query is embedded once, and the semantic and keyword rankings of every
+        type are built like hybrid_search's (the semantic one from an index-ordered
+        nearest-neighbour scan per type) and combined with UNION ALL, so each type
+        gets its own top_k results as if hybrid_search had been called once per type.
+
+        Args:
+            query_text: The search query text
+            top_k: Number of results to return per document type
+            user_id: The ID of the user performing the search
+            document_types: Document types to search (e.g., ["FILE", "SLACK_CONNECTOR"])
+            search_space_id: Optional search space ID to filter results
+            profile: Retrieval profile (or its name) setting the HNSW search depth,
+                candidates per branch and RRF weights
+
+        Returns:
+            Dict mapping each requested document type to its list of chunk results
+        """
+        from sqlalchemy import cast, func, literal, select, union_all
+        from sqlalchemy.orm import joinedload
+
+        from app.config import config
+        from app.db import Chunk, DocumentType
+        from app.retriver.vector_index import select_nearest
+        from app.retriver.vector_scan import enable_filtered_vector_scan
+
+        results_by_type = {document_type: [] for document_type in document_types}
+
+        # Unknown document types simply get empty results
+        doc_type_enums = [
+            DocumentType[document_type]
+            for document_type in document_types
+            if document_type in DocumentType.__members__
+        ]
+        if not doc_type_enums:
+            return results_by_type
+
+        # Get embedding for the query, reusing cached embeddings of repeated queries
+        query_embedding = await config.query_embedding_cache.get_embedding(query_text)
+
+        # Get more results than needed from each branch for better fusion
+        profile = get_retrieval_profile(profile)
+        n_results = profile.candidate_count(top_k)
+
+        # Stored tsvector column and tsquery for PostgreSQL full-text search
+        tsvector = Chunk.search_vector
+        tsquery = func.plainto_tsquery("english", query_text)
+
+        # Base conditions for chunk filtering, on the chunks' own columns
+        base_conditions = self._search_space_conditions(user_id, search_space_id)
+
+        # Semantic and keyword rankings of every document type, each limited to
+        # n_results like in hybrid_search
+        semantic_rankings = []
+        keyword_rankings = []
+        for index, doc_type_enum in enumerate(doc_type_enums):
+            type_conditions = [*base_conditions, Chunk.document_type == doc_type_enum]
+            document_type = cast(
+                literal(doc_type_enum, Chunk.document_type.type),
+                Chunk.document_type.type,
+            ).label("document_type")
+
+            nearest = select_nearest(
+                Chunk.id,
+                Chunk.embedding,
+                type_conditions,
+                query_embedding,
+                n_results,
+                name=f"nearest_{index}",
+            )
+            semantic_rankings.append(
+                select(
+                    nearest.c.id,
+                    document_type,
+                    func.rank().over(order_by=nearest.c.distance).label("rank"),
+                )
+            )
+
+            keyword_rankings.append(
+                select(
+                    Chunk.id,
+                    document_type,
+                    func.rank()
+                    .over(order_by=func.ts_rank_cd(tsvector, tsquery).desc())
+                    .label("rank"),
+                )
+                .where(*type_conditions)
+                .where(tsvector.op("@@")(tsquery))
+                .order_by(func.ts_rank_cd(tsvector, tsquery).desc())
+                .limit(n_results)
+                .subquery(f"keyword_ranked_{index}")
+                .select()
+            )
+
+        semantic_search_cte = union_all(*semantic_rankings).cte("semantic_search")
+        keyword_search_cte = union_all(*keyword_rankings).cte("keyword_search")
+
+        # RRF fusion of both rankings
+        fused = (
+            select(
+                func.coalesce(semantic_search_cte.c.id, keyword_search_cte.c.id).label(
+                    "id"
+                ),
+                func.coalesce(
+                    semantic_search_cte.c.document_type,
+                    keyword_search_cte.c.document_type,
+                ).label("document_type"),
+                profile.rrf_score(
+                    semantic_search_cte.c.rank, keyword_search_cte.c.rank
+                ).label("score"),
             )
+            .select_from(
+                semantic_search_cte.outerjoin(
+                    keyword_search_cte,
+                    semantic_search_cte.c.id == keyword_search_cte.c.id,
+                    full=True,
+                )
+            )
+            .subquery("fused")
+        )
+
+        # Keep the top_k fused results of each document type
+        ranked = select(
+            fused,
+            func.row_number()
+            .over(partition_by=fused.c.document_type, order_by=fused.c.score.desc())
+            .label("type_rank"),
+        ).subquery("ranked")
 
-        return serialized_results
+        final_query = (
+            select(Chunk, ranked.c.score)
+            .join(ranked, Chunk.id == ranked.c.id)
+            .options(joinedload(Chunk.document))
+            .where(ranked.c.type_rank <= top_k)
+            .order_by(ranked.c.document_type, ranked.c.type_rank)
+        )
+
+        # Keep scanning the vector index until enough chunks pass the filters
+        await enable_filtered_vector_scan(self.db_session)
+        # Search the vector index as deep as the profile asks
+        await apply_retrieval_profile(self.db_session, profile)
+
+        # Execute the query
+        result = await self.db_session.execute(final_query)
+
+        for chunk, score in result.all():
+            document_type = chunk.document.document_type.value
+            results_by_type.setdefault(document_type, []).append(
+                self._serialize_chunk(chunk, score)
+            )
+
+        return results_by_type
+
+    def _search_space_conditions(
+        self, user_id: str, search_space_id: int | None
+    ) -> list:
+        """
+        Filters limiting chunks to the user's search spaces, using the chunks'
+        own search_space_id so they apply during the index scan instead of
+        after joining documents and search spaces.
+        """
+        from sqlalchemy import select
+
+        from app.db import Chunk, SearchSpace
+
+        conditions = [
+            Chunk.search_space_id.in_(
+                select(SearchSpace.id).where(SearchSpace.user_id == user_id)
+            )
+        ]
+
+        # Add search space filter if provided
+        if search_space_id is not None:
+            conditions.append(Chunk.search_space_id == search_space_id)
+        return conditions
+
+    def _serialize_chunk(self, chunk, score) -> dict:
+        """Convert a chunk and its relevance score to a serializable dictionary."""
+        return {
+            "chunk_id": chunk.id,
+            "content": chunk.content,
+            "score": float(score),  # Ensure score is a Python float
+            "document": {
+                "id": chunk.document.id,
+                "title": chunk.document.title,
+                "document_type": chunk.document.document_type.value
+                if hasattr(chunk.document, "document_type")
+                else None,
+                "metadata": chunk.document.document_metadata,
+            },
+        }
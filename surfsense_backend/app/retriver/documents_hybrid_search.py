@@ -1,3 +1,10 @@
+from app.retriver.retrieval_profiles import (
+    RetrievalProfile,
+    apply_retrieval_profile,
+    get_retrieval_profile,
+)
+
+
 class DocumentHybridSearchRetriever:
     def __init__(self, db_session):
         """
@@ -14,6 +21,7 @@ class DocumentHybridSearchRetriever:
         top_k: int,
         user_id: str,
         search_space_id: int | None = None,
+        profile: RetrievalProfile | str | None = None,
     ) -> list:
         """
         Perform vector similarity search on documents.
@@ -23,6 +31,7 @@ class DocumentHybridSearchRetriever:
             top_k: Number of results to return
             user_id: The ID of the user performing the search
             search_space_id: Optional search space ID to filter results
+            profile: Retrieval profile (or its name) setting the HNSW search depth
 
         Returns:
             List of documents sorted by vector similarity
@@ -32,28 +41,41 @@ class DocumentHybridSearchRetriever:
 
         from app.config import config
         from app.db import Document, SearchSpace
+        from app.retriver.vector_index import select_nearest
+        from app.retriver.vector_scan import enable_filtered_vector_scan
 
-        # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = embedding_model.embed(query_text)
+        # Get embedding for the query, reusing cached embeddings of repeated queries
+        query_embedding = await config.query_embedding_cache.get_embedding(query_text)
 
-        # Build the base query with user ownership check
-        query = (
-            select(Document)
-            .options(joinedload(Document.search_space))
-            .join(SearchSpace, Document.search_space_id == SearchSpace.id)
-            .where(SearchSpace.user_id == user_id)
-        )
+        # User ownership check, as a filter on the documents' own column
+        conditions = [
+            Document.search_space_id.in_(
+                select(SearchSpace.id).where(SearchSpace.user_id == user_id)
+            )
+        ]
 
         # Add search space filter if provided
         if search_space_id is not None:
-            query = query.where(Document.search_space_id == search_space_id)
+            conditions.append(Document.search_space_id == search_space_id)
 
-        # Add vector similarity ordering
-        query = query.order_by(Document.embedding.op("<=>")(query_embedding)).limit(
-            top_k
+        # Nearest documents, re-scored by exact distance
+        nearest = select_nearest(
+            Document.id, Document.embedding, conditions, query_embedding, top_k
         )
 
+        # Load the documents in vector similarity order
+        query = (
+            select(Document)
+            .options(joinedload(Document.search_space))
+            .join(nearest, Document.id == nearest.c.id)
+            .order_by(nearest.c.distance)
+        )
+
+        # Keep scanning the vector index until enough documents pass the filters
+        await enable_filtered_vector_scan(self.db_session)
+        # Search the vector index as deep as the profile asks
+        await apply_retrieval_profile(self.db_session, get_retrieval_profile(profile))
+
         # Execute the query
         result = await self.db_session.execute(query)
         documents = result.scalars().all()
@@ -84,8 +106,8 @@ class DocumentHybridSearchRetriever:
 
         from app.db import Document, SearchSpace
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Document.content)
+        # Stored tsvector column and tsquery for PostgreSQL full-text search
+        tsvector = Document.search_vector
         tsquery = func.plainto_tsquery("english", query_text)
 
         # Build the base query with user ownership check
@@ -119,6 +141,7 @@ class DocumentHybridSearchRetriever:
         user_id: str,
         search_space_id: int | None = None,
         document_type: str | None = None,
+        profile: RetrievalProfile | str | None = None,
     ) -> list:
         """
         Combine vector similarity and full-text search results using Reciprocal Rank Fusion.
@@ -129,6 +152,8 @@ class DocumentHybridSearchRetriever:
             user_id: The ID of the user performing the search
             search_space_id: Optional search space ID to filter results
             document_type: Optional document type to filter results (e.g., "FILE", "CRAWLED_URL")
+            profile: Retrieval profile (or its name) setting the HNSW search depth,
+                candidates per branch and RRF weights
 
         """
         from sqlalchemy import func, select, text
@@ -136,21 +161,26 @@ class DocumentHybridSearchRetriever:
 
         from app.config import config
         from app.db import Document, DocumentType, SearchSpace
+        from app.retriver.vector_index import select_nearest
+        from app.retriver.vector_scan import enable_filtered_vector_scan
 
-        # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = embedding_model.embed(query_text)
+        # Get embedding for the query, reusing cached embeddings of repeated queries
+        query_embedding = await config.query_embedding_cache.get_embedding(query_text)
 
-        # Constants for RRF calculation
-        k = 60  # Constant for RRF calculation
-        n_results = top_k * 2  # Get more results for better fusion
+        # Get more results than needed from each branch for better fusion
+        profile = get_retrieval_profile(profile)
+        n_results = profile.candidate_count(top_k)
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Document.content)
+        # Stored tsvector column and tsquery for PostgreSQL full-text search
+        tsvector = Document.search_vector
         tsquery = func.plainto_tsquery("english", query_text)
 
-        # Base conditions for document filtering
-        base_conditions = [SearchSpace.user_id == user_id]
+        # Base conditions for document filtering, on the documents' own columns
+        base_conditions = [
+            Document.search_space_id.in_(
+                select(SearchSpace.id).where(SearchSpace.user_id == user_id)
+            )
+        ]
 
         # Add search space filter if provided
         if search_space_id is not None:
@@ -169,23 +199,15 @@ class DocumentHybridSearchRetriever:
             else:
                 base_conditions.append(Document.document_type == document_type)
 
-        # CTE for semantic search with user ownership check
-        semantic_search_cte = (
-            select(
-                Document.id,
-                func.rank()
-                .over(order_by=Document.embedding.op("<=>")(query_embedding))
-                .label("rank"),
-            )
-            .join(SearchSpace, Document.search_space_id == SearchSpace.id)
-            .where(*base_conditions)
-        )
-
-        semantic_search_cte = (
-            semantic_search_cte.order_by(Document.embedding.op("<=>")(query_embedding))
-            .limit(n_results)
-            .cte("semantic_search")
+        # CTE for semantic search with user ownership check, ranked by exact
+        # distance after the (possibly quantized) index scan
+        nearest = select_nearest(
+            Document.id, Document.embedding, base_conditions, query_embedding, n_results
         )
+        semantic_search_cte = select(
+            nearest.c.id,
+            func.rank().over(order_by=nearest.c.distance).label("rank"),
+        ).cte("semantic_search")
 
         # CTE for keyword search with user ownership check
         keyword_search_cte = (
@@ -195,7 +217,6 @@ class DocumentHybridSearchRetriever:
                 .over(order_by=func.ts_rank_cd(tsvector, tsquery).desc())
                 .label("rank"),
             )
-            .join(SearchSpace, Document.search_space_id == SearchSpace.id)
             .where(*base_conditions)
             .where(tsvector.op("@@")(tsquery))
         )
@@ -210,9 +231,8 @@ class DocumentHybridSearchRetriever:
         final_query = (
             select(
                 Document,
-                (
-                    func.coalesce(1.0 / (k + semantic_search_cte.c.rank), 0.0)
-                    + func.coalesce(1.0 / (k + keyword_search_cte.c.rank), 0.0)
+                profile.rrf_score(
+                    semantic_search_cte.c.rank, keyword_search_cte.c.rank
                 ).label("score"),
             )
             .select_from(
@@ -232,6 +252,11 @@ class DocumentHybridSearchRetriever:
             .limit(top_k)
         )
 
+        # Keep scanning the vector index until enough documents pass the filters
+        await enable_filtered_vector_scan(self.db_session)
+        # Search the vector index as deep as the profile asks
+        await apply_retrieval_profile(self.db_session, profile)
+
         # Execute the query
         result = await self.db_session.execute(final_query)
         documents_with_scores = result.all()
@@ -241,32 +266,232 @@ class DocumentHybridSearchRetriever:
             return []
 
         # Convert to serializable dictionaries
-        serialized_results = []
-        for document, score in documents_with_scores:
-            # Fetch associated chunks for this document
-            from sqlalchemy import select
+        return await self._serialize_documents(documents_with_scores)
+
+    async def hybrid_search_multi(
+        self,
+        query_text: str,
+        top_k: int,
+        user_id: str,
+        document_types: list[str],
+        search_space_id: int | None = None,
+        profile: RetrievalProfile | str | None = None,
+    ) -> dict[str, list]:
+        """
+        Run hybrid search for several document types in a single query.
+
+        The query is embedded once, and the semantic and keyword rankings of every
+        type are built like hybrid_search's (the semantic one from an index-ordered
+        nearest-neighbour scan per type) and combined with UNION ALL, so each type
+        gets its own top_k results as if hybrid_search had been called once per type.
+
+        Args:
+            query_text: The search query text
+            top_k: Number of results to return per document type
+            user_id: The ID of the user performing the search
+            document_types: Document types to search (e.g., ["FILE", "SLACK_CONNECTOR"])
+            search_space_id: Optional search space ID to filter results
+            profile: Retrieval profile (or its name) setting the HNSW search depth,
+                candidates per branch and RRF weights
+
+        Returns:
+            Dict mapping each requested document type to its list of document results
+        """
+        from sqlalchemy import cast, func, literal, select, union_all
+        from sqlalchemy.orm import joinedload
+
+        from app.config import config
+        from app.db import Document, DocumentType, SearchSpace
+        from app.retriver.vector_index import select_nearest
+        from app.retriver.vector_scan import enable_filtered_vector_scan
+
+        results_by_type = {document_type: [] for document_type in document_types}
+
+        # Unknown document types simply get empty results
+        doc_type_enums = [
+            DocumentType[document_type]
+            for document_type in document_types
+            if document_type in DocumentType.__members__
+        ]
+        if not doc_type_enums:
+            return results_by_type
 
-            from app.db import Chunk
+        # Get embedding for the query, reusing cached embeddings of repeated queries
+        query_embedding = await config.query_embedding_cache.get_embedding(query_text)
+
+        # Get more results than needed from each branch for better fusion
+        profile = get_retrieval_profile(profile)
+        n_results = profile.candidate_count(top_k)
+
+        # Stored tsvector column and tsquery for PostgreSQL full-text search
+        tsvector = Document.search_vector
+        tsquery = func.plainto_tsquery("english", query_text)
 
-            chunks_query = (
-                select(Chunk).where(Chunk.document_id == document.id).order_by(Chunk.id)
+        # Base conditions for document filtering, on the documents' own columns
+        base_conditions = [
+            Document.search_space_id.in_(
+                select(SearchSpace.id).where(SearchSpace.user_id == user_id)
             )
-            chunks_result = await self.db_session.execute(chunks_query)
-            chunks = chunks_result.scalars().all()
-
-            # Concatenate chunks content
-            concatenated_chunks_content = (
-                " ".join([chunk.content for chunk in chunks])
-                if chunks
-                else document.content
+        ]
+
+        # Add search space filter if provided
+        if search_space_id is not None:
+            base_conditions.append(Document.search_space_id == search_space_id)
+
+        # Semantic and keyword rankings of every document type, each limited to
+        # n_results like in hybrid_search
+        semantic_rankings = []
+        keyword_rankings = []
+        for index, doc_type_enum in enumerate(doc_type_enums):
+            type_conditions = [
+                *base_conditions,
+                Document.document_type == doc_type_enum,
+            ]
+            document_type = cast(
+                literal(doc_type_enum, Document.document_type.type),
+                Document.document_type.type,
+            ).label("document_type")
+
+            nearest = select_nearest(
+                Document.id,
+                Document.embedding,
+                type_conditions,
+                query_embedding,
+                n_results,
+                name=f"nearest_{index}",
+            )
+            semantic_rankings.append(
+                select(
+                    nearest.c.id,
+                    document_type,
+                    func.rank().over(order_by=nearest.c.distance).label("rank"),
+                )
+            )
+
+            keyword_rankings.append(
+                select(
+                    Document.id,
+                    document_type,
+                    func.rank()
+                    .over(order_by=func.ts_rank_cd(tsvector, tsquery).desc())
+                    .label("rank"),
+                )
+                .where(*type_conditions)
+                .where(tsvector.op("@@")(tsquery))
+                .order_by(func.ts_rank_cd(tsvector, tsquery).desc())
+                .limit(n_results)
+                .subquery(f"keyword_ranked_{index}")
+                .select()
+            )
+
+        semantic_search_cte = union_all(*semantic_rankings).cte("semantic_search")
+        keyword_search_cte = union_all(*keyword_rankings).cte("keyword_search")
+
+        # RRF fusion of both rankings
+        fused = (
+            select(
+                func.coalesce(semantic_search_cte.c.id, keyword_search_cte.c.id).label(
+                    "id"
+                ),
+                func.coalesce(
+                    semantic_search_cte.c.document_type,
+                    keyword_search_cte.c.document_type,
+                ).label("document_type"),
+                profile.rrf_score(
+                    semantic_search_cte.c.rank, keyword_search_cte.c.rank
+                ).label("score"),
+            )
+            .select_from(
+                semantic_search_cte.outerjoin(
+                    keyword_search_cte,
+                    semantic_search_cte.c.id == keyword_search_cte.c.id,
+                    full=True,
+                )
+            )
+            .subquery("fused")
+        )
+
+        # Keep the top_k fused results of each document type
+        ranked = select(
+            fused,
+            func.row_number()
+            .over(partition_by=fused.c.document_type, order_by=fused.c.score.desc())
+            .label("type_rank"),
+        ).subquery("ranked")
+
+        final_query = (
+            select(Document, ranked.c.score)
+            .join(ranked, Document.id == ranked.c.id)
+            .options(joinedload(Document.search_space))
+            .where(ranked.c.type_rank <= top_k)
+            .order_by(ranked.c.document_type, ranked.c.type_rank)
+        )
+
+        # Keep scanning the vector index until enough documents pass the filters
+        await enable_filtered_vector_scan(self.db_session)
+        # Search the vector index as deep as the profile asks
+        await apply_retrieval_profile(self.db_session, profile)
+
+        # Execute the query
+        result = await self.db_session.execute(final_query)
+
+        for serialized_document in await self._serialize_documents(result.all()):
+            results_by_type.setdefault(serialized_document["document_type"], []).append(
+                serialized_document
+            )
+
+        return results_by_type
+
+    async def fetch_chunks_content(self, document_ids: list[int]) -> dict[int, str]:
+        """
+        Load the concatenated chunk content of several documents in one query.
+
+        Args:
+            document_ids: IDs of the documents whose chunks should be loaded
+
+        Returns:
+            Dict mapping document ID to its chunks joined in chunk order;
+            documents without chunks are omitted
+        """
+        from sqlalchemy import func, literal, select
+        from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+        from app.db import Chunk
+
+        if not document_ids:
+            return {}
+
+        chunks_query = (
+            select(
+                Chunk.document_id,
+                func.string_agg(
+                    Chunk.content, aggregate_order_by(literal(" "), Chunk.id)
+                ),
             )
+            .where(Chunk.document_id.in_(document_ids))
+            .group_by(Chunk.document_id)
+        )
+        chunks_result = await self.db_session.execute(chunks_query)
 
+        return dict(chunks_result.all())
+
+    async def _serialize_documents(self, documents_with_scores) -> list:
+        """
+        Convert documents and their relevance scores to serializable dictionaries,
+        including the concatenated content of each document's chunks.
+        """
+        chunks_content = await self.fetch_chunks_content(
+            [document.id for document, _ in documents_with_scores]
+        )
+
+        serialized_results = []
+        for document, score in documents_with_scores:
             serialized_results.append(
                 {
                     "document_id": document.id,
                     "title": document.title,
                     "content": document.content,
-                    "chunks_content": concatenated_chunks_content,
+                    "chunks_content": chunks_content.get(document.id, document.content),
                     "document_type": document.document_type.value
                     if hasattr(document, "document_type")
                     else None,
@@ -0,0 +1,124 @@
+"""
+Named retrieval profiles trading recall for latency.
+
+A profile sets how far the HNSW index is searched (``hnsw.ef_search``), how
+many candidates each branch of hybrid search contributes to the fusion, and
+how the semantic and keyword rankings are weighted by Reciprocal Rank Fusion.
+
+- ``fast`` searches a short candidate list and leans on keyword matches, with
+  a small RRF k so the top ranks of each branch dominate
+- ``balanced`` weighs both rankings equally with the usual RRF k of 60
+- ``thorough`` searches deeper, fuses more candidates and leans on semantic
+  similarity, with a larger RRF k so results found further down still count
+
+The RRF weights of any profile can be overridden per request.
+"""
+
+from dataclasses import dataclass, replace
+
+from sqlalchemy import func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@dataclass(frozen=True)
+class RetrievalProfile:
+    name: str
+    # Size of the HNSW candidate list; an index scan returns at most this many
+    # rows unless iterative scans are enabled
+    ef_search: int
+    # Results fetched by each hybrid search branch, as a multiple of top_k
+    candidate_multiplier: int
+    # RRF constant k; larger values flatten the difference between top ranks
+    rrf_k: int
+    semantic_weight: float = 1.0
+    keyword_weight: float = 1.0
+
+    def candidate_count(self, top_k: int) -> int:
+        """Number of results each hybrid search branch fetches for fusion."""
+        return top_k * max(1, self.candidate_multiplier)
+
+    def rrf_score(self, semantic_rank, keyword_rank):
+        """
+        Weighted RRF score of a result from its rank in both branches.
+
+        Args:
+            semantic_rank: Rank column of the semantic branch (NULL if absent)
+            keyword_rank: Rank column of the keyword branch (NULL if absent)
+
+        Returns:
+            SQL expression of the fused score
+        """
+        return func.coalesce(
+            self.semantic_weight / (self.rrf_k + semantic_rank), 0.0
+        ) + func.coalesce(self.keyword_weight / (self.rrf_k + keyword_rank), 0.0)
+
+
+RETRIEVAL_PROFILES = {
+    "fast": RetrievalProfile(
+        name="fast",
+        ef_search=40,
+        candidate_multiplier=1,
+        rrf_k=20,
+        semantic_weight=0.8,
+        keyword_weight=1.2,
+    ),
+    "balanced": RetrievalProfile(
+        name="balanced", ef_search=100, candidate_multiplier=2, rrf_k=60
+    ),
+    "thorough": RetrievalProfile(
+        name="thorough",
+        ef_search=200,
+        candidate_multiplier=4,
+        rrf_k=100,
+        semantic_weight=1.2,
+        keyword_weight=0.8,
+    ),
+}
+
+DEFAULT_RETRIEVAL_PROFILE = "balanced"
+
+
+def get_retrieval_profile(
+    profile: RetrievalProfile | str | None = None,
+    semantic_weight: float | None = None,
+    keyword_weight: float | None = None,
+) -> RetrievalProfile:
+    """
+    Resolve a profile or profile name, defaulting to the balanced profile.
+
+    Args:
+        profile: Profile or profile name
+        semantic_weight: Overrides the profile's RRF weight of semantic ranks
+        keyword_weight: Overrides the profile's RRF weight of keyword ranks
+
+    Raises:
+        ValueError: If the name is not a known profile
+    """
+    if not isinstance(profile, RetrievalProfile):
+        name = profile or DEFAULT_RETRIEVAL_PROFILE
+        if name not in RETRIEVAL_PROFILES:
+            raise ValueError(
+                f"Unknown retrieval profile '{name}', expected one of "
+                f"{', '.join(RETRIEVAL_PROFILES)}"
+            )
+        profile = RETRIEVAL_PROFILES[name]
+
+    if semantic_weight is not None:
+        profile = replace(profile, semantic_weight=semantic_weight)
+    if keyword_weight is not None:
+        profile = replace(profile, keyword_weight=keyword_weight)
+    return profile
+
+
+async def apply_retrieval_profile(
+    session: AsyncSession, profile: RetrievalProfile
+) -> None:
+    """
+    Set the profile's HNSW search parameters for the rest of the session's
+    transaction.
+
+    Args:
+        session: Database session the vector search runs on
+        profile: Profile to apply
+    """
+    await session.execute(text(f"SET LOCAL hnsw.ef_search = {int(profile.ef_search)}"))
@@ -0,0 +1,120 @@
+"""
+Quantized HNSW indexes for the embedding columns.
+
+Embeddings are always stored at full precision. VECTOR_INDEX_MODE picks what
+the HNSW index holds:
+
+- ``full``: the float32 vectors (cosine distance)
+- ``halfvec``: the vectors cast to half precision, halving the index size
+- ``binary``: one bit per dimension (Hamming distance), 1/32 of the size
+
+With a quantized index, a nearest-neighbour search first takes
+``VECTOR_RESCORE_FACTOR`` times as many candidates from the index, then
+re-scores them by exact cosine distance on the stored vectors.
+"""
+
+from pgvector.sqlalchemy import BIT, HALFVEC, Vector
+from sqlalchemy import cast, func, select
+from sqlalchemy.sql import ColumnElement, Subquery
+
+VECTOR_INDEX_MODES = ("full", "halfvec", "binary")
+
+
+def get_vector_index_mode() -> str:
+    from app.config import config
+
+    mode = config.VECTOR_INDEX_MODE.lower()
+    return mode if mode in VECTOR_INDEX_MODES else "full"
+
+
+def get_vector_index_sql(mode: str, dimension: int) -> tuple[str, str]:
+    """
+    Index name suffix and ``USING hnsw`` definition of a vector index mode.
+
+    Args:
+        mode: One of VECTOR_INDEX_MODES
+        dimension: Dimension of the embedding column
+
+    Returns:
+        Tuple of the index name suffix and the indexed expression with its
+        operator class
+    """
+    if mode == "halfvec":
+        return (
+            "_halfvec",
+            f"((embedding::halfvec({dimension})) halfvec_cosine_ops)",
+        )
+    if mode == "binary":
+        return (
+            "_binary",
+            f"((binary_quantize(embedding)::bit({dimension})) bit_hamming_ops)",
+        )
+    return "", "(embedding public.vector_cosine_ops)"
+
+
+def index_distance(embedding_column, query_embedding) -> ColumnElement:
+    """
+    Distance to the query as computed by the configured index, to order the
+    candidate scan by. It must match the indexed expression for the index to
+    be used.
+    """
+    from app.config import config
+
+    dimension = config.embedding_model_instance.dimension
+    mode = get_vector_index_mode()
+    if mode == "halfvec":
+        return cast(embedding_column, HALFVEC(dimension)).op("<=>")(
+            cast(cast(query_embedding, Vector(dimension)), HALFVEC(dimension))
+        )
+    if mode == "binary":
+        return cast(func.binary_quantize(embedding_column), BIT(dimension)).op("<~>")(
+            func.binary_quantize(cast(query_embedding, Vector(dimension)))
+        )
+    return embedding_column.op("<=>")(query_embedding)
+
+
+def select_nearest(
+    id_column,
+    embedding_column,
+    conditions: list,
+    query_embedding,
+    limit: int,
+    name: str = "nearest",
+) -> Subquery:
+    """
+    The rows nearest to the query, by exact cosine distance.
+
+    Candidates are read from the configured vector index (more than needed
+    when it is quantized), then ordered by their exact distance.
+
+    Args:
+        id_column: Primary key column of the searched table
+        embedding_column: Embedding column of the searched table
+        conditions: Filters applied during the candidate scan
+        query_embedding: Embedding of the query
+        limit: Number of rows to return
+        name: Name of the subquery
+
+    Returns:
+        Subquery with the ``id`` and exact ``distance`` of the nearest rows
+    """
+    from app.config import config
+
+    candidate_limit = limit
+    if get_vector_index_mode() != "full":
+        candidate_limit = limit * max(1, config.VECTOR_RESCORE_FACTOR)
+
+    candidates = (
+        select(id_column.label("id"), embedding_column.label("embedding"))
+        .where(*conditions)
+        .order_by(index_distance(embedding_column, query_embedding))
+        .limit(candidate_limit)
+        .subquery(f"{name}_candidates")
+    )
+    distance = candidates.c.embedding.op("<=>")(query_embedding)
+    return (
+        select(candidates.c.id, distance.label("distance"))
+        .order_by(distance)
+        .limit(limit)
+        .subquery(name)
+    )
@@ -0,0 +1,66 @@
+"""
+Session settings for filtered HNSW vector scans.
+
+An HNSW index scan returns the nearest rows first and filters them afterwards,
+so a search limited to one search space (or document type) can come back with
+fewer rows than requested. pgvector 0.8 added iterative index scans that keep
+reading the index until enough rows pass the filters; this enables them for the
+current transaction when the installed extension supports them.
+"""
+
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# pgvector version that introduced hnsw.iterative_scan
+ITERATIVE_SCAN_MIN_VERSION = (0, 8, 0)
+ITERATIVE_SCAN_MODES = ("strict_order", "relaxed_order")
+
+# Whether the database's pgvector supports iterative scans, checked once
+_iterative_scan_supported: bool | None = None
+
+
+def _parse_version(version: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in version.split(".") if part.isdigit())
+
+
+async def _supports_iterative_scan(session: AsyncSession) -> bool:
+    global _iterative_scan_supported
+    if _iterative_scan_supported is None:
+        result = await session.execute(
+            text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        )
+        version = result.scalar()
+        _iterative_scan_supported = (
+            version is not None
+            and _parse_version(version) >= ITERATIVE_SCAN_MIN_VERSION
+        )
+        if not _iterative_scan_supported:
+            logger.info(
+                f"pgvector {version} has no iterative index scans; filtered vector "
+                "searches may return fewer rows than requested"
+            )
+    return _iterative_scan_supported
+
+
+async def enable_filtered_vector_scan(session: AsyncSession) -> None:
+    """
+    Enable iterative HNSW scans for the rest of the session's transaction,
+    as configured by HNSW_ITERATIVE_SCAN and HNSW_MAX_SCAN_TUPLES.
+
+    Args:
+        session: Database session the vector search runs on
+    """
+    from app.config import config
+
+    mode = config.HNSW_ITERATIVE_SCAN.lower()
+    if mode not in ITERATIVE_SCAN_MODES or not await _supports_iterative_scan(session):
+        return
+
+    await session.execute(text(f"SET LOCAL hnsw.iterative_scan = {mode}"))
+    await session.execute(
+        text(f"SET LOCAL hnsw.max_scan_tuples = {int(config.HNSW_MAX_SCAN_TUPLES)}")
+    )
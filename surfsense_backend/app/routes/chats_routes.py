@@ -5,7 +5,8 @@ from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.db import Chat, SearchSpace, User, get_async_session
+from app.db import Chat, DocumentType, SearchSpace, User, get_async_session
+from app.retriver.retrieval_profiles import RETRIEVAL_PROFILES
 from app.schemas import AISDKChatRequest, ChatCreate, ChatRead, ChatUpdate
 from app.tasks.stream_connector_search_results import stream_connector_search_results
 from app.users import current_active_user
@@ -36,6 +37,51 @@ async def handle_chat_data(
 
     search_mode_str = request.data.get("search_mode", "CHUNKS")
 
+    # Optional retrieval profiles, for all connectors and for individual ones,
+    # and overrides of their RRF weights
+    retrieval_profile: str | None = request.data.get("retrieval_profile")
+    connector_retrieval_profiles: dict[str, str] = (
+        request.data.get("connector_retrieval_profiles") or {}
+    )
+    if not isinstance(connector_retrieval_profiles, dict):
+        raise HTTPException(
+            status_code=400,
+            detail="connector_retrieval_profiles must map connectors to retrieval profiles",
+        )
+    # Profiles only apply to searches over indexed documents
+    for connector in connector_retrieval_profiles:
+        if connector not in DocumentType.__members__:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid connector '{connector}' in connector_retrieval_profiles, "
+                f"expected one of {', '.join(DocumentType.__members__)}",
+            )
+    for profile in [retrieval_profile, *connector_retrieval_profiles.values()]:
+        if profile is not None and (
+            not isinstance(profile, str) or profile not in RETRIEVAL_PROFILES
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid retrieval profile '{profile}', expected one of "
+                f"{', '.join(RETRIEVAL_PROFILES)}",
+            )
+
+    semantic_weight = request.data.get("semantic_weight")
+    keyword_weight = request.data.get("keyword_weight")
+    for weight_name, weight in (
+        ("semantic_weight", semantic_weight),
+        ("keyword_weight", keyword_weight),
+    ):
+        if weight is not None and (
+            isinstance(weight, bool)
+            or not isinstance(weight, int | float)
+            or weight < 0
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail=f"{weight_name} must be a non-negative number",
+            )
+
     # Convert search_space_id to integer if it's a string
     if search_space_id and isinstance(search_space_id, str):
         try:
@@ -71,6 +117,10 @@ async def handle_chat_data(
             langchain_chat_history,
             search_mode_str,
             document_ids_to_add_in_context,
+            retrieval_profile,
+            connector_retrieval_profiles,
+            semantic_weight,
+            keyword_weight,
         )
     )
 
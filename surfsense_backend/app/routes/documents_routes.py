@@ -1,14 +1,19 @@
 # Force asyncio to use standard event loop before unstructured imports
 import asyncio
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Form, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, Form, HTTPException, UploadFile
 from litellm import atranscription
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.config import config as app_config
 from app.db import Document, DocumentType, Log, SearchSpace, User, get_async_session
-from app.schemas import DocumentRead, DocumentsCreate, DocumentUpdate
+from app.schemas import (
+    DocumentRead,
+    DocumentsCreate,
+    DocumentUpdate,
+    ExtensionDocumentContent,
+)
 from app.services.task_logging_service import TaskLoggingService
 from app.tasks.background_tasks import (
     add_crawled_url_document,
@@ -19,6 +24,7 @@ from app.tasks.background_tasks import (
     add_received_markdown_file_document,
     add_youtube_video_document,
 )
+from app.tasks.job_queue import enqueue_job
 from app.users import current_active_user
 from app.utils.check_ownership import check_ownership
 
@@ -41,7 +47,6 @@ async def create_documents(
     request: DocumentsCreate,
     session: AsyncSession = Depends(get_async_session),
     user: User = Depends(current_active_user),
-    fastapi_background_tasks: BackgroundTasks = BackgroundTasks(),
 ):
     try:
         # Check if the user owns the search space
@@ -49,27 +54,39 @@ async def create_documents(
 
         if request.document_type == DocumentType.EXTENSION:
             for individual_document in request.content:
-                fastapi_background_tasks.add_task(
-                    process_extension_document_with_new_session,
-                    individual_document,
-                    request.search_space_id,
-                    str(user.id),
+                await enqueue_job(
+                    session,
+                    "process_extension_document",
+                    user.id,
+                    {
+                        "individual_document": individual_document.model_dump(),
+                        "search_space_id": request.search_space_id,
+                        "user_id": str(user.id),
+                    },
                 )
         elif request.document_type == DocumentType.CRAWLED_URL:
             for url in request.content:
-                fastapi_background_tasks.add_task(
-                    process_crawled_url_with_new_session,
-                    url,
-                    request.search_space_id,
-                    str(user.id),
+                await enqueue_job(
+                    session,
+                    "process_crawled_url",
+                    user.id,
+                    {
+                        "url": url,
+                        "search_space_id": request.search_space_id,
+                        "user_id": str(user.id),
+                    },
                 )
         elif request.document_type == DocumentType.YOUTUBE_VIDEO:
             for url in request.content:
-                fastapi_background_tasks.add_task(
-                    process_youtube_video_with_new_session,
-                    url,
-                    request.search_space_id,
-                    str(user.id),
+                await enqueue_job(
+                    session,
+                    "process_youtube_video",
+                    user.id,
+                    {
+                        "url": url,
+                        "search_space_id": request.search_space_id,
+                        "user_id": str(user.id),
+                    },
                 )
         else:
             raise HTTPException(status_code=400, detail="Invalid document type")
@@ -91,7 +108,6 @@ async def create_documents_file_upload(
     search_space_id: int = Form(...),
     session: AsyncSession = Depends(get_async_session),
     user: User = Depends(current_active_user),
-    fastapi_background_tasks: BackgroundTasks = BackgroundTasks(),
 ):
     try:
         await check_ownership(session, SearchSpace, search_space_id, user)
@@ -105,7 +121,8 @@ async def create_documents_file_upload(
                 import os
                 import tempfile
 
-                # Create temp file
+                # Create temp file. Queue workers read the upload from this path,
+                # so dedicated workers must share the temp directory with the API
                 with tempfile.NamedTemporaryFile(
                     delete=False, suffix=os.path.splitext(file.filename)[1]
                 ) as temp_file:
@@ -116,12 +133,16 @@ async def create_documents_file_upload(
                 with open(temp_path, "wb") as f:
                     f.write(content)
 
-                fastapi_background_tasks.add_task(
-                    process_file_in_background_with_new_session,
-                    temp_path,
-                    file.filename,
-                    search_space_id,
-                    str(user.id),
+                await enqueue_job(
+                    session,
+                    "process_file_in_background",
+                    user.id,
+                    {
+                        "file_path": temp_path,
+                        "filename": file.filename,
+                        "search_space_id": search_space_id,
+                        "user_id": str(user.id),
+                    },
                 )
             except Exception as e:
                 raise HTTPException(
@@ -474,6 +495,8 @@ async def process_file_in_background(
                     docling_markdown_document=result["content"],
                     search_space_id=search_space_id,
                     user_id=user_id,
+                    task_logger=task_logger,
+                    log_entry=log_entry,
                 )
 
                 if doc_result:
@@ -672,6 +695,12 @@ async def process_extension_document_with_new_session(
     from app.db import async_session_maker
     from app.services.task_logging_service import TaskLoggingService
 
+    # Queued jobs carry the document as a plain dict
+    if isinstance(individual_document, dict):
+        individual_document = ExtensionDocumentContent.model_validate(
+            individual_document
+        )
+
     async with async_session_maker() as session:
         # Initialize task logging service
         task_logger = TaskLoggingService(session, search_space_id)
@@ -716,6 +745,7 @@ async def process_extension_document_with_new_session(
             import logging
 
             logging.error(f"Error processing extension document: {e!s}")
+            raise
 
 
 async def process_crawled_url_with_new_session(
@@ -768,6 +798,7 @@ async def process_crawled_url_with_new_session(
             import logging
 
             logging.error(f"Error processing crawled URL: {e!s}")
+            raise
 
 
 async def process_file_in_background_with_new_session(
@@ -816,6 +847,7 @@ async def process_file_in_background_with_new_session(
             import logging
 
             logging.error(f"Error processing file: {e!s}")
+            raise
 
 
 async def process_youtube_video_with_new_session(
@@ -868,3 +900,4 @@ async def process_youtube_video_with_new_session(
             import logging
 
             logging.error(f"Error processing YouTube video: {e!s}")
+            raise
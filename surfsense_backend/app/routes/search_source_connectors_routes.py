@@ -14,7 +14,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field, ValidationError
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -44,6 +44,7 @@ from app.tasks.connectors_indexing_tasks import (
     index_notion_pages,
     index_slack_messages,
 )
+from app.tasks.job_queue import JobFailedError, enqueue_job
 from app.users import current_active_user
 from app.utils.check_ownership import check_ownership
 
@@ -328,7 +329,6 @@ async def index_connector_content(
     ),
     session: AsyncSession = Depends(get_async_session),
     user: User = Depends(current_active_user),
-    background_tasks: BackgroundTasks = None,
 ):
     """
     Index content from a connector to a search space.
@@ -344,7 +344,6 @@ async def index_connector_content(
     Args:
         connector_id: ID of the connector to use
         search_space_id: ID of the search space to store indexed content
-        background_tasks: FastAPI background tasks
 
     Returns:
         Dictionary with indexing status
@@ -384,107 +383,135 @@ async def index_connector_content(
         indexing_to = end_date if end_date else today_str
 
         if connector.connector_type == SearchSourceConnectorType.SLACK_CONNECTOR:
-            # Run indexing in background
+            # Queue indexing for a background worker
             logger.info(
                 f"Triggering Slack indexing for connector {connector_id} into search space {search_space_id} from {indexing_from} to {indexing_to}"
             )
-            background_tasks.add_task(
-                run_slack_indexing_with_new_session,
-                connector_id,
-                search_space_id,
-                str(user.id),
-                indexing_from,
-                indexing_to,
+            await enqueue_job(
+                session,
+                "run_slack_indexing",
+                user.id,
+                {
+                    "connector_id": connector_id,
+                    "search_space_id": search_space_id,
+                    "user_id": str(user.id),
+                    "start_date": indexing_from,
+                    "end_date": indexing_to,
+                },
             )
             response_message = "Slack indexing started in the background."
 
         elif connector.connector_type == SearchSourceConnectorType.NOTION_CONNECTOR:
-            # Run indexing in background
+            # Queue indexing for a background worker
             logger.info(
                 f"Triggering Notion indexing for connector {connector_id} into search space {search_space_id} from {indexing_from} to {indexing_to}"
             )
-            background_tasks.add_task(
-                run_notion_indexing_with_new_session,
-                connector_id,
-                search_space_id,
-                str(user.id),
-                indexing_from,
-                indexing_to,
+            await enqueue_job(
+                session,
+                "run_notion_indexing",
+                user.id,
+                {
+                    "connector_id": connector_id,
+                    "search_space_id": search_space_id,
+                    "user_id": str(user.id),
+                    "start_date": indexing_from,
+                    "end_date": indexing_to,
+                },
             )
             response_message = "Notion indexing started in the background."
 
         elif connector.connector_type == SearchSourceConnectorType.GITHUB_CONNECTOR:
-            # Run indexing in background
+            # Queue indexing for a background worker
             logger.info(
                 f"Triggering GitHub indexing for connector {connector_id} into search space {search_space_id} from {indexing_from} to {indexing_to}"
             )
-            background_tasks.add_task(
-                run_github_indexing_with_new_session,
-                connector_id,
-                search_space_id,
-                str(user.id),
-                indexing_from,
-                indexing_to,
+            await enqueue_job(
+                session,
+                "run_github_indexing",
+                user.id,
+                {
+                    "connector_id": connector_id,
+                    "search_space_id": search_space_id,
+                    "user_id": str(user.id),
+                    "start_date": indexing_from,
+                    "end_date": indexing_to,
+                },
             )
             response_message = "GitHub indexing started in the background."
 
         elif connector.connector_type == SearchSourceConnectorType.LINEAR_CONNECTOR:
-            # Run indexing in background
+            # Queue indexing for a background worker
             logger.info(
                 f"Triggering Linear indexing for connector {connector_id} into search space {search_space_id} from {indexing_from} to {indexing_to}"
             )
-            background_tasks.add_task(
-                run_linear_indexing_with_new_session,
-                connector_id,
-                search_space_id,
-                str(user.id),
-                indexing_from,
-                indexing_to,
+            await enqueue_job(
+                session,
+                "run_linear_indexing",
+                user.id,
+                {
+                    "connector_id": connector_id,
+                    "search_space_id": search_space_id,
+                    "user_id": str(user.id),
+                    "start_date": indexing_from,
+                    "end_date": indexing_to,
+                },
             )
             response_message = "Linear indexing started in the background."
 
         elif connector.connector_type == SearchSourceConnectorType.JIRA_CONNECTOR:
-            # Run indexing in background
+            # Queue indexing for a background worker
             logger.info(
                 f"Triggering Jira indexing for connector {connector_id} into search space {search_space_id} from {indexing_from} to {indexing_to}"
             )
-            background_tasks.add_task(
-                run_jira_indexing_with_new_session,
-                connector_id,
-                search_space_id,
-                str(user.id),
-                indexing_from,
-                indexing_to,
+            await enqueue_job(
+                session,
+                "run_jira_indexing",
+                user.id,
+                {
+                    "connector_id": connector_id,
+                    "search_space_id": search_space_id,
+                    "user_id": str(user.id),
+                    "start_date": indexing_from,
+                    "end_date": indexing_to,
+                },
             )
             response_message = "Jira indexing started in the background."
 
         elif connector.connector_type == SearchSourceConnectorType.CONFLUENCE_CONNECTOR:
-            # Run indexing in background
+            # Queue indexing for a background worker
             logger.info(
                 f"Triggering Confluence indexing for connector {connector_id} into search space {search_space_id} from {indexing_from} to {indexing_to}"
             )
-            background_tasks.add_task(
-                run_confluence_indexing_with_new_session,
-                connector_id,
-                search_space_id,
-                str(user.id),
-                indexing_from,
-                indexing_to,
+            await enqueue_job(
+                session,
+                "run_confluence_indexing",
+                user.id,
+                {
+                    "connector_id": connector_id,
+                    "search_space_id": search_space_id,
+                    "user_id": str(user.id),
+                    "start_date": indexing_from,
+                    "end_date": indexing_to,
+                },
             )
             response_message = "Confluence indexing started in the background."
 
         elif connector.connector_type == SearchSourceConnectorType.DISCORD_CONNECTOR:
-            # Run indexing in background
+            # Queue indexing for a background worker
             logger.info(
                 f"Triggering Discord indexing for connector {connector_id} into search space {search_space_id} from {indexing_from} to {indexing_to}"
             )
-            background_tasks.add_task(
-                run_discord_indexing_with_new_session,
-                connector_id,
-                search_space_id,
-                str(user.id),
-                indexing_from,
-                indexing_to,
+            await enqueue_job(
+                session,
+                "run_discord_indexing",
+                user.id,
+                {
+                    "connector_id": connector_id,
+                    "search_space_id": search_space_id,
+                    "user_id": str(user.id),
+                    "start_date": indexing_from,
+                    "end_date": indexing_to,
+                },
             )
             response_message = "Discord indexing started in the background."
 
@@ -494,6 +521,8 @@ async def index_connector_content(
                 detail=f"Indexing not supported for connector type: {connector.connector_type}",
             )
 
+        await session.commit()
+
         return {
             "message": response_message,
             "connector_id": connector_id,
@@ -587,19 +616,23 @@ async def run_slack_indexing(
             end_date=end_date,
             update_last_indexed=False,  # Don't update timestamp in the indexing function
         )
-
-        # Only update last_indexed_at if indexing was successful (either new docs or updated docs)
-        if documents_processed > 0:
-            await update_connector_last_indexed(session, connector_id)
-            logger.info(
-                f"Slack indexing completed successfully: {documents_processed} documents processed"
-            )
-        else:
-            logger.error(
-                f"Slack indexing failed or no documents processed: {error_or_warning}"
-            )
     except Exception as e:
         logger.error(f"Error in background Slack indexing task: {e!s}")
+        raise
+
+    if error_or_warning:
+        logger.error(f"Slack indexing failed: {error_or_warning}")
+        # Fail the job so the worker retries it
+        raise JobFailedError(error_or_warning)
+
+    # Only update last_indexed_at if indexing was successful (either new docs or updated docs)
+    if documents_processed > 0:
+        await update_connector_last_indexed(session, connector_id)
+        logger.info(
+            f"Slack indexing completed successfully: {documents_processed} documents processed"
+        )
+    else:
+        logger.info("Slack indexing completed: no documents processed")
 
 
 async def run_notion_indexing_with_new_session(
@@ -649,19 +682,23 @@ async def run_notion_indexing(
             end_date=end_date,
             update_last_indexed=False,  # Don't update timestamp in the indexing function
         )
-
-        # Only update last_indexed_at if indexing was successful (either new docs or updated docs)
-        if documents_processed > 0:
-            await update_connector_last_indexed(session, connector_id)
-            logger.info(
-                f"Notion indexing completed successfully: {documents_processed} documents processed"
-            )
-        else:
-            logger.error(
-                f"Notion indexing failed or no documents processed: {error_or_warning}"
-            )
     except Exception as e:
         logger.error(f"Error in background Notion indexing task: {e!s}")
+        raise
+
+    if error_or_warning:
+        logger.error(f"Notion indexing failed: {error_or_warning}")
+        # Fail the job so the worker retries it
+        raise JobFailedError(error_or_warning)
+
+    # Only update last_indexed_at if indexing was successful (either new docs or updated docs)
+    if documents_processed > 0:
+        await update_connector_last_indexed(session, connector_id)
+        logger.info(
+            f"Notion indexing completed successfully: {documents_processed} documents processed"
+        )
+    else:
+        logger.info("Notion indexing completed: no documents processed")
 
 
 # Add new helper functions for GitHub indexing
@@ -706,7 +743,8 @@ async def run_github_indexing(
             logger.error(
                 f"GitHub indexing failed for connector {connector_id}: {error_message}"
             )
-            # Optionally update status in DB to indicate failure
+            # Fail the job so the worker retries it
+            raise JobFailedError(error_message)
         else:
             logger.info(
                 f"GitHub indexing successful for connector {connector_id}. Indexed {indexed_count} documents."
@@ -720,7 +758,7 @@ async def run_github_indexing(
             f"Critical error in run_github_indexing for connector {connector_id}: {e}",
             exc_info=True,
         )
-        # Optionally update status in DB to indicate failure
+        raise
 
 
 # Add new helper functions for Linear indexing
@@ -765,7 +803,8 @@ async def run_linear_indexing(
             logger.error(
                 f"Linear indexing failed for connector {connector_id}: {error_message}"
             )
-            # Optionally update status in DB to indicate failure
+            # Fail the job so the worker retries it
+            raise JobFailedError(error_message)
         else:
             logger.info(
                 f"Linear indexing successful for connector {connector_id}. Indexed {indexed_count} documents."
@@ -779,7 +818,7 @@ async def run_linear_indexing(
             f"Critical error in run_linear_indexing for connector {connector_id}: {e}",
             exc_info=True,
         )
-        # Optionally update status in DB to indicate failure
+        raise
 
 
 # Add new helper functions for discord indexing
@@ -829,19 +868,23 @@ async def run_discord_indexing(
             end_date=end_date,
             update_last_indexed=False,  # Don't update timestamp in the indexing function
         )
-
-        # Only update last_indexed_at if indexing was successful (either new docs or updated docs)
-        if documents_processed > 0:
-            await update_connector_last_indexed(session, connector_id)
-            logger.info(
-                f"Discord indexing completed successfully: {documents_processed} documents processed"
-            )
-        else:
-            logger.error(
-                f"Discord indexing failed or no documents processed: {error_or_warning}"
-            )
     except Exception as e:
         logger.error(f"Error in background Discord indexing task: {e!s}")
+        raise
+
+    if error_or_warning:
+        logger.error(f"Discord indexing failed: {error_or_warning}")
+        # Fail the job so the worker retries it
+        raise JobFailedError(error_or_warning)
+
+    # Only update last_indexed_at if indexing was successful (either new docs or updated docs)
+    if documents_processed > 0:
+        await update_connector_last_indexed(session, connector_id)
+        logger.info(
+            f"Discord indexing completed successfully: {documents_processed} documents processed"
+        )
+    else:
+        logger.info("Discord indexing completed: no documents processed")
 
 
 # Add new helper functions for Jira indexing
@@ -886,7 +929,8 @@ async def run_jira_indexing(
             logger.error(
                 f"Jira indexing failed for connector {connector_id}: {error_message}"
             )
-            # Optionally update status in DB to indicate failure
+            # Fail the job so the worker retries it
+            raise JobFailedError(error_message)
         else:
             logger.info(
                 f"Jira indexing successful for connector {connector_id}. Indexed {indexed_count} documents."
@@ -899,7 +943,7 @@ async def run_jira_indexing(
             f"Critical error in run_jira_indexing for connector {connector_id}: {e}",
             exc_info=True,
         )
-        # Optionally update status in DB to indicate failure
+        raise
 
 
 # Add new helper functions for Confluence indexing
@@ -946,7 +990,8 @@ async def run_confluence_indexing(
             logger.error(
                 f"Confluence indexing failed for connector {connector_id}: {error_message}"
             )
-            # Optionally update status in DB to indicate failure
+            # Fail the job so the worker retries it
+            raise JobFailedError(error_message)
         else:
             logger.info(
                 f"Confluence indexing successful for connector {connector_id}. Indexed {indexed_count} documents."
@@ -959,4 +1004,4 @@ async def run_confluence_indexing(
             f"Critical error in run_confluence_indexing for connector {connector_id}: {e}",
             exc_info=True,
         )
-        # Optionally update status in DB to indicate failure
+        raise
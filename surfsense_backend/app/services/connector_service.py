@@ -11,26 +11,250 @@ from app.agents.researcher.configuration import SearchMode
 from app.db import (
     Chunk,
     Document,
+    DocumentType,
     SearchSourceConnector,
     SearchSourceConnectorType,
     SearchSpace,
 )
 from app.retriver.chunks_hybrid_search import ChucksHybridSearchRetriever
 from app.retriver.documents_hybrid_search import DocumentHybridSearchRetriever
+from app.retriver.retrieval_profiles import RetrievalProfile, get_retrieval_profile
 
 
 class ConnectorService:
-    def __init__(self, session: AsyncSession, user_id: str | None = None):
+    def __init__(
+        self,
+        session: AsyncSession,
+        user_id: str | None = None,
+        retrieval_profile: RetrievalProfile | str | None = None,
+        connector_retrieval_profiles: dict[str, RetrievalProfile | str] | None = None,
+        semantic_weight: float | None = None,
+        keyword_weight: float | None = None,
+    ):
         self.session = session
         self.chunk_retriever = ChucksHybridSearchRetriever(session)
         self.document_retriever = DocumentHybridSearchRetriever(session)
         self.user_id = user_id
-        self.source_id_counter = (
-            100000  # High starting value to avoid collisions with existing IDs
+        # Retrieval profile of local connector searches, and overrides of it
+        # for individual connectors (e.g. {"SLACK_CONNECTOR": "fast"}); the RRF
+        # weights, when given, override those of every profile
+        self.retrieval_profile = get_retrieval_profile(
+            retrieval_profile, semantic_weight, keyword_weight
         )
+        self.connector_retrieval_profiles = {
+            connector: get_retrieval_profile(profile, semantic_weight, keyword_weight)
+            for connector, profile in (connector_retrieval_profiles or {}).items()
+        }
+        # Counter state lives in a dict so services bound to other sessions
+        # via with_session() share the same sequence of source IDs
+        self._source_id_state = {
+            "value": 100000  # High starting value to avoid collisions with existing IDs
+        }
         self.counter_lock = (
             asyncio.Lock()
         )  # Lock to protect counter in multithreaded environments
+        # Local connector results fetched ahead of time by prefetch_local_search_results
+        self._prefetched_results = {}
+
+    @property
+    def source_id_counter(self) -> int:
+        return self._source_id_state["value"]
+
+    @source_id_counter.setter
+    def source_id_counter(self, value: int):
+        self._source_id_state["value"] = value
+
+    def with_session(self, session: AsyncSession) -> "ConnectorService":
+        """
+        Create a service that runs its queries on another database session while
+        sharing this service's source ID counter and lock. Used to run searches
+        concurrently, since a single AsyncSession cannot be used by several tasks.
+
+        Args:
+            session: The database session the new service should use
+
+        Returns:
+            ConnectorService: A service bound to the given session
+        """
+        service = ConnectorService(
+            session,
+            user_id=self.user_id,
+            retrieval_profile=self.retrieval_profile,
+            connector_retrieval_profiles=self.connector_retrieval_profiles,
+        )
+        service._source_id_state = self._source_id_state
+        service.counter_lock = self.counter_lock
+        service._prefetched_results = self._prefetched_results
+        return service
+
+    def get_retrieval_profile(self, connector: str) -> RetrievalProfile:
+        """Get the retrieval profile searches of a connector run with."""
+        return self.connector_retrieval_profiles.get(connector, self.retrieval_profile)
+
+    async def prefetch_local_search_results(
+        self,
+        user_query: str,
+        user_id: str,
+        search_space_id: int,
+        connectors: list[str],
+        top_k: int = 20,
+        search_mode: SearchMode = SearchMode.CHUNKS,
+    ) -> None:
+        """
+        Search all local connectors (those backed by indexed documents) with a single
+        multi-type hybrid search query per retrieval profile. The per-type results are
+        kept on the service, so the following search_* calls for the same query are
+        served without embedding the query or hitting the database again.
+
+        Args:
+            user_query: The user's query
+            user_id: The user's ID
+            search_space_id: The search space ID
+            connectors: Connectors that are about to be searched
+            top_k: Maximum number of results per connector
+            search_mode: Whether to search chunks or whole documents
+        """
+        # Connectors searched with the same profile share one query
+        document_types_by_profile: dict[RetrievalProfile, list[str]] = {}
+        for connector in connectors:
+            if connector in DocumentType.__members__:
+                document_types_by_profile.setdefault(
+                    self.get_retrieval_profile(connector), []
+                ).append(connector)
+
+        for profile, document_types in document_types_by_profile.items():
+            # A single type gains nothing over the regular per-connector query
+            if len(document_types) < 2:
+                continue
+
+            if search_mode == SearchMode.CHUNKS:
+                results_by_type = await self.chunk_retriever.hybrid_search_multi(
+                    query_text=user_query,
+                    top_k=top_k,
+                    user_id=user_id,
+                    document_types=document_types,
+                    search_space_id=search_space_id,
+                    profile=profile,
+                )
+            elif search_mode == SearchMode.DOCUMENTS:
+                results_by_type = await self.document_retriever.hybrid_search_multi(
+                    query_text=user_query,
+                    top_k=top_k,
+                    user_id=user_id,
+                    document_types=document_types,
+                    search_space_id=search_space_id,
+                    profile=profile,
+                )
+                # Transform document retriever results to match expected format
+                results_by_type = {
+                    document_type: self._transform_document_results(results)
+                    for document_type, results in results_by_type.items()
+                }
+
+            for document_type in document_types:
+                cache_key = (
+                    user_query,
+                    user_id,
+                    search_space_id,
+                    document_type,
+                    top_k,
+                    search_mode,
+                )
+                self._prefetched_results[cache_key] = results_by_type.get(
+                    document_type, []
+                )
+
+    async def _search_local_documents(
+        self,
+        user_query: str,
+        user_id: str,
+        search_space_id: int,
+        document_type: str,
+        top_k: int,
+        search_mode: SearchMode,
+    ) -> list[dict[str, Any]]:
+        """
+        Run hybrid search over one document type, reusing results from
+        prefetch_local_search_results or prefetch_connector_results when available.
+
+        Returns:
+            List of chunk results in the format expected by the search_* methods
+        """
+        cache_key = (
+            user_query,
+            user_id,
+            search_space_id,
+            document_type,
+            top_k,
+            search_mode,
+        )
+        if cache_key in self._prefetched_results:
+            return self._prefetched_results[cache_key]
+
+        profile = self.get_retrieval_profile(document_type)
+        results = []
+        if search_mode == SearchMode.CHUNKS:
+            results = await self.chunk_retriever.hybrid_search(
+                query_text=user_query,
+                top_k=top_k,
+                user_id=user_id,
+                search_space_id=search_space_id,
+                document_type=document_type,
+                profile=profile,
+            )
+        elif search_mode == SearchMode.DOCUMENTS:
+            document_results = await self.document_retriever.hybrid_search(
+                query_text=user_query,
+                top_k=top_k,
+                user_id=user_id,
+                search_space_id=search_space_id,
+                document_type=document_type,
+                profile=profile,
+            )
+            # Transform document retriever results to match expected format
+            results = self._transform_document_results(document_results)
+
+        self._prefetched_results[cache_key] = results
+        return results
+
+    async def prefetch_connector_results(
+        self,
+        user_query: str,
+        user_id: str,
+        search_space_id: int,
+        connector: str,
+        top_k: int = 20,
+        search_mode: SearchMode = SearchMode.CHUNKS,
+        linkup_mode: str = "standard",
+    ) -> None:
+        """
+        Fetch the results of one connector search ahead of time, without building
+        its source objects. The following search_* call for the same query only
+        numbers and formats the results, so searches can be fetched concurrently
+        while source IDs are still assigned in a deterministic order.
+
+        Args:
+            user_query: The user's query
+            user_id: The user's ID
+            search_space_id: The search space ID
+            connector: Connector that is about to be searched
+            top_k: Maximum number of results
+            search_mode: Whether to search chunks or whole documents
+            linkup_mode: Search depth of Linkup searches
+        """
+        if connector in DocumentType.__members__:
+            await self._search_local_documents(
+                user_query=user_query,
+                user_id=user_id,
+                search_space_id=search_space_id,
+                document_type=connector,
+                top_k=top_k,
+                search_mode=search_mode,
+            )
+        elif connector == "TAVILY_API":
+            await self._fetch_tavily_results(user_query, user_id, top_k)
+        elif connector == "LINKUP_API":
+            await self._fetch_linkup_results(user_query, user_id, linkup_mode)
 
     async def initialize_counter(self):
         """
@@ -71,24 +295,14 @@ class ConnectorService:
         Returns:
             tuple: (sources_info, langchain_documents)
         """
-        if search_mode == SearchMode.CHUNKS:
-            crawled_urls_chunks = await self.chunk_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="CRAWLED_URL",
-            )
-        elif search_mode == SearchMode.DOCUMENTS:
-            crawled_urls_chunks = await self.document_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="CRAWLED_URL",
-            )
-            # Transform document retriever results to match expected format
-            crawled_urls_chunks = self._transform_document_results(crawled_urls_chunks)
+        crawled_urls_chunks = await self._search_local_documents(
+            user_query=user_query,
+            user_id=user_id,
+            search_space_id=search_space_id,
+            document_type="CRAWLED_URL",
+            top_k=top_k,
+            search_mode=search_mode,
+        )
 
         # Early return if no results
         if not crawled_urls_chunks:
@@ -145,24 +359,14 @@ class ConnectorService:
         Returns:
             tuple: (sources_info, langchain_documents)
         """
-        if search_mode == SearchMode.CHUNKS:
-            files_chunks = await self.chunk_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="FILE",
-            )
-        elif search_mode == SearchMode.DOCUMENTS:
-            files_chunks = await self.document_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="FILE",
-            )
-            # Transform document retriever results to match expected format
-            files_chunks = self._transform_document_results(files_chunks)
+        files_chunks = await self._search_local_documents(
+            user_query=user_query,
+            user_id=user_id,
+            search_space_id=search_space_id,
+            document_type="FILE",
+            top_k=top_k,
+            search_mode=search_mode,
+        )
 
         # Early return if no results
         if not files_chunks:
@@ -255,6 +459,43 @@ class ConnectorService:
         )
         return result.scalars().first()
 
+    async def _fetch_tavily_results(
+        self, user_query: str, user_id: str, top_k: int
+    ) -> list[dict[str, Any]]:
+        """
+        Raw Tavily results of a query, reusing results fetched by
+        prefetch_connector_results. Empty if no Tavily connector is configured.
+        """
+        cache_key = ("TAVILY_API", user_query, user_id, top_k)
+        if cache_key in self._prefetched_results:
+            return self._prefetched_results[cache_key]
+
+        # Get Tavily connector configuration
+        tavily_connector = await self.get_connector_by_type(
+            user_id, SearchSourceConnectorType.TAVILY_API
+        )
+
+        tavily_results = []
+        if tavily_connector:
+            # Initialize Tavily client with API key from connector config
+            tavily_api_key = tavily_connector.config.get("TAVILY_API_KEY")
+            tavily_client = TavilyClient(api_key=tavily_api_key)
+
+            # The client is blocking, so run it in a thread to let other
+            # searches proceed meanwhile
+            response = await asyncio.to_thread(
+                tavily_client.search,
+                query=user_query,
+                max_results=top_k,
+                search_depth="advanced",  # Use advanced search for better results
+            )
+
+            # Extract results from Tavily response
+            tavily_results = response.get("results", [])
+
+        self._prefetched_results[cache_key] = tavily_results
+        return tavily_results
+
     async def search_tavily(
         self, user_query: str, user_id: str, top_k: int = 20
     ) -> tuple:
@@ -269,35 +510,12 @@ class ConnectorService:
         Returns:
             tuple: (sources_info, documents)
         """
-        # Get Tavily connector configuration
-        tavily_connector = await self.get_connector_by_type(
-            user_id, SearchSourceConnectorType.TAVILY_API
-        )
-
-        if not tavily_connector:
-            # Return empty results if no Tavily connector is configured
-            return {
-                "id": 3,
-                "name": "Tavily Search",
-                "type": "TAVILY_API",
-                "sources": [],
-            }, []
-
-        # Initialize Tavily client with API key from connector config
-        tavily_api_key = tavily_connector.config.get("TAVILY_API_KEY")
-        tavily_client = TavilyClient(api_key=tavily_api_key)
-
         # Perform search with Tavily
         try:
-            response = tavily_client.search(
-                query=user_query,
-                max_results=top_k,
-                search_depth="advanced",  # Use advanced search for better results
+            tavily_results = await self._fetch_tavily_results(
+                user_query, user_id, top_k
             )
 
-            # Extract results from Tavily response
-            tavily_results = response.get("results", [])
-
             # Early return if no results
             if not tavily_results:
                 return {
@@ -375,24 +593,14 @@ class ConnectorService:
         Returns:
             tuple: (sources_info, langchain_documents)
         """
-        if search_mode == SearchMode.CHUNKS:
-            slack_chunks = await self.chunk_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="SLACK_CONNECTOR",
-            )
-        elif search_mode == SearchMode.DOCUMENTS:
-            slack_chunks = await self.document_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="SLACK_CONNECTOR",
-            )
-            # Transform document retriever results to match expected format
-            slack_chunks = self._transform_document_results(slack_chunks)
+        slack_chunks = await self._search_local_documents(
+            user_query=user_query,
+            user_id=user_id,
+            search_space_id=search_space_id,
+            document_type="SLACK_CONNECTOR",
+            top_k=top_k,
+            search_mode=search_mode,
+        )
 
         # Early return if no results
         if not slack_chunks:
@@ -471,24 +679,14 @@ class ConnectorService:
         Returns:
             tuple: (sources_info, langchain_documents)
         """
-        if search_mode == SearchMode.CHUNKS:
-            notion_chunks = await self.chunk_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="NOTION_CONNECTOR",
-            )
-        elif search_mode == SearchMode.DOCUMENTS:
-            notion_chunks = await self.document_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="NOTION_CONNECTOR",
-            )
-            # Transform document retriever results to match expected format
-            notion_chunks = self._transform_document_results(notion_chunks)
+        notion_chunks = await self._search_local_documents(
+            user_query=user_query,
+            user_id=user_id,
+            search_space_id=search_space_id,
+            document_type="NOTION_CONNECTOR",
+            top_k=top_k,
+            search_mode=search_mode,
+        )
 
         # Early return if no results
         if not notion_chunks:
@@ -568,24 +766,14 @@ class ConnectorService:
         Returns:
             tuple: (sources_info, langchain_documents)
         """
-        if search_mode == SearchMode.CHUNKS:
-            extension_chunks = await self.chunk_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="EXTENSION",
-            )
-        elif search_mode == SearchMode.DOCUMENTS:
-            extension_chunks = await self.document_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="EXTENSION",
-            )
-            # Transform document retriever results to match expected format
-            extension_chunks = self._transform_document_results(extension_chunks)
+        extension_chunks = await self._search_local_documents(
+            user_query=user_query,
+            user_id=user_id,
+            search_space_id=search_space_id,
+            document_type="EXTENSION",
+            top_k=top_k,
+            search_mode=search_mode,
+        )
 
         # Early return if no results
         if not extension_chunks:
@@ -689,24 +877,14 @@ class ConnectorService:
         Returns:
             tuple: (sources_info, langchain_documents)
         """
-        if search_mode == SearchMode.CHUNKS:
-            youtube_chunks = await self.chunk_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="YOUTUBE_VIDEO",
-            )
-        elif search_mode == SearchMode.DOCUMENTS:
-            youtube_chunks = await self.document_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="YOUTUBE_VIDEO",
-            )
-            # Transform document retriever results to match expected format
-            youtube_chunks = self._transform_document_results(youtube_chunks)
+        youtube_chunks = await self._search_local_documents(
+            user_query=user_query,
+            user_id=user_id,
+            search_space_id=search_space_id,
+            document_type="YOUTUBE_VIDEO",
+            top_k=top_k,
+            search_mode=search_mode,
+        )
 
         # Early return if no results
         if not youtube_chunks:
@@ -782,24 +960,14 @@ class ConnectorService:
         Returns:
             tuple: (sources_info, langchain_documents)
         """
-        if search_mode == SearchMode.CHUNKS:
-            github_chunks = await self.chunk_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="GITHUB_CONNECTOR",
-            )
-        elif search_mode == SearchMode.DOCUMENTS:
-            github_chunks = await self.document_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="GITHUB_CONNECTOR",
-            )
-            # Transform document retriever results to match expected format
-            github_chunks = self._transform_document_results(github_chunks)
+        github_chunks = await self._search_local_documents(
+            user_query=user_query,
+            user_id=user_id,
+            search_space_id=search_space_id,
+            document_type="GITHUB_CONNECTOR",
+            top_k=top_k,
+            search_mode=search_mode,
+        )
 
         # Early return if no results
         if not github_chunks:
@@ -863,24 +1031,14 @@ class ConnectorService:
         Returns:
             tuple: (sources_info, langchain_documents)
         """
-        if search_mode == SearchMode.CHUNKS:
-            linear_chunks = await self.chunk_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="LINEAR_CONNECTOR",
-            )
-        elif search_mode == SearchMode.DOCUMENTS:
-            linear_chunks = await self.document_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="LINEAR_CONNECTOR",
-            )
-            # Transform document retriever results to match expected format
-            linear_chunks = self._transform_document_results(linear_chunks)
+        linear_chunks = await self._search_local_documents(
+            user_query=user_query,
+            user_id=user_id,
+            search_space_id=search_space_id,
+            document_type="LINEAR_CONNECTOR",
+            top_k=top_k,
+            search_mode=search_mode,
+        )
 
         # Early return if no results
         if not linear_chunks:
@@ -973,24 +1131,14 @@ class ConnectorService:
         Returns:
             tuple: (sources_info, langchain_documents)
         """
-        if search_mode == SearchMode.CHUNKS:
-            jira_chunks = await self.chunk_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="JIRA_CONNECTOR",
-            )
-        elif search_mode == SearchMode.DOCUMENTS:
-            jira_chunks = await self.document_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="JIRA_CONNECTOR",
-            )
-            # Transform document retriever results to match expected format
-            jira_chunks = self._transform_document_results(jira_chunks)
+        jira_chunks = await self._search_local_documents(
+            user_query=user_query,
+            user_id=user_id,
+            search_space_id=search_space_id,
+            document_type="JIRA_CONNECTOR",
+            top_k=top_k,
+            search_mode=search_mode,
+        )
 
         # Early return if no results
         if not jira_chunks:
@@ -1094,24 +1242,14 @@ class ConnectorService:
         Returns:
             tuple: (sources_info, langchain_documents)
         """
-        if search_mode == SearchMode.CHUNKS:
-            confluence_chunks = await self.chunk_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="CONFLUENCE_CONNECTOR",
-            )
-        elif search_mode == SearchMode.DOCUMENTS:
-            confluence_chunks = await self.document_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="CONFLUENCE_CONNECTOR",
-            )
-            # Transform document retriever results to match expected format
-            confluence_chunks = self._transform_document_results(confluence_chunks)
+        confluence_chunks = await self._search_local_documents(
+            user_query=user_query,
+            user_id=user_id,
+            search_space_id=search_space_id,
+            document_type="CONFLUENCE_CONNECTOR",
+            top_k=top_k,
+            search_mode=search_mode,
+        )
 
         # Early return if no results
         if not confluence_chunks:
@@ -1170,6 +1308,43 @@ class ConnectorService:
 
         return result_object, confluence_chunks
 
+    async def _fetch_linkup_results(
+        self, user_query: str, user_id: str, mode: str
+    ) -> list:
+        """
+        Raw Linkup results of a query, reusing results fetched by
+        prefetch_connector_results. Empty if no Linkup connector is configured.
+        """
+        cache_key = ("LINKUP_API", user_query, user_id, mode)
+        if cache_key in self._prefetched_results:
+            return self._prefetched_results[cache_key]
+
+        # Get Linkup connector configuration
+        linkup_connector = await self.get_connector_by_type(
+            user_id, SearchSourceConnectorType.LINKUP_API
+        )
+
+        linkup_results = []
+        if linkup_connector:
+            # Initialize Linkup client with API key from connector config
+            linkup_api_key = linkup_connector.config.get("LINKUP_API_KEY")
+            linkup_client = LinkupClient(api_key=linkup_api_key)
+
+            # The client is blocking, so run it in a thread to let other
+            # searches proceed meanwhile
+            response = await asyncio.to_thread(
+                linkup_client.search,
+                query=user_query,
+                depth=mode,  # Use the provided mode ("standard" or "deep")
+                output_type="searchResults",  # Default to search results
+            )
+
+            # Extract results from Linkup response - access as attribute instead of using .get()
+            linkup_results = response.results if hasattr(response, "results") else []
+
+        self._prefetched_results[cache_key] = linkup_results
+        return linkup_results
+
     async def search_linkup(
         self, user_query: str, user_id: str, mode: str = "standard"
     ) -> tuple:
@@ -1184,34 +1359,9 @@ class ConnectorService:
         Returns:
             tuple: (sources_info, documents)
         """
-        # Get Linkup connector configuration
-        linkup_connector = await self.get_connector_by_type(
-            user_id, SearchSourceConnectorType.LINKUP_API
-        )
-
-        if not linkup_connector:
-            # Return empty results if no Linkup connector is configured
-            return {
-                "id": 10,
-                "name": "Linkup Search",
-                "type": "LINKUP_API",
-                "sources": [],
-            }, []
-
-        # Initialize Linkup client with API key from connector config
-        linkup_api_key = linkup_connector.config.get("LINKUP_API_KEY")
-        linkup_client = LinkupClient(api_key=linkup_api_key)
-
         # Perform search with Linkup
         try:
-            response = linkup_client.search(
-                query=user_query,
-                depth=mode,  # Use the provided mode ("standard" or "deep")
-                output_type="searchResults",  # Default to search results
-            )
-
-            # Extract results from Linkup response - access as attribute instead of using .get()
-            linkup_results = response.results if hasattr(response, "results") else []
+            linkup_results = await self._fetch_linkup_results(user_query, user_id, mode)
 
             # Only proceed if we have results
             if not linkup_results:
@@ -1308,24 +1458,14 @@ class ConnectorService:
         Returns:
             tuple: (sources_info, langchain_documents)
         """
-        if search_mode == SearchMode.CHUNKS:
-            discord_chunks = await self.chunk_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="DISCORD_CONNECTOR",
-            )
-        elif search_mode == SearchMode.DOCUMENTS:
-            discord_chunks = await self.document_retriever.hybrid_search(
-                query_text=user_query,
-                top_k=top_k,
-                user_id=user_id,
-                search_space_id=search_space_id,
-                document_type="DISCORD_CONNECTOR",
-            )
-            # Transform document retriever results to match expected format
-            discord_chunks = self._transform_document_results(discord_chunks)
+        discord_chunks = await self._search_local_documents(
+            user_query=user_query,
+            user_id=user_id,
+            search_space_id=search_space_id,
+            document_type="DISCORD_CONNECTOR",
+            top_k=top_k,
+            search_mode=search_mode,
+        )
 
         # Early return if no results
         if not discord_chunks:
@@ -4,13 +4,26 @@ Docling Document Processing Service for SurfSense
 SSL-safe implementation with pre-downloaded models
 """
 
+import asyncio
 import logging
 import os
 import ssl
+from collections.abc import Awaitable, Callable
 from typing import Any
 
+from litellm import get_model_info, token_counter
+
+from app.config import config
+
 logger = logging.getLogger(__name__)
 
+# Context window assumed when litellm doesn't know the model
+DEFAULT_CONTEXT_WINDOW_TOKENS = 8192
+# Tokens kept free for the combine prompt and the generated summary
+COMBINE_PROMPT_RESERVED_TOKENS = 2048
+# Characters of each section summary included in progress updates
+PROGRESS_SUMMARY_PREVIEW_CHARS = 500
+
 
 class DoclingService:
     """Docling service for enhanced document processing with SSL fixes."""
@@ -223,15 +236,26 @@ class DoclingService:
             raise RuntimeError(f"Docling processing failed: {e}") from e
 
     async def process_large_document_summary(
-        self, content: str, llm, document_title: str = "Document"
+        self,
+        content: str,
+        llm,
+        document_title: str = "Document",
+        on_progress: Callable[[str, dict[str, Any]], Awaitable[Any]] | None = None,
+        max_concurrency: int | None = None,
     ) -> str:
         """
-        Process large documents using chunked LLM summarization.
+        Process large documents using map-reduce LLM summarization: chunks are
+        summarized concurrently, then combined, in several levels if the
+        section summaries don't fit the model's context window at once.
 
         Args:
             content: The full document content
             llm: The language model to use for summarization
             document_title: Title of the document for context
+            on_progress: Called with a message and metadata as sections are
+                summarized and combined, e.g. to update the task log
+            max_concurrency: Maximum concurrent LLM calls (defaults to
+                DOCLING_SUMMARY_CONCURRENCY)
 
         Returns:
             Final summary of the document
@@ -296,39 +320,72 @@ Chunk {chunk_number}/{total_chunks}:
 </INSTRUCTIONS>""",
         )
 
-        # Process each chunk individually
-        chunk_summaries = []
-        for i, chunk in enumerate(chunks, 1):
-            try:
-                logger.info(
-                    f"🔄 Processing chunk {i}/{total_chunks} ({len(chunk.text)} chars)"
-                )
+        semaphore = asyncio.Semaphore(
+            max(1, max_concurrency or config.DOCLING_SUMMARY_CONCURRENCY)
+        )
 
-                chunk_chain = chunk_template | llm
-                chunk_result = await chunk_chain.ainvoke(
-                    {
-                        "chunk": chunk.text,
-                        "chunk_number": i,
-                        "total_chunks": total_chunks,
-                    }
-                )
+        async def summarize_chunk(i: int, chunk) -> tuple[int, str]:
+            async with semaphore:
+                try:
+                    logger.info(
+                        f"🔄 Processing chunk {i}/{total_chunks} ({len(chunk.text)} chars)"
+                    )
 
-                chunk_summary = chunk_result.content
-                chunk_summaries.append(f"=== Section {i} ===\n{chunk_summary}")
+                    chunk_chain = chunk_template | llm
+                    chunk_result = await chunk_chain.ainvoke(
+                        {
+                            "chunk": chunk.text,
+                            "chunk_number": i,
+                            "total_chunks": total_chunks,
+                        }
+                    )
 
-                logger.info(f"✅ Completed chunk {i}/{total_chunks}")
+                    logger.info(f"✅ Completed chunk {i}/{total_chunks}")
+                    return i, chunk_result.content
 
-            except Exception as e:
-                logger.error(f"❌ Failed to process chunk {i}/{total_chunks}: {e}")
-                chunk_summaries.append(f"=== Section {i} ===\n[Processing failed]")
+                except Exception as e:
+                    logger.error(f"❌ Failed to process chunk {i}/{total_chunks}: {e}")
+                    return i, "[Processing failed]"
+
+        # Map: summarize the chunks concurrently, reporting each finished section
+        section_summaries: dict[int, str] = {}
+        tasks = [
+            asyncio.create_task(summarize_chunk(i, chunk))
+            for i, chunk in enumerate(chunks, 1)
+        ]
+        try:
+            for completed, task in enumerate(asyncio.as_completed(tasks), 1):
+                i, chunk_summary = await task
+                section_summaries[i] = chunk_summary
+                if on_progress:
+                    await on_progress(
+                        f"Summarized section {i} of {document_title} "
+                        f"({completed}/{total_chunks} done)",
+                        {
+                            "stage": "summarizing_sections",
+                            "sections_completed": completed,
+                            "total_sections": total_chunks,
+                            "latest_section": i,
+                            "latest_section_summary": chunk_summary[
+                                :PROGRESS_SUMMARY_PREVIEW_CHARS
+                            ],
+                        },
+                    )
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        chunk_summaries = [
+            f"=== Section {i} ===\n{section_summaries[i]}"
+            for i in range(1, total_chunks + 1)
+        ]
 
         # Combine summaries into final document summary
         logger.info(f"🔄 Combining {len(chunk_summaries)} chunk summaries")
 
-        try:
-            combine_template = PromptTemplate(
-                input_variables=["summaries", "document_title"],
-                template="""<INSTRUCTIONS>
+        combine_template = PromptTemplate(
+            input_variables=["summaries", "document_title"],
+            template="""<INSTRUCTIONS>
 You are combining multiple section summaries into a final comprehensive document summary.
 
 Create a unified, coherent summary from the following section summaries of "{document_title}".
@@ -342,16 +399,69 @@ Ensure:
 {summaries}
 </section_summaries>
 </INSTRUCTIONS>""",
-            )
+        )
+        combine_chain = combine_template | llm
 
-            combined_summaries = "\n\n".join(chunk_summaries)
-            combine_chain = combine_template | llm
+        async def combine(summaries: list[str]) -> str:
+            async with semaphore:
+                result = await combine_chain.ainvoke(
+                    {
+                        "summaries": "\n\n".join(summaries),
+                        "document_title": document_title,
+                    }
+                )
+                return result.content
 
-            final_result = await combine_chain.ainvoke(
-                {"summaries": combined_summaries, "document_title": document_title}
-            )
+        # Reduce: while the summaries don't fit the LLM's context window,
+        # combine groups that do into intermediate summaries
+        input_budget = self._get_summary_input_budget(llm)
+        level = 0
+        try:
+            while (
+                len(chunk_summaries) > 1
+                and self._count_tokens(llm, "\n\n".join(chunk_summaries)) > input_budget
+            ):
+                groups = self._group_summaries(llm, chunk_summaries, input_budget)
+                if len(groups) == len(chunk_summaries):
+                    # Every summary fills the window alone; combine them as they are
+                    break
+
+                level += 1
+                logger.info(
+                    f"🔄 Reduction level {level}: combining {len(chunk_summaries)} "
+                    f"summaries in {len(groups)} groups"
+                )
+                combined = await asyncio.gather(
+                    *(combine(group) for group in groups if len(group) > 1)
+                )
+                combined_iter = iter(combined)
+                chunk_summaries = [
+                    f"=== Part {part} ===\n"
+                    + (
+                        next(combined_iter)
+                        if len(group) > 1
+                        # Drop the section/part heading of a summary kept as is
+                        else group[0].split("\n", 1)[1]
+                    )
+                    for part, group in enumerate(groups, 1)
+                ]
+
+                if on_progress:
+                    await on_progress(
+                        f"Combined section summaries of {document_title} "
+                        f"into {len(chunk_summaries)} parts",
+                        {
+                            "stage": "combining_summaries",
+                            "reduction_level": level,
+                            "remaining_summaries": len(chunk_summaries),
+                        },
+                    )
 
-            final_summary = final_result.content
+            final_summary = (
+                await combine(chunk_summaries)
+                if len(chunk_summaries) > 1 or level == 0
+                else chunk_summaries[0].split("\n", 1)[1]
+            )
             logger.info(
                 f"✅ Large document processing complete: {len(final_summary)} chars summary"
             )
@@ -365,6 +475,44 @@ Ensure:
             logger.warning("⚠️ Using fallback combined summary")
             return fallback_summary
 
+    @staticmethod
+    def _get_model_name(llm) -> str | None:
+        return getattr(llm, "model", None) or getattr(llm, "model_name", None)
+
+    def _get_summary_input_budget(self, llm) -> int:
+        """Tokens of section summaries that fit into one combine call."""
+        try:
+            context_window = get_model_info(self._get_model_name(llm))[
+                "max_input_tokens"
+            ]
+        except Exception:
+            context_window = None
+        context_window = context_window or DEFAULT_CONTEXT_WINDOW_TOKENS
+        return max(1, context_window - COMBINE_PROMPT_RESERVED_TOKENS)
+
+    def _count_tokens(self, llm, text: str) -> int:
+        try:
+            return token_counter(model=self._get_model_name(llm), text=text)
+        except Exception:
+            # Rough estimate for models litellm cannot count tokens for
+            return len(text) // 4
+
+    def _group_summaries(
+        self, llm, summaries: list[str], input_budget: int
+    ) -> list[list[str]]:
+        """Pack consecutive summaries into groups that fit the input budget."""
+        groups: list[list[str]] = []
+        group_tokens = 0
+        for summary in summaries:
+            tokens = self._count_tokens(llm, summary)
+            if groups and group_tokens + tokens <= input_budget:
+                groups[-1].append(summary)
+                group_tokens += tokens
+            else:
+                groups.append([summary])
+                group_tokens = tokens
+        return groups
+
 
 def create_docling_service() -> DoclingService:
     """Create a Docling service instance."""
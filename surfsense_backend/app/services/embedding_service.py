@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingService:
+    """
+    Service for computing embeddings in batches on a dedicated worker pool,
+    keeping model inference off the asyncio event loop.
+    """
+
+    def __init__(
+        self,
+        embedding_model_instance,
+        batch_size: int = 32,
+        max_workers: int = 1,
+        stats_log_interval_seconds: float = 300,
+    ):
+        """
+        Initialize the embedding service
+
+        Args:
+            embedding_model_instance: The Chonkie embeddings instance to use
+            batch_size: Maximum number of texts sent to the model in one call
+            max_workers: Number of worker threads running model inference
+            stats_log_interval_seconds: How often throughput counters are
+                logged; 0 disables the periodic log
+        """
+        self.embedding_model_instance = embedding_model_instance
+        self.batch_size = max(1, batch_size)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="embedding"
+        )
+
+        # Throughput counters, guarded by a lock since workers update them
+        self._stats_lock = threading.Lock()
+        self._texts_embedded = 0
+        self._batches_processed = 0
+        self._inference_seconds = 0.0
+        self._queued_batches = 0
+        self.stats_log_interval_seconds = stats_log_interval_seconds
+        self._last_stats_log = time.monotonic()
+
+    async def embed_texts(self, texts: list[str]) -> list[Any]:
+        """
+        Embed a list of texts, preserving input order.
+
+        Args:
+            texts: The texts to embed
+
+        Returns:
+            List of embeddings, one per input text
+        """
+        if not texts:
+            return []
+
+        batches = [
+            texts[i : i + self.batch_size]
+            for i in range(0, len(texts), self.batch_size)
+        ]
+
+        with self._stats_lock:
+            self._queued_batches += len(batches)
+
+        loop = asyncio.get_running_loop()
+        try:
+            batch_results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(self._executor, self._embed_batch, batch)
+                    for batch in batches
+                )
+            )
+        finally:
+            # Batches cancelled before reaching a worker never run, so the
+            # queue depth is released here rather than in _embed_batch
+            with self._stats_lock:
+                self._queued_batches -= len(batches)
+
+        return [embedding for batch in batch_results for embedding in batch]
+
+    async def embed_text(self, text: str) -> Any:
+        """
+        Embed a single text.
+
+        Args:
+            text: The text to embed
+
+        Returns:
+            The embedding for the text
+        """
+        embeddings = await self.embed_texts([text])
+        return embeddings[0]
+
+    def _embed_batch(self, texts: list[str]) -> list[Any]:
+        """Run one batch through the model. Executed on a worker thread."""
+        start_time = time.perf_counter()
+        try:
+            embed_batch = getattr(self.embedding_model_instance, "embed_batch", None)
+            if embed_batch is not None:
+                embeddings = list(embed_batch(texts))
+            else:
+                embeddings = [self.embedding_model_instance.embed(t) for t in texts]
+        finally:
+            elapsed = time.perf_counter() - start_time
+            with self._stats_lock:
+                self._batches_processed += 1
+                self._texts_embedded += len(texts)
+                self._inference_seconds += elapsed
+
+        logger.debug(f"Embedded batch of {len(texts)} texts in {elapsed:.3f}s")
+        self._maybe_log_stats()
+        return embeddings
+
+    def _maybe_log_stats(self) -> None:
+        """Log the throughput counters once every stats_log_interval_seconds."""
+        if self.stats_log_interval_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._stats_lock:
+            if now - self._last_stats_log < self.stats_log_interval_seconds:
+                return
+            self._last_stats_log = now
+        stats = self.get_stats()
+        logger.info(
+            f"Embedding throughput: {stats['texts_embedded']} texts in "
+            f"{stats['batches_processed']} batches "
+            f"(avg batch {stats['average_batch_size']:.1f}, "
+            f"{stats['texts_per_second']:.1f} texts/s, "
+            f"queue depth {stats['queue_depth']})"
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get throughput counters for the embedding pipeline.
+
+        Returns:
+            Dict with texts embedded, batches processed, average batch size,
+            texts per second of inference time and the number of batches
+            queued or running
+        """
+        with self._stats_lock:
+            return {
+                "texts_embedded": self._texts_embedded,
+                "batches_processed": self._batches_processed,
+                "average_batch_size": (
+                    self._texts_embedded / self._batches_processed
+                    if self._batches_processed
+                    else 0.0
+                ),
+                "texts_per_second": (
+                    self._texts_embedded / self._inference_seconds
+                    if self._inference_seconds
+                    else 0.0
+                ),
+                "queue_depth": self._queued_batches,
+            }
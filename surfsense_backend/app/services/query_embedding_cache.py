@@ -0,0 +1,221 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class _ComputationCancelledError(Exception):
+    """Raised to waiters when the task computing their embedding is cancelled."""
+
+
+class QueryEmbeddingCache:
+    """
+    Size-bounded LRU/TTL cache for query embeddings, keyed by the embedding
+    model name and the normalized query text.
+
+    An optional Redis-compatible backend (any object exposing ``get(key)`` and
+    ``set(key, value, ex=seconds)``, sync or async) can be layered underneath
+    the in-process cache so embeddings are shared between workers.
+    """
+
+    def __init__(
+        self,
+        embedding_service,
+        model_name: str | None,
+        max_size: int = 1024,
+        ttl_seconds: float = 3600,
+        backend: Any = None,
+        key_prefix: str = "surfsense:query_embedding:",
+    ):
+        """
+        Initialize the query embedding cache
+
+        Args:
+            embedding_service: The EmbeddingService used on cache misses
+            model_name: Name of the embedding model, part of every cache key
+            max_size: Maximum number of embeddings kept in process
+            ttl_seconds: Seconds an embedding stays valid, 0 to never expire
+            backend: Optional Redis-compatible client shared across processes
+            key_prefix: Prefix for keys written to the backend
+        """
+        self.embedding_service = embedding_service
+        self.model_name = model_name or ""
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = max(0, ttl_seconds)
+        self.backend = backend
+        self.key_prefix = key_prefix
+
+        self._entries: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Concurrent misses for the same query share one model call
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+        self._hits = 0
+        self._backend_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def normalize_query(query_text: str) -> str:
+        """Collapse whitespace so trivially different queries share an entry."""
+        return " ".join(query_text.split())
+
+    def make_key(self, query_text: str) -> str:
+        """
+        Build the cache key for a query.
+
+        Args:
+            query_text: The raw query text
+
+        Returns:
+            Hex digest of the model name and normalized query
+        """
+        normalized = self.normalize_query(query_text)
+        return hashlib.sha256(f"{self.model_name}\n{normalized}".encode()).hexdigest()
+
+    async def get_embedding(self, query_text: str) -> Any:
+        """
+        Get the embedding for a query, computing it only on a cache miss.
+
+        Args:
+            query_text: The search query text
+
+        Returns:
+            The query embedding
+        """
+        key = self.make_key(query_text)
+
+        embedding = self._get_local(key)
+        if embedding is not None:
+            return embedding
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            try:
+                return await asyncio.shield(in_flight)
+            except _ComputationCancelledError:
+                # The owner was cancelled; compute the embedding ourselves
+                return await self.get_embedding(query_text)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            embedding = await self._get_backend(key)
+            if embedding is not None:
+                with self._lock:
+                    self._backend_hits += 1
+            else:
+                with self._lock:
+                    self._misses += 1
+                embedding = await self.embedding_service.embed_text(
+                    self.normalize_query(query_text)
+                )
+                await self._set_backend(key, embedding)
+
+            self._set_local(key, embedding)
+            future.set_result(embedding)
+            return embedding
+        except asyncio.CancelledError:
+            # Only the owner is cancelled: hand waiters a retryable error
+            # instead of cancelling them along with it
+            self._in_flight.pop(key, None)
+            future.set_exception(_ComputationCancelledError())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieve the exception so an unawaited future does not warn
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all in-process entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get hit/miss counters for the cache.
+
+        Returns:
+            Dict with hits, backend hits, misses, evictions, current size and
+            the overall hit rate
+        """
+        with self._lock:
+            lookups = self._hits + self._backend_hits + self._misses
+            return {
+                "hits": self._hits,
+                "backend_hits": self._backend_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "hit_rate": (
+                    (self._hits + self._backend_hits) / lookups if lookups else 0.0
+                ),
+            }
+
+    def _get_local(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, embedding = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return embedding
+
+    def _set_local(self, key: str, embedding: Any) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._entries[key] = (expires_at, embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    async def _get_backend(self, key: str) -> Any:
+        if self.backend is None:
+            return None
+
+        try:
+            value = self.backend.get(self.key_prefix + key)
+            if inspect.isawaitable(value):
+                value = await value
+            if value is None:
+                return None
+            if isinstance(value, bytes):
+                value = value.decode()
+            return json.loads(value)
+        except Exception as e:
+            logger.warning(f"Query embedding cache backend read failed: {e!s}")
+            return None
+
+    async def _set_backend(self, key: str, embedding: Any) -> None:
+        if self.backend is None:
+            return
+
+        try:
+            values = embedding.tolist() if hasattr(embedding, "tolist") else embedding
+            result = self.backend.set(
+                self.key_prefix + key,
+                json.dumps([float(v) for v in values]),
+                ex=int(self.ttl_seconds) or None,
+            )
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.warning(f"Query embedding cache backend write failed: {e!s}")
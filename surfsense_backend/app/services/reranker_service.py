@@ -1,4 +1,10 @@
+import asyncio
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
 from rerankers import Document as RerankerDocument
@@ -6,19 +12,74 @@ from rerankers import Document as RerankerDocument
 
 class RerankerService:
     """
-    Service for reranking documents using a configured reranker
+    Service for reranking documents using a configured reranker.
+
+    Model inference runs on a dedicated worker pool so it never blocks the
+    event loop; concurrent identical requests share a single inference and
+    the number of in-flight inferences is bounded. Scores are cached per
+    (query, chunk content) pair so repeated pairs are never re-scored.
+
+    With micro-batching enabled, the (query, chunk) pairs of concurrent
+    requests are collected for a short window, or until a batch is full, and
+    scored together in one worker call whose scores are split back per
+    request.
     """
 
-    def __init__(self, reranker_instance=None):
+    def __init__(
+        self,
+        reranker_instance=None,
+        max_workers: int = 1,
+        max_concurrency: int | None = None,
+        batch_size: int = 0,
+        batch_window_ms: float = 5,
+        cache_size: int = 0,
+        cache_ttl_seconds: float = 3600,
+    ):
         """
         Initialize the reranker service
 
         Args:
             reranker_instance: The reranker instance to use for reranking
+            max_workers: Number of worker threads running reranker inference
+            max_concurrency: Maximum number of inferences in flight, defaults to
+                max_workers
+            batch_size: Maximum (query, chunk) pairs per micro-batch, pooled from
+                concurrent requests; larger requests are split. 0 to rank each
+                request on its own in one call. Only suitable for pointwise
+                rerankers (cross-encoders, flashrank, API scorers)
+            batch_window_ms: Milliseconds a micro-batch waits for more requests
+                before it is scored, unless it fills up first
+            cache_size: Maximum number of (query, chunk) scores kept, 0 to disable
+                the score cache. Like batch_size, only for pointwise rerankers
+            cache_ttl_seconds: Seconds a cached score stays valid, 0 to never expire
         """
         self.reranker_instance = reranker_instance
+        self.batch_size = max(0, batch_size)
+        self.batch_window_seconds = max(0, batch_window_ms) / 1000
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="reranker"
+        )
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency or max_workers))
+        # Concurrent requests for the same query and documents share one result
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+
+        # Micro-batch being collected: (query, documents, future) per request
+        self._pending: list[tuple[str, list[RerankerDocument], asyncio.Future]] = []
+        self._pending_pairs = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._batch_tasks: set[asyncio.Task] = set()
+
+        # LRU score cache keyed by (query hash, chunk content hash)
+        self.cache_size = max(0, cache_size)
+        self.cache_ttl_seconds = max(0, cache_ttl_seconds)
+        self._score_cache: OrderedDict[tuple[str, str], tuple[float | None, float]] = (
+            OrderedDict()
+        )
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
 
-    def rerank_documents(
+    async def rerank_documents(
         self, query_text: str, documents: list[dict[str, Any]]
     ) -> list[dict[str, Any]]:
         """
@@ -37,12 +98,14 @@ class RerankerService:
         try:
             # Create Document objects for the rerankers library
             reranker_docs = []
+            documents_by_id = {}
             for i, doc in enumerate(documents):
                 chunk_id = doc.get("chunk_id", f"chunk_{i}")
                 content = doc.get("content", "")
                 score = doc.get("score", 0.0)
                 document_info = doc.get("document", {})
 
+                documents_by_id.setdefault(chunk_id, doc)
                 reranker_docs.append(
                     RerankerDocument(
                         text=content,
@@ -57,28 +120,18 @@ class RerankerService:
                 )
 
             # Rerank using the configured reranker
-            reranking_results = self.reranker_instance.rank(
-                query=query_text, docs=reranker_docs
-            )
+            reranking_results = await self._rank_coalesced(query_text, reranker_docs)
 
             # Process the results from the reranker
             # Convert to serializable dictionaries
             serialized_results = []
-            for result in reranking_results.results:
-                # Find the original document by id
-                original_doc = next(
-                    (
-                        doc
-                        for doc in documents
-                        if doc.get("chunk_id") == result.document.doc_id
-                    ),
-                    None,
-                )
+            for doc_id, score, rank in reranking_results:
+                original_doc = documents_by_id.get(doc_id)
                 if original_doc:
                     # Create a new document with the reranked score
                     reranked_doc = original_doc.copy()
-                    reranked_doc["score"] = float(result.score)
-                    reranked_doc["rank"] = result.rank
+                    reranked_doc["score"] = score
+                    reranked_doc["rank"] = rank
                     serialized_results.append(reranked_doc)
 
             return serialized_results
@@ -89,16 +142,282 @@ class RerankerService:
             # Fall back to original documents without reranking
             return documents
 
+    async def _rank_coalesced(
+        self, query_text: str, reranker_docs: list[RerankerDocument]
+    ) -> list[tuple[Any, float, int]]:
+        """Rank documents, joining an identical request that is already running."""
+        key = (query_text, tuple((doc.doc_id, doc.text) for doc in reranker_docs))
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            results = await self._rank(query_text, reranker_docs)
+            future.set_result(results)
+            return results
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieve the exception so an unawaited future does not warn
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def _rank(
+        self, query_text: str, reranker_docs: list[RerankerDocument]
+    ) -> list[tuple[Any, float, int]]:
+        """
+        Score documents, reusing cached scores for known (query, chunk) pairs.
+
+        Returns:
+            List of (doc_id, score, rank) tuples ordered by rank
+        """
+        if not self.cache_size:
+            return await self._score(query_text, reranker_docs)
+
+        query_hash = self._hash(query_text)
+        cached_results = []
+        uncached_docs = []
+        for doc in reranker_docs:
+            score = self._get_cached_score((query_hash, self._hash(doc.text)))
+            if score is None:
+                uncached_docs.append(doc)
+            else:
+                cached_results.append((doc.doc_id, score, 0))
+
+        if not uncached_docs:
+            return self._merge_by_score([cached_results])
+
+        results = await self._score(query_text, uncached_docs)
+
+        texts_by_id = {}
+        for doc in uncached_docs:
+            texts_by_id.setdefault(doc.doc_id, doc.text)
+        for doc_id, score, _ in results:
+            if doc_id in texts_by_id:
+                self._set_cached_score(
+                    (query_hash, self._hash(texts_by_id[doc_id])), score
+                )
+
+        if not cached_results:
+            return results
+        return self._merge_by_score([cached_results, results])
+
+    async def _score(
+        self, query_text: str, reranker_docs: list[RerankerDocument]
+    ) -> list[tuple[Any, float, int]]:
+        """Score documents on the worker pool, through micro-batches if enabled."""
+        if not self.batch_size:
+            return await self._run_in_pool(
+                self._rank_request, query_text, reranker_docs
+            )
+
+        parts = [
+            reranker_docs[i : i + self.batch_size]
+            for i in range(0, len(reranker_docs), self.batch_size)
+        ]
+        part_results = await asyncio.gather(
+            *(self._add_to_batch(query_text, part) for part in parts)
+        )
+        return self._merge_by_score(part_results)
+
+    def _add_to_batch(
+        self, query_text: str, reranker_docs: list[RerankerDocument]
+    ) -> asyncio.Future:
+        """Add a request to the micro-batch being collected."""
+        loop = asyncio.get_running_loop()
+        if self._pending_pairs + len(reranker_docs) > self.batch_size:
+            self._flush_batch()
+
+        future = loop.create_future()
+        self._pending.append((query_text, reranker_docs, future))
+        self._pending_pairs += len(reranker_docs)
+
+        if self._pending_pairs >= self.batch_size:
+            self._flush_batch()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                self.batch_window_seconds, self._flush_batch
+            )
+        return future
+
+    def _flush_batch(self) -> None:
+        """Start scoring the collected micro-batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch = self._pending
+        self._pending = []
+        self._pending_pairs = 0
+
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(
+        self, batch: list[tuple[str, list[RerankerDocument], asyncio.Future]]
+    ) -> None:
+        """Score a micro-batch and hand each request its own results."""
+        try:
+            batch_results = await self._run_in_pool(
+                self._rank_batch, [(query, docs) for query, docs, _ in batch]
+            )
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), results in zip(batch, batch_results, strict=True):
+            # The request may have been cancelled while it waited
+            if not future.done():
+                future.set_result(results)
+
+    @staticmethod
+    def _merge_by_score(
+        result_lists: list[list[tuple[Any, float, int]]],
+    ) -> list[tuple[Any, float, int]]:
+        """Merge separately scored results and rank them against each other."""
+        merged = sorted(
+            (result for results in result_lists for result in results),
+            key=lambda result: result[1],
+            reverse=True,
+        )
+        return [
+            (doc_id, score, rank)
+            for rank, (doc_id, score, _) in enumerate(merged, start=1)
+        ]
+
+    async def _run_in_pool(self, func, *args):
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    def _rank_request(
+        self, query_text: str, reranker_docs: list[RerankerDocument]
+    ) -> list[tuple[Any, float, int]]:
+        """Run one request through the reranker. Executed on a worker thread."""
+        reranking_results = self.reranker_instance.rank(
+            query=query_text, docs=reranker_docs
+        )
+        return [
+            (result.document.doc_id, float(result.score), result.rank)
+            for result in reranking_results.results
+        ]
+
+    def _rank_batch(
+        self, requests: list[tuple[str, list[RerankerDocument]]]
+    ) -> list[list[tuple[Any, float, int]]]:
+        """
+        Score the (query, chunk) pairs of a micro-batch. Executed on a worker
+        thread.
+
+        A pointwise score does not depend on the other documents ranked with
+        it, so each distinct query is ranked once over the distinct texts of
+        all its requests, and every request gets the scores of its own
+        documents.
+
+        Returns:
+            The (doc_id, score, rank) results of each request, ordered by rank
+        """
+        texts_by_query: dict[str, dict[str, None]] = {}
+        for query_text, reranker_docs in requests:
+            texts = texts_by_query.setdefault(query_text, {})
+            for doc in reranker_docs:
+                texts.setdefault(doc.text, None)
+
+        scores_by_query: dict[str, dict[str, float]] = {}
+        for query_text, texts in texts_by_query.items():
+            texts = list(texts)
+            reranking_results = self.reranker_instance.rank(
+                query=query_text,
+                docs=[
+                    RerankerDocument(text=text, doc_id=index)
+                    for index, text in enumerate(texts)
+                ],
+            )
+            scores_by_query[query_text] = {
+                texts[result.document.doc_id]: float(result.score)
+                for result in reranking_results.results
+            }
+
+        return [
+            self._merge_by_score(
+                [
+                    [
+                        (doc.doc_id, scores_by_query[query_text][doc.text], 0)
+                        for doc in reranker_docs
+                    ]
+                ]
+            )
+            for query_text, reranker_docs in requests
+        ]
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _get_cached_score(self, key: tuple[str, str]) -> float | None:
+        with self._cache_lock:
+            entry = self._score_cache.get(key)
+            if entry is not None:
+                expires_at, score = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._score_cache.move_to_end(key)
+                    self._cache_hits += 1
+                    return score
+                del self._score_cache[key]
+
+            self._cache_misses += 1
+            return None
+
+    def _set_cached_score(self, key: tuple[str, str], score: float) -> None:
+        expires_at = (
+            time.monotonic() + self.cache_ttl_seconds
+            if self.cache_ttl_seconds
+            else None
+        )
+        with self._cache_lock:
+            self._score_cache[key] = (expires_at, score)
+            self._score_cache.move_to_end(key)
+            while len(self._score_cache) > self.cache_size:
+                self._score_cache.popitem(last=False)
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """
+        Get hit/miss counters for the rerank score cache.
+
+        Returns:
+            Dict with hits, misses, current size and the hit rate
+        """
+        with self._cache_lock:
+            lookups = self._cache_hits + self._cache_misses
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "size": len(self._score_cache),
+                "hit_rate": self._cache_hits / lookups if lookups else 0.0,
+            }
+
     @staticmethod
     def get_reranker_instance() -> Optional["RerankerService"]:
         """
-        Get a reranker service instance from the global configuration.
+        Get the shared reranker service from the global configuration.
 
         Returns:
-            Optional[RerankerService]: A reranker service instance if configured, None otherwise
+            Optional[RerankerService]: The reranker service if configured, None otherwise
         """
         from app.config import config
 
         if hasattr(config, "reranker_instance") and config.reranker_instance:
-            return RerankerService(config.reranker_instance)
+            return config.reranker_service
         return None
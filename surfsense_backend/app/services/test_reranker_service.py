@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Since test_reranker_service.py is in the same directory as reranker_service.py
+from .reranker_service import RerankerService
+
+
+class FakePointwiseReranker:
+    """Scores a document by the number of query words it contains."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def rank(self, query, docs):
+        with self._lock:
+            self.calls.append((query, [doc.text for doc in docs]))
+        words = set(query.split())
+        scored = sorted(
+            ((doc, float(len(words & set(doc.text.split())))) for doc in docs),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        return SimpleNamespace(
+            results=[
+                SimpleNamespace(document=doc, score=score, rank=rank)
+                for rank, (doc, score) in enumerate(scored, start=1)
+            ]
+        )
+
+
+def make_documents(texts):
+    return [
+        {
+            "chunk_id": index,
+            "content": text,
+            "score": 0.0,
+            "document": {"id": index, "title": text},
+        }
+        for index, text in enumerate(texts)
+    ]
+
+
+class TestRerankerServiceMicroBatching(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_requests_share_one_batch(self):
+        reranker = FakePointwiseReranker()
+        service = RerankerService(reranker, batch_size=64, batch_window_ms=50)
+        documents = make_documents(
+            ["alpha beta", "beta gamma", "gamma delta", "delta alpha"]
+        )
+
+        with patch.object(
+            service, "_rank_batch", wraps=service._rank_batch
+        ) as rank_batch:
+            results = await asyncio.gather(
+                service.rerank_documents("alpha", documents),
+                service.rerank_documents("gamma", documents),
+                service.rerank_documents("alpha delta", documents[:2]),
+            )
+
+        # One worker call ranked each distinct query once
+        rank_batch.assert_called_once()
+        self.assertEqual(len(rank_batch.call_args.args[0]), 3)
+        self.assertCountEqual(
+            [query for query, _ in reranker.calls], ["alpha", "gamma", "alpha delta"]
+        )
+
+        alpha, gamma, alpha_delta = results
+        self.assertEqual(
+            [doc["content"] for doc in alpha[:2]], ["alpha beta", "delta alpha"]
+        )
+        self.assertEqual([doc["score"] for doc in alpha], [1.0, 1.0, 0.0, 0.0])
+        self.assertEqual(
+            [doc["content"] for doc in gamma[:2]], ["beta gamma", "gamma delta"]
+        )
+        self.assertEqual(
+            [(doc["content"], doc["rank"]) for doc in alpha_delta],
+            [("alpha beta", 1), ("beta gamma", 2)],
+        )
+
+    async def test_same_query_requests_are_ranked_together(self):
+        reranker = FakePointwiseReranker()
+        service = RerankerService(reranker, batch_size=64, batch_window_ms=50)
+
+        await asyncio.gather(
+            service.rerank_documents("alpha", make_documents(["alpha", "beta"])),
+            service.rerank_documents("alpha", make_documents(["beta", "gamma"])),
+        )
+
+        self.assertEqual(reranker.calls, [("alpha", ["alpha", "beta", "gamma"])])
+
+    async def test_full_batch_is_scored_without_waiting(self):
+        reranker = FakePointwiseReranker()
+        service = RerankerService(reranker, batch_size=4, batch_window_ms=60_000)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                service.rerank_documents("alpha", make_documents(["a", "b"])),
+                service.rerank_documents("beta", make_documents(["c", "d"])),
+            ),
+            timeout=5,
+        )
+
+        self.assertEqual([len(result) for result in results], [2, 2])
+
+    async def test_large_request_is_split_and_merged(self):
+        reranker = FakePointwiseReranker()
+        service = RerankerService(
+            reranker, max_workers=2, batch_size=2, batch_window_ms=50
+        )
+        documents = make_documents(["x", "alpha", "y", "alpha alpha", "z"])
+
+        results = await service.rerank_documents("alpha", documents)
+
+        self.assertEqual(len(reranker.calls), 3)
+        self.assertEqual([doc["rank"] for doc in results], [1, 2, 3, 4, 5])
+        self.assertEqual(
+            {doc["content"] for doc in results[:2]}, {"alpha", "alpha alpha"}
+        )
+
+    async def test_batch_error_falls_back_to_original_order(self):
+        class FailingReranker:
+            def rank(self, query, docs):
+                raise RuntimeError("model failed")
+
+        service = RerankerService(FailingReranker(), batch_size=64, batch_window_ms=1)
+        documents = make_documents(["beta", "alpha"])
+
+        with self.assertLogs(level="ERROR"):
+            results = await service.rerank_documents("alpha", documents)
+
+        self.assertEqual(results, documents)
+
+
+if __name__ == "__main__":
+    unittest.main()
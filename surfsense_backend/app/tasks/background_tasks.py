@@ -12,15 +12,17 @@ from sqlalchemy.future import select
 from youtube_transcript_api import YouTubeTranscriptApi
 
 from app.config import config
-from app.db import Chunk, Document, DocumentType
+from app.db import Document, DocumentType, Log
 from app.prompts import SUMMARY_PROMPT_TEMPLATE
 from app.schemas import ExtensionDocumentContent
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
     convert_document_to_markdown,
+    create_document_chunks,
     generate_content_hash,
 )
+from app.utils.document_persistence import create_document
 
 md = MarkdownifyTransformer()
 
@@ -170,7 +172,7 @@ async def add_crawled_url_document(
             {"document": combined_document_string}
         )
         summary_content = summary_result.content
-        summary_embedding = config.embedding_model_instance.embed(summary_content)
+        summary_embedding = await config.embedding_service.embed_text(summary_content)
 
         # Process chunks
         await task_logger.log_task_progress(
@@ -179,13 +181,7 @@ async def add_crawled_url_document(
             {"stage": "chunk_processing"},
         )
 
-        chunks = [
-            Chunk(
-                content=chunk.text,
-                embedding=config.embedding_model_instance.embed(chunk.text),
-            )
-            for chunk in config.chunker_instance.chunk(content_in_markdown)
-        ]
+        chunks = await create_document_chunks(content_in_markdown)
 
         # Create and store document
         await task_logger.log_task_progress(
@@ -194,7 +190,9 @@ async def add_crawled_url_document(
             {"stage": "document_creation", "chunks_count": len(chunks)},
         )
 
-        document = Document(
+        document = await create_document(
+            session,
+            chunks,
             search_space_id=search_space_id,
             title=url_crawled[0].metadata["title"]
             if isinstance(crawl_loader, FireCrawlLoader)
@@ -203,11 +201,8 @@ async def add_crawled_url_document(
             document_metadata=url_crawled[0].metadata,
             content=summary_content,
             embedding=summary_embedding,
-            chunks=chunks,
             content_hash=content_hash,
         )
-
-        session.add(document)
         await session.commit()
         await session.refresh(document)
 
@@ -341,30 +336,23 @@ async def add_extension_received_document(
             {"document": combined_document_string}
         )
         summary_content = summary_result.content
-        summary_embedding = config.embedding_model_instance.embed(summary_content)
+        summary_embedding = await config.embedding_service.embed_text(summary_content)
 
         # Process chunks
-        chunks = [
-            Chunk(
-                content=chunk.text,
-                embedding=config.embedding_model_instance.embed(chunk.text),
-            )
-            for chunk in config.chunker_instance.chunk(content.pageContent)
-        ]
+        chunks = await create_document_chunks(content.pageContent)
 
         # Create and store document
-        document = Document(
+        document = await create_document(
+            session,
+            chunks,
             search_space_id=search_space_id,
             title=content.metadata.VisitedWebPageTitle,
             document_type=DocumentType.EXTENSION,
             document_metadata=content.metadata.model_dump(),
             content=summary_content,
             embedding=summary_embedding,
-            chunks=chunks,
             content_hash=content_hash,
         )
-
-        session.add(document)
         await session.commit()
         await session.refresh(document)
 
@@ -454,19 +442,15 @@ async def add_received_markdown_file_document(
         summary_chain = SUMMARY_PROMPT_TEMPLATE | user_llm
         summary_result = await summary_chain.ainvoke({"document": file_in_markdown})
         summary_content = summary_result.content
-        summary_embedding = config.embedding_model_instance.embed(summary_content)
+        summary_embedding = await config.embedding_service.embed_text(summary_content)
 
         # Process chunks
-        chunks = [
-            Chunk(
-                content=chunk.text,
-                embedding=config.embedding_model_instance.embed(chunk.text),
-            )
-            for chunk in config.chunker_instance.chunk(file_in_markdown)
-        ]
+        chunks = await create_document_chunks(file_in_markdown)
 
         # Create and store document
-        document = Document(
+        document = await create_document(
+            session,
+            chunks,
             search_space_id=search_space_id,
             title=file_name,
             document_type=DocumentType.FILE,
@@ -475,11 +459,8 @@ async def add_received_markdown_file_document(
             },
             content=summary_content,
             embedding=summary_embedding,
-            chunks=chunks,
             content_hash=content_hash,
         )
-
-        session.add(document)
         await session.commit()
         await session.refresh(document)
 
@@ -553,19 +534,15 @@ async def add_received_file_document_using_unstructured(
         summary_chain = SUMMARY_PROMPT_TEMPLATE | user_llm
         summary_result = await summary_chain.ainvoke({"document": file_in_markdown})
         summary_content = summary_result.content
-        summary_embedding = config.embedding_model_instance.embed(summary_content)
+        summary_embedding = await config.embedding_service.embed_text(summary_content)
 
         # Process chunks
-        chunks = [
-            Chunk(
-                content=chunk.text,
-                embedding=config.embedding_model_instance.embed(chunk.text),
-            )
-            for chunk in config.chunker_instance.chunk(file_in_markdown)
-        ]
+        chunks = await create_document_chunks(file_in_markdown)
 
         # Create and store document
-        document = Document(
+        document = await create_document(
+            session,
+            chunks,
             search_space_id=search_space_id,
             title=file_name,
             document_type=DocumentType.FILE,
@@ -575,11 +552,8 @@ async def add_received_file_document_using_unstructured(
             },
             content=summary_content,
             embedding=summary_embedding,
-            chunks=chunks,
             content_hash=content_hash,
         )
-
-        session.add(document)
         await session.commit()
         await session.refresh(document)
 
@@ -638,19 +612,15 @@ async def add_received_file_document_using_llamacloud(
         summary_chain = SUMMARY_PROMPT_TEMPLATE | user_llm
         summary_result = await summary_chain.ainvoke({"document": file_in_markdown})
         summary_content = summary_result.content
-        summary_embedding = config.embedding_model_instance.embed(summary_content)
+        summary_embedding = await config.embedding_service.embed_text(summary_content)
 
         # Process chunks
-        chunks = [
-            Chunk(
-                content=chunk.text,
-                embedding=config.embedding_model_instance.embed(chunk.text),
-            )
-            for chunk in config.chunker_instance.chunk(file_in_markdown)
-        ]
+        chunks = await create_document_chunks(file_in_markdown)
 
         # Create and store document
-        document = Document(
+        document = await create_document(
+            session,
+            chunks,
             search_space_id=search_space_id,
             title=file_name,
             document_type=DocumentType.FILE,
@@ -660,11 +630,8 @@ async def add_received_file_document_using_llamacloud(
             },
             content=summary_content,
             embedding=summary_embedding,
-            chunks=chunks,
             content_hash=content_hash,
         )
-
-        session.add(document)
         await session.commit()
         await session.refresh(document)
 
@@ -685,6 +652,8 @@ async def add_received_file_document_using_docling(
     docling_markdown_document: str,
     search_space_id: int,
     user_id: str,
+    task_logger: TaskLoggingService | None = None,
+    log_entry: Log | None = None,
 ) -> Document | None:
     """
     Process and store document content parsed by Docling.
@@ -695,6 +664,8 @@ async def add_received_file_document_using_docling(
         docling_markdown_document: Markdown content from Docling parsing
         search_space_id: ID of the search space
         user_id: ID of the user
+        task_logger: Task logger to report summarization progress to
+        log_entry: Log entry of the processing task
 
     Returns:
         Document object if successful, None if failed
@@ -726,22 +697,25 @@ async def add_received_file_document_using_docling(
 
         docling_service = create_docling_service()
 
+        async def log_summary_progress(message: str, metadata: dict) -> None:
+            if task_logger and log_entry:
+                await task_logger.log_task_progress(log_entry, message, metadata)
+
         summary_content = await docling_service.process_large_document_summary(
-            content=file_in_markdown, llm=user_llm, document_title=file_name
+            content=file_in_markdown,
+            llm=user_llm,
+            document_title=file_name,
+            on_progress=log_summary_progress,
         )
-        summary_embedding = config.embedding_model_instance.embed(summary_content)
+        summary_embedding = await config.embedding_service.embed_text(summary_content)
 
         # Process chunks
-        chunks = [
-            Chunk(
-                content=chunk.text,
-                embedding=config.embedding_model_instance.embed(chunk.text),
-            )
-            for chunk in config.chunker_instance.chunk(file_in_markdown)
-        ]
+        chunks = await create_document_chunks(file_in_markdown)
 
         # Create and store document
-        document = Document(
+        document = await create_document(
+            session,
+            chunks,
             search_space_id=search_space_id,
             title=file_name,
             document_type=DocumentType.FILE,
@@ -751,11 +725,8 @@ async def add_received_file_document_using_docling(
             },
             content=summary_content,
             embedding=summary_embedding,
-            chunks=chunks,
             content_hash=content_hash,
         )
-
-        session.add(document)
         await session.commit()
         await session.refresh(document)
 
@@ -989,7 +960,7 @@ async def add_youtube_video_document(
             {"document": combined_document_string}
         )
         summary_content = summary_result.content
-        summary_embedding = config.embedding_model_instance.embed(summary_content)
+        summary_embedding = await config.embedding_service.embed_text(summary_content)
 
         # Process chunks
         await task_logger.log_task_progress(
@@ -998,13 +969,7 @@ async def add_youtube_video_document(
             {"stage": "chunk_processing"},
         )
 
-        chunks = [
-            Chunk(
-                content=chunk.text,
-                embedding=config.embedding_model_instance.embed(chunk.text),
-            )
-            for chunk in config.chunker_instance.chunk(combined_document_string)
-        ]
+        chunks = await create_document_chunks(combined_document_string)
 
         # Create document
         await task_logger.log_task_progress(
@@ -1013,7 +978,9 @@ async def add_youtube_video_document(
             {"stage": "document_creation", "chunks_count": len(chunks)},
         )
 
-        document = Document(
+        document = await create_document(
+            session,
+            chunks,
             title=video_data.get("title", "YouTube Video"),
             document_type=DocumentType.YOUTUBE_VIDEO,
             document_metadata={
@@ -1025,12 +992,9 @@ async def add_youtube_video_document(
             },
             content=summary_content,
             embedding=summary_embedding,
-            chunks=chunks,
             search_space_id=search_space_id,
             content_hash=content_hash,
         )
-
-        session.add(document)
         await session.commit()
         await session.refresh(document)
 
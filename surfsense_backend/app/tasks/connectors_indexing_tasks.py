@@ -16,21 +16,56 @@ from app.connectors.linear_connector import LinearConnector
 from app.connectors.notion_history import NotionHistoryConnector
 from app.connectors.slack_history import SlackHistory
 from app.db import (
-    Chunk,
-    Document,
     DocumentType,
     SearchSourceConnector,
     SearchSourceConnectorType,
 )
-from app.prompts import SUMMARY_PROMPT_TEMPLATE
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
+from app.utils.connector_sync_state import ConnectorSyncState
 from app.utils.document_converters import generate_content_hash
+from app.utils.indexing_pipeline import DocumentWork, IndexingStats, index_documents
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
+def _message_cursor(version: str | None) -> str | None:
+    """
+    Channel cursor (the Slack ts or Discord ID of the last indexed message)
+    from a channel's sync version, ignoring versions from before channels
+    had cursors.
+    """
+    if version and version.replace(".", "", 1).isdigit():
+        return version
+    return None
+
+
+def _linear_issue_version(issue: dict) -> str | None:
+    """Sync version of a Linear issue from its and its comments' updatedAt."""
+    if not issue.get("updatedAt"):
+        return None
+    comments = (issue.get("comments") or {}).get("nodes", [])
+    latest_comment = max(
+        (comment.get("updatedAt") or "" for comment in comments), default=""
+    )
+    return f"{issue['updatedAt']}|{len(comments)}|{latest_comment}"
+
+
+def _confluence_page_version(page: dict) -> str | None:
+    """Sync version of a Confluence page from its and its comments' versions."""
+    page_version = (page.get("version") or {}).get("number")
+    if page_version is None:
+        return None
+    comments = page.get("comments", [])
+    # Editing a comment creates a new version of it, created at the edit time
+    latest_comment = max(
+        ((comment.get("version") or {}).get("createdAt") or "" for comment in comments),
+        default="",
+    )
+    return f"{page_version}|{len(comments)}|{latest_comment}"
+
+
 async def index_slack_messages(
     session: AsyncSession,
     connector_id: int,
@@ -185,7 +220,7 @@ async def index_slack_messages(
 
         # Get all channels
         try:
-            channels = slack_client.get_all_channels()
+            channels = await slack_client.get_all_channels()
         except Exception as e:
             await task_logger.log_task_failure(
                 log_entry,
@@ -201,12 +236,10 @@ async def index_slack_messages(
                 f"No Slack channels found for connector {connector_id}",
                 {"channels_found": 0},
             )
-            return 0, "No Slack channels found"
+            return 0, None
 
         # Track the number of documents indexed
-        documents_indexed = 0
-        documents_skipped = 0
-        skipped_channels = []
+        stats = IndexingStats()
 
         await task_logger.log_task_progress(
             log_entry,
@@ -214,10 +247,17 @@ async def index_slack_messages(
             {"stage": "process_channels", "total_channels": len(channels)},
         )
 
-        # Process each channel
-        for (
-            channel_obj
-        ) in channels:  # Modified loop to iterate over list of channel objects
+        # Load per-item sync state so unchanged items can be skipped
+        sync_state = ConnectorSyncState(connector, search_space_id)
+        await sync_state.prune_missing_documents(session)
+
+        # Reuse the workspace user directory from a recent sync, if any
+        cached_user_directory = sync_state.get_cached(
+            "slack_user_directory", config.SLACK_USER_DIRECTORY_TTL_SECONDS
+        )
+        slack_client.user_directory = cached_user_directory
+
+        async def prepare_channel(channel_obj):
             channel_id = channel_obj["id"]
             channel_name = channel_obj["name"]
             is_private = channel_obj["is_private"]
@@ -225,44 +265,43 @@ async def index_slack_messages(
                 "is_member"
             ]  # This might be False for public channels too
 
-            try:
-                # If it's a private channel and the bot is not a member, skip.
-                # For public channels, if they are listed by conversations.list, the bot can typically read history.
-                # The `not_in_channel` error in get_conversation_history will be the ultimate gatekeeper if history is inaccessible.
-                if is_private and not is_member:
-                    logger.warning(
-                        f"Bot is not a member of private channel {channel_name} ({channel_id}). Skipping."
-                    )
-                    skipped_channels.append(
-                        f"{channel_name} (private, bot not a member)"
-                    )
-                    documents_skipped += 1
-                    continue
+            # If it's a private channel and the bot is not a member, skip.
+            # For public channels, if they are listed by conversations.list, the bot can typically read history.
+            # The `not_in_channel` error in get_conversation_history will be the ultimate gatekeeper if history is inaccessible.
+            if is_private and not is_member:
+                logger.warning(
+                    f"Bot is not a member of private channel {channel_name} ({channel_id}). Skipping."
+                )
+                stats.skip(f"{channel_name} (private, bot not a member)")
+                return None
 
-                # Get messages for this channel
+            try:
+                # Get messages for this channel; the client's per-tier rate
+                # limiters keep concurrent channel fetches within Slack's limits.
                 # The get_history_by_date_range now uses get_conversation_history,
                 # which handles 'not_in_channel' by returning [] and logging.
-                messages, error = slack_client.get_history_by_date_range(
+                # Only messages after the last one indexed from the channel
+                messages, error = await slack_client.get_history_by_date_range(
                     channel_id=channel_id,
                     start_date=start_date_str,
                     end_date=end_date_str,
                     limit=1000,  # Limit to 1000 messages per channel
+                    after_ts=_message_cursor(sync_state.get_version(channel_id)),
                 )
 
                 if error:
                     logger.warning(
                         f"Error getting messages from channel {channel_name}: {error}"
                     )
-                    skipped_channels.append(f"{channel_name} (error: {error})")
-                    documents_skipped += 1
-                    continue  # Skip this channel if there's an error
+                    stats.skip(f"{channel_name} (error: {error})")
+                    return None  # Skip this channel if there's an error
 
                 if not messages:
                     logger.info(
                         f"No messages found in channel {channel_name} for the specified date range."
                     )
-                    documents_skipped += 1
-                    continue  # Skip if no messages
+                    stats.skip()
+                    return None  # Skip if no messages
 
                 # Format messages with user info
                 formatted_messages = []
@@ -275,111 +314,84 @@ async def index_slack_messages(
                     ]:
                         continue
 
-                    formatted_msg = slack_client.format_message(
+                    formatted_msg = await slack_client.format_message(
                         msg, include_user_info=True
                     )
                     formatted_messages.append(formatted_msg)
-
-                if not formatted_messages:
-                    logger.info(
-                        f"No valid messages found in channel {channel_name} after filtering."
-                    )
-                    documents_skipped += 1
-                    continue  # Skip if no valid messages after filtering
-
-                # Convert messages to markdown format
-                channel_content = f"# Slack Channel: {channel_name}\n\n"
-
-                for msg in formatted_messages:
-                    user_name = msg.get("user_name", "Unknown User")
-                    timestamp = msg.get("datetime", "Unknown Time")
-                    text = msg.get("text", "")
-
-                    channel_content += (
-                        f"## {user_name} ({timestamp})\n\n{text}\n\n---\n\n"
-                    )
-
-                # Format document metadata
-                metadata_sections = [
-                    (
-                        "METADATA",
-                        [
-                            f"CHANNEL_NAME: {channel_name}",
-                            f"CHANNEL_ID: {channel_id}",
-                            # f"START_DATE: {start_date_str}",
-                            # f"END_DATE: {end_date_str}",
-                            f"MESSAGE_COUNT: {len(formatted_messages)}",
-                        ],
-                    ),
-                    (
-                        "CONTENT",
-                        ["FORMAT: markdown", "TEXT_START", channel_content, "TEXT_END"],
-                    ),
-                ]
-
-                # Build the document string
-                document_parts = []
-                document_parts.append("<DOCUMENT>")
-
-                for section_title, section_content in metadata_sections:
-                    document_parts.append(f"<{section_title}>")
-                    document_parts.extend(section_content)
-                    document_parts.append(f"</{section_title}>")
-
-                document_parts.append("</DOCUMENT>")
-                combined_document_string = "\n".join(document_parts)
-                content_hash = generate_content_hash(
-                    combined_document_string, search_space_id
-                )
-
-                # Check if document with this content hash already exists
-                existing_doc_by_hash_result = await session.execute(
-                    select(Document).where(Document.content_hash == content_hash)
-                )
-                existing_document_by_hash = (
-                    existing_doc_by_hash_result.scalars().first()
+            except SlackApiError as slack_error:
+                logger.error(
+                    f"Slack API error for channel {channel_name}: {slack_error!s}"
                 )
+                stats.skip(f"{channel_name} (Slack API error)")
+                return None  # Skip this channel and continue with others
 
-                if existing_document_by_hash:
-                    logger.info(
-                        f"Document with content hash {content_hash} already exists for channel {channel_name}. Skipping processing."
-                    )
-                    documents_skipped += 1
-                    continue
-
-                # Get user's long context LLM
-                user_llm = await get_user_long_context_llm(session, user_id)
-                if not user_llm:
-                    logger.error(f"No long context LLM configured for user {user_id}")
-                    skipped_channels.append(f"{channel_name} (no LLM configured)")
-                    documents_skipped += 1
-                    continue
-
-                # Generate summary
-                summary_chain = SUMMARY_PROMPT_TEMPLATE | user_llm
-                summary_result = await summary_chain.ainvoke(
-                    {"document": combined_document_string}
-                )
-                summary_content = summary_result.content
-                summary_embedding = config.embedding_model_instance.embed(
-                    summary_content
+            if not formatted_messages:
+                logger.info(
+                    f"No valid messages found in channel {channel_name} after filtering."
                 )
+                stats.skip()
+                return None  # Skip if no valid messages after filtering
+
+            # Convert messages to markdown format
+            channel_content = f"# Slack Channel: {channel_name}\n\n"
+
+            for msg in formatted_messages:
+                user_name = msg.get("user_name", "Unknown User")
+                timestamp = msg.get("datetime", "Unknown Time")
+                text = msg.get("text", "")
+
+                channel_content += f"## {user_name} ({timestamp})\n\n{text}\n\n---\n\n"
+
+            # Format document metadata
+            metadata_sections = [
+                (
+                    "METADATA",
+                    [
+                        f"CHANNEL_NAME: {channel_name}",
+                        f"CHANNEL_ID: {channel_id}",
+                        # f"START_DATE: {start_date_str}",
+                        # f"END_DATE: {end_date_str}",
+                        f"MESSAGE_COUNT: {len(formatted_messages)}",
+                    ],
+                ),
+                (
+                    "CONTENT",
+                    ["FORMAT: markdown", "TEXT_START", channel_content, "TEXT_END"],
+                ),
+            ]
+
+            # Build the document string
+            document_parts = []
+            document_parts.append("<DOCUMENT>")
+
+            for section_title, section_content in metadata_sections:
+                document_parts.append(f"<{section_title}>")
+                document_parts.extend(section_content)
+                document_parts.append(f"</{section_title}>")
+
+            document_parts.append("</DOCUMENT>")
+            combined_document_string = "\n".join(document_parts)
+            content_hash = generate_content_hash(
+                combined_document_string, search_space_id
+            )
 
-                # Process chunks
-                chunks = [
-                    Chunk(
-                        content=chunk.text,
-                        embedding=config.embedding_model_instance.embed(chunk.text),
-                    )
-                    for chunk in config.chunker_instance.chunk(channel_content)
-                ]
-
-                # Create and store new document
-                document = Document(
-                    search_space_id=search_space_id,
-                    title=f"Slack - {channel_name}",
-                    document_type=DocumentType.SLACK_CONNECTOR,
-                    document_metadata={
+            # The ts of the newest message is the channel's cursor; the
+            # messages after it are indexed as a new document by the next sync
+            latest_ts = max((msg["ts"] for msg in messages), key=float)
+
+            return DocumentWork(
+                item_key=channel_id,
+                version=latest_ts,
+                new_document=True,
+                label=f"channel {channel_name}",
+                content_hash=content_hash,
+                chunk_content=channel_content,
+                summary_input=combined_document_string,
+                document_fields={
+                    "search_space_id": search_space_id,
+                    "title": f"Slack - {channel_name}",
+                    "document_type": DocumentType.SLACK_CONNECTOR,
+                    "document_metadata": {
                         "channel_name": channel_name,
                         "channel_id": channel_id,
                         "start_date": start_date_str,
@@ -387,30 +399,28 @@ async def index_slack_messages(
                         "message_count": len(formatted_messages),
                         "indexed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     },
-                    content=summary_content,
-                    embedding=summary_embedding,
-                    chunks=chunks,
-                    content_hash=content_hash,
-                )
+                },
+            )
 
-                session.add(document)
-                documents_indexed += 1
-                logger.info(
-                    f"Successfully indexed new channel {channel_name} with {len(formatted_messages)} messages"
-                )
-
-            except SlackApiError as slack_error:
-                logger.error(
-                    f"Slack API error for channel {channel_name}: {slack_error!s}"
-                )
-                skipped_channels.append(f"{channel_name} (Slack API error)")
-                documents_skipped += 1
-                continue  # Skip this channel and continue with others
-            except Exception as e:
-                logger.error(f"Error processing channel {channel_name}: {e!s}")
-                skipped_channels.append(f"{channel_name} (processing error)")
-                documents_skipped += 1
-                continue  # Skip this channel and continue with others
+        # Get user's long context LLM
+        user_llm = await get_user_long_context_llm(session, user_id)
+        if not user_llm:
+            logger.error(f"No long context LLM configured for user {user_id}")
+
+        # Fetch, summarize, embed and store the channels through the staged
+        # indexing pipeline
+        await index_documents(
+            session,
+            sync_state,
+            channels,
+            prepare_channel,
+            stats,
+            describe_item=lambda channel_obj: f"channel {channel_obj['name']}",
+            user_llm=user_llm,
+        )
+        documents_indexed = stats.indexed
+        documents_skipped = stats.skipped
+        skipped_channels = stats.skipped_items
 
         # Update the last_indexed_at timestamp for the connector only if requested
         # and if we successfully indexed at least one channel
@@ -418,6 +428,11 @@ async def index_slack_messages(
         if update_last_indexed and total_processed > 0:
             connector.last_indexed_at = datetime.now()
 
+        # Persist the per-item sync state with the indexed documents
+        if cached_user_directory is None and slack_client.user_directory:
+            sync_state.set_cached("slack_user_directory", slack_client.user_directory)
+        sync_state.save()
+
         # Commit all changes
         await session.commit()
 
@@ -444,7 +459,7 @@ async def index_slack_messages(
         logger.info(
             f"Slack indexing completed: {documents_indexed} new channels, {documents_skipped} skipped"
         )
-        return total_processed, result_message
+        return total_processed, None
 
     except SQLAlchemyError as db_error:
         await session.rollback()
@@ -552,7 +567,9 @@ async def index_notion_pages(
         )
 
         logger.info(f"Initializing Notion client for connector {connector_id}")
-        notion_client = NotionHistoryConnector(token=notion_token)
+        notion_client = NotionHistoryConnector(
+            token=notion_token, max_concurrency=config.CONNECTOR_MAX_CONCURRENCY
+        )
 
         # Calculate date range
         if start_date is None or end_date is None:
@@ -599,215 +616,186 @@ async def index_notion_pages(
             },
         )
 
-        # Get all pages
-        try:
-            pages = notion_client.get_all_pages(
-                start_date=start_date_iso, end_date=end_date_iso
-            )
-            logger.info(f"Found {len(pages)} Notion pages")
-        except Exception as e:
-            await task_logger.log_task_failure(
-                log_entry,
-                f"Failed to get Notion pages for connector {connector_id}",
-                str(e),
-                {"error_type": "PageFetchError"},
-            )
-            logger.error(f"Error fetching Notion pages: {e!s}", exc_info=True)
-            return 0, f"Failed to get Notion pages: {e!s}"
-
-        if not pages:
-            await task_logger.log_task_success(
-                log_entry,
-                f"No Notion pages found for connector {connector_id}",
-                {"pages_found": 0},
-            )
-            logger.info("No Notion pages found to index")
-            return 0, "No Notion pages found"
+        # Load per-item sync state so unchanged items can be skipped
+        sync_state = ConnectorSyncState(connector, search_space_id)
+        await sync_state.prune_missing_documents(session)
 
         # Track the number of documents indexed
-        documents_indexed = 0
-        documents_skipped = 0
-        skipped_pages = []
+        stats = IndexingStats()
+        pages_found = 0
 
         await task_logger.log_task_progress(
             log_entry,
-            f"Starting to process {len(pages)} Notion pages",
-            {"stage": "process_pages", "total_pages": len(pages)},
+            "Processing Notion pages as they are fetched",
+            {"stage": "process_pages"},
         )
 
-        # Process each page
-        for page in pages:
-            try:
-                page_id = page.get("page_id")
-                page_title = page.get("title", f"Untitled page ({page_id})")
-                page_content = page.get("content", [])
+        async def prepare_page(page):
+            nonlocal pages_found
+            pages_found += 1
 
-                logger.info(f"Processing Notion page: {page_title} ({page_id})")
+            page_id = page.get("page_id")
+            page_title = page.get("title", f"Untitled page ({page_id})")
+            page_content = page.get("content", [])
 
-                if not page_content:
-                    logger.info(f"No content found in page {page_title}. Skipping.")
-                    skipped_pages.append(f"{page_title} (no content)")
-                    documents_skipped += 1
-                    continue
-
-                # Convert page content to markdown format
-                markdown_content = f"# Notion Page: {page_title}\n\n"
-
-                # Process blocks recursively
-                def process_blocks(blocks, level=0):
-                    result = ""
-                    for block in blocks:
-                        block_type = block.get("type")
-                        block_content = block.get("content", "")
-                        children = block.get("children", [])
+            logger.info(f"Processing Notion page: {page_title} ({page_id})")
 
-                        # Add indentation based on level
-                        indent = "  " * level
-
-                        # Format based on block type
-                        if block_type in ["paragraph", "text"]:
-                            result += f"{indent}{block_content}\n\n"
-                        elif block_type in ["heading_1", "header"]:
-                            result += f"{indent}# {block_content}\n\n"
-                        elif block_type == "heading_2":
-                            result += f"{indent}## {block_content}\n\n"
-                        elif block_type == "heading_3":
-                            result += f"{indent}### {block_content}\n\n"
-                        elif block_type == "bulleted_list_item":
-                            result += f"{indent}* {block_content}\n"
-                        elif block_type == "numbered_list_item":
-                            result += f"{indent}1. {block_content}\n"
-                        elif block_type == "to_do":
-                            result += f"{indent}- [ ] {block_content}\n"
-                        elif block_type == "toggle":
-                            result += f"{indent}> {block_content}\n"
-                        elif block_type == "code":
-                            result += f"{indent}```\n{block_content}\n```\n\n"
-                        elif block_type == "quote":
-                            result += f"{indent}> {block_content}\n\n"
-                        elif block_type == "callout":
-                            result += f"{indent}> **Note:** {block_content}\n\n"
-                        elif block_type == "image":
-                            result += f"{indent}![Image]({block_content})\n\n"
-                        else:
-                            # Default for other block types
-                            if block_content:
-                                result += f"{indent}{block_content}\n\n"
-
-                        # Process children recursively
-                        if children:
-                            result += process_blocks(children, level + 1)
-
-                    return result
-
-                logger.debug(
-                    f"Converting {len(page_content)} blocks to markdown for page {page_title}"
-                )
-                markdown_content += process_blocks(page_content)
-
-                # Format document metadata
-                metadata_sections = [
-                    ("METADATA", [f"PAGE_TITLE: {page_title}", f"PAGE_ID: {page_id}"]),
-                    (
-                        "CONTENT",
-                        [
-                            "FORMAT: markdown",
-                            "TEXT_START",
-                            markdown_content,
-                            "TEXT_END",
-                        ],
-                    ),
-                ]
-
-                # Build the document string
-                document_parts = []
-                document_parts.append("<DOCUMENT>")
-
-                for section_title, section_content in metadata_sections:
-                    document_parts.append(f"<{section_title}>")
-                    document_parts.extend(section_content)
-                    document_parts.append(f"</{section_title}>")
-
-                document_parts.append("</DOCUMENT>")
-                combined_document_string = "\n".join(document_parts)
-                content_hash = generate_content_hash(
-                    combined_document_string, search_space_id
-                )
-
-                # Check if document with this content hash already exists
-                existing_doc_by_hash_result = await session.execute(
-                    select(Document).where(Document.content_hash == content_hash)
-                )
-                existing_document_by_hash = (
-                    existing_doc_by_hash_result.scalars().first()
+            # Skip pages not edited since the last sync
+            if sync_state.is_unchanged(page_id, page.get("last_edited_time")):
+                logger.info(
+                    f"Notion page {page_title} is unchanged since the last sync. Skipping."
                 )
+                stats.skip()
+                return None
+
+            if not page_content:
+                logger.info(f"No content found in page {page_title}. Skipping.")
+                stats.skip(f"{page_title} (no content)")
+                return None
+
+            # Convert page content to markdown format
+            markdown_content = f"# Notion Page: {page_title}\n\n"
+
+            # Process blocks recursively
+            def process_blocks(blocks, level=0):
+                result = ""
+                for block in blocks:
+                    block_type = block.get("type")
+                    block_content = block.get("content", "")
+                    children = block.get("children", [])
+
+                    # Add indentation based on level
+                    indent = "  " * level
+
+                    # Format based on block type
+                    if block_type in ["paragraph", "text"]:
+                        result += f"{indent}{block_content}\n\n"
+                    elif block_type in ["heading_1", "header"]:
+                        result += f"{indent}# {block_content}\n\n"
+                    elif block_type == "heading_2":
+                        result += f"{indent}## {block_content}\n\n"
+                    elif block_type == "heading_3":
+                        result += f"{indent}### {block_content}\n\n"
+                    elif block_type == "bulleted_list_item":
+                        result += f"{indent}* {block_content}\n"
+                    elif block_type == "numbered_list_item":
+                        result += f"{indent}1. {block_content}\n"
+                    elif block_type == "to_do":
+                        result += f"{indent}- [ ] {block_content}\n"
+                    elif block_type == "toggle":
+                        result += f"{indent}> {block_content}\n"
+                    elif block_type == "code":
+                        result += f"{indent}```\n{block_content}\n```\n\n"
+                    elif block_type == "quote":
+                        result += f"{indent}> {block_content}\n\n"
+                    elif block_type == "callout":
+                        result += f"{indent}> **Note:** {block_content}\n\n"
+                    elif block_type == "image":
+                        result += f"{indent}![Image]({block_content})\n\n"
+                    else:
+                        # Default for other block types
+                        if block_content:
+                            result += f"{indent}{block_content}\n\n"
 
-                if existing_document_by_hash:
-                    logger.info(
-                        f"Document with content hash {content_hash} already exists for page {page_title}. Skipping processing."
-                    )
-                    documents_skipped += 1
-                    continue
+                    # Process children recursively
+                    if children:
+                        result += process_blocks(children, level + 1)
 
-                # Get user's long context LLM
-                user_llm = await get_user_long_context_llm(session, user_id)
-                if not user_llm:
-                    logger.error(f"No long context LLM configured for user {user_id}")
-                    skipped_pages.append(f"{page_title} (no LLM configured)")
-                    documents_skipped += 1
-                    continue
+                return result
 
-                # Generate summary
-                logger.debug(f"Generating summary for page {page_title}")
-                summary_chain = SUMMARY_PROMPT_TEMPLATE | user_llm
-                summary_result = await summary_chain.ainvoke(
-                    {"document": combined_document_string}
-                )
-                summary_content = summary_result.content
-                summary_embedding = config.embedding_model_instance.embed(
-                    summary_content
-                )
+            logger.debug(
+                f"Converting {len(page_content)} blocks to markdown for page {page_title}"
+            )
+            markdown_content += process_blocks(page_content)
+
+            # Format document metadata
+            metadata_sections = [
+                (
+                    "METADATA",
+                    [f"PAGE_TITLE: {page_title}", f"PAGE_ID: {page_id}"],
+                ),
+                (
+                    "CONTENT",
+                    [
+                        "FORMAT: markdown",
+                        "TEXT_START",
+                        markdown_content,
+                        "TEXT_END",
+                    ],
+                ),
+            ]
+
+            # Build the document string
+            document_parts = []
+            document_parts.append("<DOCUMENT>")
+
+            for section_title, section_content in metadata_sections:
+                document_parts.append(f"<{section_title}>")
+                document_parts.extend(section_content)
+                document_parts.append(f"</{section_title}>")
+
+            document_parts.append("</DOCUMENT>")
+            combined_document_string = "\n".join(document_parts)
+            content_hash = generate_content_hash(
+                combined_document_string, search_space_id
+            )
 
-                # Process chunks
-                logger.debug(f"Chunking content for page {page_title}")
-                chunks = [
-                    Chunk(
-                        content=chunk.text,
-                        embedding=config.embedding_model_instance.embed(chunk.text),
-                    )
-                    for chunk in config.chunker_instance.chunk(markdown_content)
-                ]
-
-                # Create and store new document
-                document = Document(
-                    search_space_id=search_space_id,
-                    title=f"Notion - {page_title}",
-                    document_type=DocumentType.NOTION_CONNECTOR,
-                    document_metadata={
+            return DocumentWork(
+                item_key=page_id,
+                version=page.get("last_edited_time"),
+                label=f"Notion page: {page_title}",
+                content_hash=content_hash,
+                chunk_content=markdown_content,
+                summary_input=combined_document_string,
+                document_fields={
+                    "search_space_id": search_space_id,
+                    "title": f"Notion - {page_title}",
+                    "document_type": DocumentType.NOTION_CONNECTOR,
+                    "document_metadata": {
                         "page_title": page_title,
                         "page_id": page_id,
                         "indexed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     },
-                    content=summary_content,
-                    content_hash=content_hash,
-                    embedding=summary_embedding,
-                    chunks=chunks,
-                )
+                },
+            )
 
-                session.add(document)
-                documents_indexed += 1
-                logger.info(f"Successfully indexed new Notion page: {page_title}")
+        # Get user's long context LLM
+        user_llm = await get_user_long_context_llm(session, user_id)
+        if not user_llm:
+            logger.error(f"No long context LLM configured for user {user_id}")
 
-            except Exception as e:
-                logger.error(
-                    f"Error processing Notion page {page.get('title', 'Unknown')}: {e!s}",
-                    exc_info=True,
-                )
-                skipped_pages.append(
-                    f"{page.get('title', 'Unknown')} (processing error)"
-                )
-                documents_skipped += 1
-                continue  # Skip this page and continue with others
+        # Process each page as soon as its content has been fetched: pages are
+        # streamed from Notion into the staged indexing pipeline
+        try:
+            await index_documents(
+                session,
+                sync_state,
+                notion_client.iter_pages(
+                    start_date=start_date_iso,
+                    end_date=end_date_iso,
+                    skip_unchanged=sync_state.is_unchanged,
+                ),
+                prepare_page,
+                stats,
+                describe_item=lambda page: page.get("title", "Unknown"),
+                user_llm=user_llm,
+            )
+        finally:
+            await notion_client.close()
+        documents_indexed = stats.indexed
+        documents_skipped = stats.skipped
+        skipped_pages = stats.skipped_items
+
+        if pages_found == 0:
+            await task_logger.log_task_success(
+                log_entry,
+                f"No Notion pages found for connector {connector_id}",
+                {"pages_found": 0},
+            )
+            logger.info("No Notion pages found to index")
+            return 0, None
+
+        logger.info(f"Found {pages_found} Notion pages")
 
         # Update the last_indexed_at timestamp for the connector only if requested
         # and if we successfully indexed at least one page
@@ -816,6 +804,9 @@ async def index_notion_pages(
             connector.last_indexed_at = datetime.now()
             logger.info(f"Updated last_indexed_at for connector {connector_id}")
 
+        # Persist the per-item sync state with the indexed documents
+        sync_state.save()
+
         # Commit all changes
         await session.commit()
 
@@ -842,7 +833,7 @@ async def index_notion_pages(
         logger.info(
             f"Notion indexing completed: {documents_indexed} new pages, {documents_skipped} skipped"
         )
-        return total_processed, result_message
+        return total_processed, None
 
     except SQLAlchemyError as db_error:
         await session.rollback()
@@ -971,7 +962,9 @@ async def index_github_repos(
         )
 
         try:
-            github_client = GitHubConnector(token=github_pat)
+            github_client = GitHubConnector(
+                token=github_pat, max_concurrency=config.CONNECTOR_MAX_CONCURRENCY
+            )
         except ValueError as e:
             await task_logger.log_task_failure(
                 log_entry,
@@ -1003,15 +996,31 @@ async def index_github_repos(
                 f"Date range requested: {start_date} to {end_date} (Note: GitHub indexing processes all files regardless of dates)"
             )
 
-        # 6. Iterate through selected repositories and index files
-        for repo_full_name in repo_full_names_to_index:
-            if not repo_full_name or not isinstance(repo_full_name, str):
-                logger.warning(f"Skipping invalid repository entry: {repo_full_name}")
-                continue
+        # Load per-item sync state so unchanged items can be skipped
+        sync_state = ConnectorSyncState(connector, search_space_id)
+        await sync_state.prune_missing_documents(session)
+
+        # 6. Iterate through selected repositories and list the changed files
+        async def iter_changed_files():
+            for repo_full_name in repo_full_names_to_index:
+                if not repo_full_name or not isinstance(repo_full_name, str):
+                    logger.warning(
+                        f"Skipping invalid repository entry: {repo_full_name}"
+                    )
+                    continue
+
+                logger.info(f"Processing repository: {repo_full_name}")
+                try:
+                    files_to_index = await asyncio.to_thread(
+                        github_client.get_repository_files, repo_full_name
+                    )
+                except Exception as repo_err:
+                    logger.error(
+                        f"Failed to process repository {repo_full_name}: {repo_err}"
+                    )
+                    errors.append(f"Failed processing {repo_full_name}: {repo_err}")
+                    continue
 
-            logger.info(f"Processing repository: {repo_full_name}")
-            try:
-                files_to_index = github_client.get_repository_files(repo_full_name)
                 if not files_to_index:
                     logger.info(
                         f"No indexable files found in repository: {repo_full_name}"
@@ -1022,76 +1031,73 @@ async def index_github_repos(
                     f"Found {len(files_to_index)} files to process in {repo_full_name}"
                 )
 
+                changed_files = 0
                 for file_info in files_to_index:
                     file_path = file_info.get("path")
-                    file_url = file_info.get("url")
-                    file_sha = file_info.get("sha")
-                    file_type = file_info.get("type")  # 'code' or 'doc'
                     full_path_key = f"{repo_full_name}/{file_path}"
 
-                    if not file_path or not file_url or not file_sha:
+                    if (
+                        not file_path
+                        or not file_info.get("url")
+                        or not file_info.get("sha")
+                    ):
                         logger.warning(
                             f"Skipping file with missing info in {repo_full_name}: {file_info}"
                         )
                         continue
 
-                    # Get file content
-                    file_content = github_client.get_file_content(
-                        repo_full_name, file_path
-                    )
-
-                    if file_content is None:
-                        logger.warning(
-                            f"Could not retrieve content for {full_path_key}. Skipping."
-                        )
-                        continue  # Skip if content fetch failed
-
-                    content_hash = generate_content_hash(file_content, search_space_id)
-
-                    # Check if document with this content hash already exists
-                    existing_doc_by_hash_result = await session.execute(
-                        select(Document).where(Document.content_hash == content_hash)
-                    )
-                    existing_document_by_hash = (
-                        existing_doc_by_hash_result.scalars().first()
-                    )
-
-                    if existing_document_by_hash:
-                        logger.info(
-                            f"Document with content hash {content_hash} already exists for file {full_path_key}. Skipping processing."
+                    # Skip files whose blob SHA is unchanged since the last sync
+                    if sync_state.is_unchanged(full_path_key, file_info["sha"]):
+                        logger.debug(
+                            f"File {full_path_key} is unchanged since the last sync. Skipping."
                         )
                         continue
 
-                    # Use file_content directly for chunking, maybe summary for main content?
-                    # For now, let's use the full content for both, might need refinement
-                    summary_content = f"GitHub file: {full_path_key}\n\n{file_content[:1000]}..."  # Simple summary
-                    summary_embedding = config.embedding_model_instance.embed(
-                        summary_content
-                    )
+                    changed_files += 1
+                    yield repo_full_name, file_info
 
-                    # Chunk the content
-                    try:
-                        chunks_data = [
-                            Chunk(
-                                content=chunk.text,
-                                embedding=config.embedding_model_instance.embed(
-                                    chunk.text
-                                ),
-                            )
-                            for chunk in config.code_chunker_instance.chunk(
-                                file_content
-                            )
-                        ]
-                    except Exception as chunk_err:
-                        logger.error(
-                            f"Failed to chunk file {full_path_key}: {chunk_err}"
-                        )
-                        errors.append(
-                            f"Chunking failed for {full_path_key}: {chunk_err}"
-                        )
-                        continue  # Skip this file if chunking fails
+                logger.info(
+                    f"{changed_files} of {len(files_to_index)} files in {repo_full_name} changed since the last sync"
+                )
 
-                    doc_metadata = {
+        async def prepare_file(repo_file):
+            repo_full_name, file_info = repo_file
+            file_path = file_info["path"]
+            file_url = file_info["url"]
+            file_sha = file_info["sha"]
+            file_type = file_info.get("type")  # 'code' or 'doc'
+            full_path_key = f"{repo_full_name}/{file_path}"
+
+            # Download the changed blob
+            file_contents = await github_client.get_file_contents(
+                repo_full_name, [file_info]
+            )
+            file_content = file_contents.get(file_path)
+
+            if file_content is None:
+                logger.warning(
+                    f"Could not retrieve content for {full_path_key}. Skipping."
+                )
+                return None  # Skip if content fetch failed
+
+            content_hash = generate_content_hash(file_content, search_space_id)
+
+            # Use file_content directly for chunking, maybe summary for main content?
+            # For now, let's use the full content for both, might need refinement
+            summary_content = f"GitHub file: {full_path_key}\n\n{file_content[:1000]}..."  # Simple summary
+
+            return DocumentWork(
+                item_key=full_path_key,
+                version=file_sha,
+                label=f"file {full_path_key}",
+                content_hash=content_hash,
+                chunk_content=file_content,
+                chunker=config.code_chunker_instance,
+                document_fields={
+                    "search_space_id": search_space_id,
+                    "title": f"GitHub - {file_path}",
+                    "document_type": DocumentType.GITHUB_CONNECTOR,
+                    "document_metadata": {
                         "repository_full_name": repo_full_name,
                         "file_path": file_path,
                         "full_path": full_path_key,  # For easier lookup
@@ -1099,28 +1105,29 @@ async def index_github_repos(
                         "sha": file_sha,
                         "type": file_type,
                         "indexed_at": datetime.now(UTC).isoformat(),
-                    }
-
-                    # Create new document
-                    logger.info(f"Creating new document for file: {full_path_key}")
-                    document = Document(
-                        title=f"GitHub - {file_path}",
-                        document_type=DocumentType.GITHUB_CONNECTOR,
-                        document_metadata=doc_metadata,
-                        content=summary_content,  # Store summary
-                        content_hash=content_hash,
-                        embedding=summary_embedding,
-                        search_space_id=search_space_id,
-                        chunks=chunks_data,  # Associate chunks directly
-                    )
-                    session.add(document)
-                    documents_processed += 1
+                    },
+                    "content": summary_content,  # Store summary
+                },
+            )
 
-            except Exception as repo_err:
-                logger.error(
-                    f"Failed to process repository {repo_full_name}: {repo_err}"
-                )
-                errors.append(f"Failed processing {repo_full_name}: {repo_err}")
+        # Download, embed and store the changed files through the staged
+        # indexing pipeline
+        stats = IndexingStats()
+        await index_documents(
+            session,
+            sync_state,
+            iter_changed_files(),
+            prepare_file,
+            stats,
+            describe_item=lambda repo_file: (
+                f"file {repo_file[0]}/{repo_file[1].get('path')}"
+            ),
+        )
+        documents_processed = stats.indexed
+        errors.extend(stats.errors)
+
+        # Persist the per-item sync state with the indexed documents
+        sync_state.save()
 
         # Commit all changes at the end
         await session.commit()
@@ -1167,8 +1174,16 @@ async def index_github_repos(
         errors.append(f"Unexpected error: {e}")
         return documents_processed, "; ".join(errors) if errors else str(e)
 
-    error_message = "; ".join(errors) if errors else None
-    return documents_processed, error_message
+    # Files or repositories that failed are skipped; they only fail the sync
+    # when nothing could be indexed
+    if errors and documents_processed == 0:
+        return 0, "; ".join(errors)
+    if errors:
+        logger.warning(
+            f"GitHub indexing for connector {connector_id} skipped {len(errors)} "
+            f"failed items: {'; '.join(errors)}"
+        )
+    return documents_processed, None
 
 
 async def index_linear_issues(
@@ -1315,7 +1330,7 @@ async def index_linear_issues(
 
         # Get issues within date range
         try:
-            issues, error = linear_client.get_issues_by_date_range(
+            issues, error = await linear_client.get_issues_by_date_range(
                 start_date=start_date_str, end_date=end_date_str, include_comments=True
             )
 
@@ -1363,9 +1378,7 @@ async def index_linear_issues(
             logger.info(f"  ...and {len(issues) - 10} more issues")
 
         # Track the number of documents indexed
-        documents_indexed = 0
-        documents_skipped = 0
-        skipped_issues = []
+        stats = IndexingStats()
 
         await task_logger.log_task_progress(
             log_entry,
@@ -1373,94 +1386,79 @@ async def index_linear_issues(
             {"stage": "process_issues", "total_issues": len(issues)},
         )
 
-        # Process each issue
-        for issue in issues:
-            try:
-                issue_id = issue.get("key")
-                issue_identifier = issue.get("id", "")
-                issue_title = issue.get("key", "")
-
-                if not issue_id or not issue_title:
-                    logger.warning(
-                        f"Skipping issue with missing ID or title: {issue_id or 'Unknown'}"
-                    )
-                    skipped_issues.append(
-                        f"{issue_identifier or 'Unknown'} (missing data)"
-                    )
-                    documents_skipped += 1
-                    continue
-
-                # Format the issue first to get well-structured data
-                formatted_issue = linear_client.format_issue(issue)
-
-                # Convert issue to markdown format
-                issue_content = linear_client.format_issue_to_markdown(formatted_issue)
-
-                if not issue_content:
-                    logger.warning(
-                        f"Skipping issue with no content: {issue_identifier} - {issue_title}"
-                    )
-                    skipped_issues.append(f"{issue_identifier} (no content)")
-                    documents_skipped += 1
-                    continue
-
-                # Create a short summary for the embedding
-                # This avoids using the LLM and just uses the issue data directly
-                state = formatted_issue.get("state", "Unknown")
-                description = formatted_issue.get("description", "")
-                # Truncate description if it's too long for the summary
-                if description and len(description) > 500:
-                    description = description[:497] + "..."
-
-                # Create a simple summary from the issue data
-                summary_content = f"Linear Issue {issue_identifier}: {issue_title}\n\nStatus: {state}\n\n"
-                if description:
-                    summary_content += f"Description: {description}\n\n"
+        # Load per-item sync state so unchanged items can be skipped
+        sync_state = ConnectorSyncState(connector, search_space_id)
+        await sync_state.prune_missing_documents(session)
 
-                # Add comment count
-                comment_count = len(formatted_issue.get("comments", []))
-                summary_content += f"Comments: {comment_count}"
+        async def prepare_issue(issue):
+            issue_id = issue.get("key")
+            issue_identifier = issue.get("id", "")
+            issue_title = issue.get("key", "")
 
-                content_hash = generate_content_hash(issue_content, search_space_id)
-
-                # Check if document with this content hash already exists
-                existing_doc_by_hash_result = await session.execute(
-                    select(Document).where(Document.content_hash == content_hash)
+            if not issue_id or not issue_title:
+                logger.warning(
+                    f"Skipping issue with missing ID or title: {issue_id or 'Unknown'}"
                 )
-                existing_document_by_hash = (
-                    existing_doc_by_hash_result.scalars().first()
+                stats.skip(f"{issue_identifier or 'Unknown'} (missing data)")
+                return None
+
+            # Skip issues that are unchanged since the last sync before
+            # formatting them. Adding or editing a comment does not always
+            # update the issue's updatedAt, so the comments are part of the
+            # version.
+            version = _linear_issue_version(issue)
+            if sync_state.is_unchanged(issue_identifier, version):
+                logger.info(
+                    f"Issue {issue_identifier} is unchanged since the last sync. Skipping processing."
                 )
+                stats.skip()
+                return None
 
-                if existing_document_by_hash:
-                    logger.info(
-                        f"Document with content hash {content_hash} already exists for issue {issue_identifier}. Skipping processing."
-                    )
-                    documents_skipped += 1
-                    continue
-
-                # Generate embedding for the summary
-                summary_embedding = config.embedding_model_instance.embed(
-                    summary_content
-                )
+            # Format the issue first to get well-structured data
+            formatted_issue = linear_client.format_issue(issue)
 
-                # Process chunks - using the full issue content with comments
-                chunks = [
-                    Chunk(
-                        content=chunk.text,
-                        embedding=config.embedding_model_instance.embed(chunk.text),
-                    )
-                    for chunk in config.chunker_instance.chunk(issue_content)
-                ]
+            # Convert issue to markdown format
+            issue_content = linear_client.format_issue_to_markdown(formatted_issue)
 
-                # Create and store new document
-                logger.info(
-                    f"Creating new document for issue {issue_identifier} - {issue_title}"
+            if not issue_content:
+                logger.warning(
+                    f"Skipping issue with no content: {issue_identifier} - {issue_title}"
                 )
-                document = Document(
-                    search_space_id=search_space_id,
-                    title=f"Linear - {issue_identifier}: {issue_title}",
-                    document_type=DocumentType.LINEAR_CONNECTOR,
-                    document_metadata={
+                stats.skip(f"{issue_identifier} (no content)")
+                return None
+
+            # Create a short summary for the embedding
+            # This avoids using the LLM and just uses the issue data directly
+            state = formatted_issue.get("state", "Unknown")
+            description = formatted_issue.get("description", "")
+            # Truncate description if it's too long for the summary
+            if description and len(description) > 500:
+                description = description[:497] + "..."
+
+            # Create a simple summary from the issue data
+            summary_content = (
+                f"Linear Issue {issue_identifier}: {issue_title}\n\nStatus: {state}\n\n"
+            )
+            if description:
+                summary_content += f"Description: {description}\n\n"
+
+            # Add comment count
+            comment_count = len(formatted_issue.get("comments", []))
+            summary_content += f"Comments: {comment_count}"
+
+            content_hash = generate_content_hash(issue_content, search_space_id)
+
+            return DocumentWork(
+                item_key=issue_identifier,
+                version=version or content_hash,
+                label=f"issue {issue_identifier} - {issue_title}",
+                content_hash=content_hash,
+                chunk_content=issue_content,
+                document_fields={
+                    "search_space_id": search_space_id,
+                    "title": f"Linear - {issue_identifier}: {issue_title}",
+                    "document_type": DocumentType.LINEAR_CONNECTOR,
+                    "document_metadata": {
                         "issue_id": issue_id,
                         "issue_identifier": issue_identifier,
                         "issue_title": issue_title,
@@ -1468,28 +1466,22 @@ async def index_linear_issues(
                         "comment_count": comment_count,
                         "indexed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     },
-                    content=summary_content,
-                    content_hash=content_hash,
-                    embedding=summary_embedding,
-                    chunks=chunks,
-                )
-
-                session.add(document)
-                documents_indexed += 1
-                logger.info(
-                    f"Successfully indexed new issue {issue_identifier} - {issue_title}"
-                )
+                    "content": summary_content,
+                },
+            )
 
-            except Exception as e:
-                logger.error(
-                    f"Error processing issue {issue.get('identifier', 'Unknown')}: {e!s}",
-                    exc_info=True,
-                )
-                skipped_issues.append(
-                    f"{issue.get('identifier', 'Unknown')} (processing error)"
-                )
-                documents_skipped += 1
-                continue  # Skip this issue and continue with others
+        # Format, embed and store the issues through the staged indexing pipeline
+        await index_documents(
+            session,
+            sync_state,
+            issues,
+            prepare_issue,
+            stats,
+            describe_item=lambda issue: f"issue {issue.get('identifier', 'Unknown')}",
+        )
+        documents_indexed = stats.indexed
+        documents_skipped = stats.skipped
+        skipped_issues = stats.skipped_items
 
         # Update the last_indexed_at timestamp for the connector only if requested
         total_processed = documents_indexed
@@ -1497,6 +1489,9 @@ async def index_linear_issues(
             connector.last_indexed_at = datetime.now()
             logger.info(f"Updated last_indexed_at to {connector.last_indexed_at}")
 
+        # Persist the per-item sync state with the indexed documents
+        sync_state.save()
+
         # Commit all changes
         await session.commit()
         logger.info("Successfully committed all Linear document changes to database")
@@ -1682,9 +1677,7 @@ async def index_discord_messages(
             f"Indexing Discord messages from {start_date_iso} to {end_date_iso}"
         )
 
-        documents_indexed = 0
-        documents_skipped = 0
-        skipped_channels = []
+        stats = IndexingStats()
 
         try:
             await task_logger.log_task_progress(
@@ -1718,7 +1711,7 @@ async def index_discord_messages(
             )
             logger.info("No Discord guilds found to index")
             await discord_client.close_bot()
-            return 0, "No Discord guilds found"
+            return 0, None
 
         # Process each guild and channel
         await task_logger.log_task_progress(
@@ -1727,208 +1720,178 @@ async def index_discord_messages(
             {"stage": "process_guilds", "total_guilds": len(guilds)},
         )
 
-        for guild in guilds:
-            guild_id = guild["id"]
-            guild_name = guild["name"]
-            logger.info(f"Processing guild: {guild_name} ({guild_id})")
-            try:
-                channels = await discord_client.get_text_channels(guild_id)
+        # Load per-item sync state so unchanged items can be skipped
+        sync_state = ConnectorSyncState(connector, search_space_id)
+        await sync_state.prune_missing_documents(session)
+
+        async def iter_channels():
+            for guild in guilds:
+                guild_id = guild["id"]
+                guild_name = guild["name"]
+                logger.info(f"Processing guild: {guild_name} ({guild_id})")
+                try:
+                    channels = await discord_client.get_text_channels(guild_id)
+                except Exception as e:
+                    logger.error(
+                        f"Error processing guild {guild_name}: {e!s}", exc_info=True
+                    )
+                    stats.skip(f"{guild_name} (processing error)")
+                    continue
+
                 if not channels:
                     logger.info(f"No channels found in guild {guild_name}. Skipping.")
-                    skipped_channels.append(f"{guild_name} (no channels)")
-                    documents_skipped += 1
+                    stats.skip(f"{guild_name} (no channels)")
                     continue
 
                 for channel in channels:
-                    channel_id = channel["id"]
-                    channel_name = channel["name"]
-
-                    try:
-                        messages = await discord_client.get_channel_history(
-                            channel_id=channel_id,
-                            start_date=start_date_iso,
-                            end_date=end_date_iso,
-                        )
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to get messages for channel {channel_name}: {e!s}"
-                        )
-                        skipped_channels.append(
-                            f"{guild_name}#{channel_name} (fetch error)"
-                        )
-                        documents_skipped += 1
-                        continue
-
-                    if not messages:
-                        logger.info(
-                            f"No messages found in channel {channel_name} for the specified date range."
-                        )
-                        documents_skipped += 1
-                        continue
-
-                    # Format messages
-                    formatted_messages = []
-                    for msg in messages:
-                        # Skip system messages if needed (Discord has some types)
-                        if msg.get("type") in ["system"]:
-                            continue
-                        formatted_messages.append(msg)
-
-                    if not formatted_messages:
-                        logger.info(
-                            f"No valid messages found in channel {channel_name} after filtering."
-                        )
-                        documents_skipped += 1
-                        continue
-
-                    # Convert messages to markdown format
-                    channel_content = (
-                        f"# Discord Channel: {guild_name} / {channel_name}\n\n"
-                    )
-                    for msg in formatted_messages:
-                        user_name = msg.get("author_name", "Unknown User")
-                        timestamp = msg.get("created_at", "Unknown Time")
-                        text = msg.get("content", "")
-                        channel_content += (
-                            f"## {user_name} ({timestamp})\n\n{text}\n\n---\n\n"
-                        )
-
-                    # Format document metadata
-                    metadata_sections = [
-                        (
-                            "METADATA",
-                            [
-                                f"GUILD_NAME: {guild_name}",
-                                f"GUILD_ID: {guild_id}",
-                                f"CHANNEL_NAME: {channel_name}",
-                                f"CHANNEL_ID: {channel_id}",
-                                f"MESSAGE_COUNT: {len(formatted_messages)}",
-                            ],
-                        ),
-                        (
-                            "CONTENT",
-                            [
-                                "FORMAT: markdown",
-                                "TEXT_START",
-                                channel_content,
-                                "TEXT_END",
-                            ],
-                        ),
-                    ]
-
-                    # Build the document string
-                    document_parts = []
-                    document_parts.append("<DOCUMENT>")
-                    for section_title, section_content in metadata_sections:
-                        document_parts.append(f"<{section_title}>")
-                        document_parts.extend(section_content)
-                        document_parts.append(f"</{section_title}>")
-                    document_parts.append("</DOCUMENT>")
-                    combined_document_string = "\n".join(document_parts)
-                    content_hash = generate_content_hash(
-                        combined_document_string, search_space_id
-                    )
-
-                    # Check if document with this content hash already exists
-                    existing_doc_by_hash_result = await session.execute(
-                        select(Document).where(Document.content_hash == content_hash)
-                    )
-                    existing_document_by_hash = (
-                        existing_doc_by_hash_result.scalars().first()
-                    )
+                    yield guild, channel
 
-                    if existing_document_by_hash:
-                        logger.info(
-                            f"Document with content hash {content_hash} already exists for channel {guild_name}#{channel_name}. Skipping processing."
-                        )
-                        documents_skipped += 1
-                        continue
-
-                    # Get user's long context LLM
-                    user_llm = await get_user_long_context_llm(session, user_id)
-                    if not user_llm:
-                        logger.error(
-                            f"No long context LLM configured for user {user_id}"
-                        )
-                        skipped_channels.append(
-                            f"{guild_name}#{channel_name} (no LLM configured)"
-                        )
-                        documents_skipped += 1
-                        continue
-
-                    # Generate summary using summary_chain
-                    summary_chain = SUMMARY_PROMPT_TEMPLATE | user_llm
-                    summary_result = await summary_chain.ainvoke(
-                        {"document": combined_document_string}
-                    )
-                    summary_content = summary_result.content
-                    summary_embedding = await asyncio.to_thread(
-                        config.embedding_model_instance.embed, summary_content
-                    )
+        async def prepare_channel(guild_channel):
+            guild, channel = guild_channel
+            guild_id = guild["id"]
+            guild_name = guild["name"]
+            channel_id = channel["id"]
+            channel_name = channel["name"]
 
-                    # Process chunks
-                    raw_chunks = await asyncio.to_thread(
-                        config.chunker_instance.chunk, channel_content
-                    )
+            try:
+                # Only messages after the last one indexed from the channel
+                messages = await discord_client.get_channel_history(
+                    channel_id=channel_id,
+                    start_date=start_date_iso,
+                    end_date=end_date_iso,
+                    after_id=_message_cursor(sync_state.get_version(channel_id)),
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to get messages for channel {channel_name}: {e!s}"
+                )
+                stats.skip(f"{guild_name}#{channel_name} (fetch error)")
+                return None
 
-                    chunk_texts = [
-                        chunk.text for chunk in raw_chunks if chunk.text.strip()
-                    ]
-                    chunk_embeddings = await asyncio.to_thread(
-                        lambda texts: [
-                            config.embedding_model_instance.embed(t) for t in texts
-                        ],
-                        chunk_texts,
-                    )
+            if not messages:
+                logger.info(
+                    f"No messages found in channel {channel_name} for the specified date range."
+                )
+                stats.skip()
+                return None
+
+            # Format messages
+            formatted_messages = []
+            for msg in messages:
+                # Skip system messages if needed (Discord has some types)
+                if msg.get("type") in ["system"]:
+                    continue
+                formatted_messages.append(msg)
 
-                    chunks = [
-                        Chunk(content=raw_chunk.text, embedding=embedding)
-                        for raw_chunk, embedding in zip(
-                            raw_chunks, chunk_embeddings, strict=False
-                        )
-                    ]
-
-                    # Create and store new document
-                    document = Document(
-                        search_space_id=search_space_id,
-                        title=f"Discord - {guild_name}#{channel_name}",
-                        document_type=DocumentType.DISCORD_CONNECTOR,
-                        document_metadata={
-                            "guild_name": guild_name,
-                            "guild_id": guild_id,
-                            "channel_name": channel_name,
-                            "channel_id": channel_id,
-                            "message_count": len(formatted_messages),
-                            "start_date": start_date_iso,
-                            "end_date": end_date_iso,
-                            "indexed_at": datetime.now(UTC).strftime(
-                                "%Y-%m-%d %H:%M:%S"
-                            ),
-                        },
-                        content=summary_content,
-                        content_hash=content_hash,
-                        embedding=summary_embedding,
-                        chunks=chunks,
-                    )
+            if not formatted_messages:
+                logger.info(
+                    f"No valid messages found in channel {channel_name} after filtering."
+                )
+                stats.skip()
+                return None
+
+            # Convert messages to markdown format
+            channel_content = f"# Discord Channel: {guild_name} / {channel_name}\n\n"
+            for msg in formatted_messages:
+                user_name = msg.get("author_name", "Unknown User")
+                timestamp = msg.get("created_at", "Unknown Time")
+                text = msg.get("content", "")
+                channel_content += f"## {user_name} ({timestamp})\n\n{text}\n\n---\n\n"
+
+            # Format document metadata
+            metadata_sections = [
+                (
+                    "METADATA",
+                    [
+                        f"GUILD_NAME: {guild_name}",
+                        f"GUILD_ID: {guild_id}",
+                        f"CHANNEL_NAME: {channel_name}",
+                        f"CHANNEL_ID: {channel_id}",
+                        f"MESSAGE_COUNT: {len(formatted_messages)}",
+                    ],
+                ),
+                (
+                    "CONTENT",
+                    [
+                        "FORMAT: markdown",
+                        "TEXT_START",
+                        channel_content,
+                        "TEXT_END",
+                    ],
+                ),
+            ]
+
+            # Build the document string
+            document_parts = []
+            document_parts.append("<DOCUMENT>")
+            for section_title, section_content in metadata_sections:
+                document_parts.append(f"<{section_title}>")
+                document_parts.extend(section_content)
+                document_parts.append(f"</{section_title}>")
+            document_parts.append("</DOCUMENT>")
+            combined_document_string = "\n".join(document_parts)
+            content_hash = generate_content_hash(
+                combined_document_string, search_space_id
+            )
 
-                    session.add(document)
-                    documents_indexed += 1
-                    logger.info(
-                        f"Successfully indexed new channel {guild_name}#{channel_name} with {len(formatted_messages)} messages"
-                    )
+            # The ID of the newest message is the channel's cursor; the
+            # messages after it are indexed as a new document by the next sync
+            latest_id = max((msg["id"] for msg in messages), key=int)
+
+            return DocumentWork(
+                item_key=channel_id,
+                version=latest_id,
+                new_document=True,
+                label=f"channel {guild_name}#{channel_name}",
+                content_hash=content_hash,
+                chunk_content=channel_content,
+                summary_input=combined_document_string,
+                document_fields={
+                    "search_space_id": search_space_id,
+                    "title": f"Discord - {guild_name}#{channel_name}",
+                    "document_type": DocumentType.DISCORD_CONNECTOR,
+                    "document_metadata": {
+                        "guild_name": guild_name,
+                        "guild_id": guild_id,
+                        "channel_name": channel_name,
+                        "channel_id": channel_id,
+                        "message_count": len(formatted_messages),
+                        "start_date": start_date_iso,
+                        "end_date": end_date_iso,
+                        "indexed_at": datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S"),
+                    },
+                },
+            )
 
-            except Exception as e:
-                logger.error(
-                    f"Error processing guild {guild_name}: {e!s}", exc_info=True
-                )
-                skipped_channels.append(f"{guild_name} (processing error)")
-                documents_skipped += 1
-                continue
+        # Get user's long context LLM
+        user_llm = await get_user_long_context_llm(session, user_id)
+        if not user_llm:
+            logger.error(f"No long context LLM configured for user {user_id}")
+
+        # Fetch, summarize, embed and store the channels through the staged
+        # indexing pipeline
+        await index_documents(
+            session,
+            sync_state,
+            iter_channels(),
+            prepare_channel,
+            stats,
+            describe_item=lambda guild_channel: (
+                f"channel {guild_channel[0]['name']}#{guild_channel[1]['name']}"
+            ),
+            user_llm=user_llm,
+        )
+        documents_indexed = stats.indexed
+        documents_skipped = stats.skipped
+        skipped_channels = stats.skipped_items
 
         if update_last_indexed and documents_indexed > 0:
             connector.last_indexed_at = datetime.now(UTC)
             logger.info(f"Updated last_indexed_at to {connector.last_indexed_at}")
 
+        # Persist the per-item sync state with the indexed documents
+        sync_state.save()
+
         await session.commit()
         await discord_client.close_bot()
 
@@ -1956,7 +1919,7 @@ async def index_discord_messages(
         logger.info(
             f"Discord indexing completed: {documents_indexed} new channels, {documents_skipped} skipped"
         )
-        return documents_indexed, result_message
+        return documents_indexed, None
 
     except SQLAlchemyError as db_error:
         await session.rollback()
@@ -2063,7 +2026,10 @@ async def index_jira_issues(
         )
 
         jira_client = JiraConnector(
-            base_url=jira_base_url, email=jira_email, api_token=jira_api_token
+            base_url=jira_base_url,
+            email=jira_email,
+            api_token=jira_api_token,
+            max_concurrency=config.CONNECTOR_MAX_CONCURRENCY,
         )
 
         # Calculate date range
@@ -2123,7 +2089,7 @@ async def index_jira_issues(
 
         # Get issues within date range
         try:
-            issues, error = jira_client.get_issues_by_date_range(
+            issues, error = await jira_client.get_issues_by_date_range(
                 start_date=start_date_str, end_date=end_date_str, include_comments=True
             )
 
@@ -2164,92 +2130,72 @@ async def index_jira_issues(
             return 0, f"Error fetching Jira issues: {e!s}"
 
         # Process and index each issue
-        documents_indexed = 0
-        skipped_issues = []
-        documents_skipped = 0
+        stats = IndexingStats()
 
-        for issue in issues:
-            try:
-                issue_id = issue.get("key")
-                issue_identifier = issue.get("key", "")
-                issue_title = issue.get("id", "")
+        # Load per-item sync state so unchanged items can be skipped
+        sync_state = ConnectorSyncState(connector, search_space_id)
+        await sync_state.prune_missing_documents(session)
 
-                if not issue_id or not issue_title:
-                    logger.warning(
-                        f"Skipping issue with missing ID or title: {issue_id or 'Unknown'}"
-                    )
-                    skipped_issues.append(
-                        f"{issue_identifier or 'Unknown'} (missing data)"
-                    )
-                    documents_skipped += 1
-                    continue
-
-                # Format the issue for better readability
-                formatted_issue = jira_client.format_issue(issue)
+        async def prepare_issue(issue):
+            issue_id = issue.get("key")
+            issue_identifier = issue.get("key", "")
+            issue_title = issue.get("id", "")
 
-                # Convert to markdown
-                issue_content = jira_client.format_issue_to_markdown(formatted_issue)
-
-                if not issue_content:
-                    logger.warning(
-                        f"Skipping issue with no content: {issue_identifier} - {issue_title}"
-                    )
-                    skipped_issues.append(f"{issue_identifier} (no content)")
-                    documents_skipped += 1
-                    continue
+            if not issue_id or not issue_title:
+                logger.warning(
+                    f"Skipping issue with missing ID or title: {issue_id or 'Unknown'}"
+                )
+                stats.skip(f"{issue_identifier or 'Unknown'} (missing data)")
+                return None
 
-                # Create a simple summary
-                summary_content = f"Jira Issue {issue_identifier}: {issue_title}\n\nStatus: {formatted_issue.get('status', 'Unknown')}\n\n"
-                if formatted_issue.get("description"):
-                    summary_content += (
-                        f"Description: {formatted_issue.get('description')}\n\n"
-                    )
+            # Skip issues that are unchanged since the last sync before
+            # formatting them; new comments also update the issue
+            version = issue.get("fields", {}).get("updated") or None
+            if sync_state.is_unchanged(issue_identifier, version):
+                logger.info(
+                    f"Issue {issue_identifier} is unchanged since the last sync. Skipping processing."
+                )
+                stats.skip()
+                return None
 
-                # Add comment count
-                comment_count = len(formatted_issue.get("comments", []))
-                summary_content += f"Comments: {comment_count}"
+            # Format the issue for better readability
+            formatted_issue = jira_client.format_issue(issue)
 
-                # Generate content hash
-                content_hash = generate_content_hash(issue_content, search_space_id)
+            # Convert to markdown
+            issue_content = jira_client.format_issue_to_markdown(formatted_issue)
 
-                # Check if document already exists
-                existing_doc_by_hash_result = await session.execute(
-                    select(Document).where(Document.content_hash == content_hash)
+            if not issue_content:
+                logger.warning(
+                    f"Skipping issue with no content: {issue_identifier} - {issue_title}"
                 )
-                existing_document_by_hash = (
-                    existing_doc_by_hash_result.scalars().first()
+                stats.skip(f"{issue_identifier} (no content)")
+                return None
+
+            # Create a simple summary
+            summary_content = f"Jira Issue {issue_identifier}: {issue_title}\n\nStatus: {formatted_issue.get('status', 'Unknown')}\n\n"
+            if formatted_issue.get("description"):
+                summary_content += (
+                    f"Description: {formatted_issue.get('description')}\n\n"
                 )
 
-                if existing_document_by_hash:
-                    logger.info(
-                        f"Document with content hash {content_hash} already exists for issue {issue_identifier}. Skipping processing."
-                    )
-                    documents_skipped += 1
-                    continue
-
-                # Generate embedding for the summary
-                summary_embedding = config.embedding_model_instance.embed(
-                    summary_content
-                )
-
-                # Process chunks - using the full issue content with comments
-                chunks = [
-                    Chunk(
-                        content=chunk.text,
-                        embedding=config.embedding_model_instance.embed(chunk.text),
-                    )
-                    for chunk in config.chunker_instance.chunk(issue_content)
-                ]
-
-                # Create and store new document
-                logger.info(
-                    f"Creating new document for issue {issue_identifier} - {issue_title}"
-                )
-                document = Document(
-                    search_space_id=search_space_id,
-                    title=f"Jira - {issue_identifier}: {issue_title}",
-                    document_type=DocumentType.JIRA_CONNECTOR,
-                    document_metadata={
+            # Add comment count
+            comment_count = len(formatted_issue.get("comments", []))
+            summary_content += f"Comments: {comment_count}"
+
+            # Generate content hash
+            content_hash = generate_content_hash(issue_content, search_space_id)
+
+            return DocumentWork(
+                item_key=issue_identifier,
+                version=version or content_hash,
+                label=f"issue {issue_identifier} - {issue_title}",
+                content_hash=content_hash,
+                chunk_content=issue_content,
+                document_fields={
+                    "search_space_id": search_space_id,
+                    "title": f"Jira - {issue_identifier}: {issue_title}",
+                    "document_type": DocumentType.JIRA_CONNECTOR,
+                    "document_metadata": {
                         "issue_id": issue_id,
                         "issue_identifier": issue_identifier,
                         "issue_title": issue_title,
@@ -2257,28 +2203,22 @@ async def index_jira_issues(
                         "comment_count": comment_count,
                         "indexed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     },
-                    content=summary_content,
-                    content_hash=content_hash,
-                    embedding=summary_embedding,
-                    chunks=chunks,
-                )
-
-                session.add(document)
-                documents_indexed += 1
-                logger.info(
-                    f"Successfully indexed new issue {issue_identifier} - {issue_title}"
-                )
+                    "content": summary_content,
+                },
+            )
 
-            except Exception as e:
-                logger.error(
-                    f"Error processing issue {issue.get('identifier', 'Unknown')}: {e!s}",
-                    exc_info=True,
-                )
-                skipped_issues.append(
-                    f"{issue.get('identifier', 'Unknown')} (processing error)"
-                )
-                documents_skipped += 1
-                continue  # Skip this issue and continue with others
+        # Format, embed and store the issues through the staged indexing pipeline
+        await index_documents(
+            session,
+            sync_state,
+            issues,
+            prepare_issue,
+            stats,
+            describe_item=lambda issue: f"issue {issue.get('identifier', 'Unknown')}",
+        )
+        documents_indexed = stats.indexed
+        documents_skipped = stats.skipped
+        skipped_issues = stats.skipped_items
 
         # Update the last_indexed_at timestamp for the connector only if requested
         total_processed = documents_indexed
@@ -2286,6 +2226,9 @@ async def index_jira_issues(
             connector.last_indexed_at = datetime.now()
             logger.info(f"Updated last_indexed_at to {connector.last_indexed_at}")
 
+        # Persist the per-item sync state with the indexed documents
+        sync_state.save()
+
         # Commit all changes
         await session.commit()
         logger.info("Successfully committed all JIRA document changes to database")
@@ -2416,6 +2359,7 @@ async def index_confluence_pages(
             base_url=confluence_base_url,
             email=confluence_email,
             api_token=confluence_api_token,
+            max_concurrency=config.CONNECTOR_MAX_CONCURRENCY,
         )
 
         # Calculate date range
@@ -2475,7 +2419,7 @@ async def index_confluence_pages(
 
         # Get pages within date range
         try:
-            pages, error = confluence_client.get_pages_by_date_range(
+            pages, error = await confluence_client.get_pages_by_date_range(
                 start_date=start_date_str, end_date=end_date_str, include_comments=True
             )
 
@@ -2516,135 +2460,116 @@ async def index_confluence_pages(
             return 0, f"Error fetching Confluence pages: {e!s}"
 
         # Process and index each page
-        documents_indexed = 0
-        skipped_pages = []
-        documents_skipped = 0
+        stats = IndexingStats()
 
-        for page in pages:
-            try:
-                page_id = page.get("id")
-                page_title = page.get("title", "")
-                space_id = page.get("spaceId", "")
+        # Load per-item sync state so unchanged items can be skipped
+        sync_state = ConnectorSyncState(connector, search_space_id)
+        await sync_state.prune_missing_documents(session)
 
-                if not page_id or not page_title:
-                    logger.warning(
-                        f"Skipping page with missing ID or title: {page_id or 'Unknown'}"
-                    )
-                    skipped_pages.append(f"{page_title or 'Unknown'} (missing data)")
-                    documents_skipped += 1
-                    continue
-
-                # Extract page content
-                page_content = ""
-                if page.get("body") and page["body"].get("storage"):
-                    page_content = page["body"]["storage"].get("value", "")
-
-                # Add comments to content
-                comments = page.get("comments", [])
-                comments_content = ""
-                if comments:
-                    comments_content = "\n\n## Comments\n\n"
-                    for comment in comments:
-                        comment_body = ""
-                        if comment.get("body") and comment["body"].get("storage"):
-                            comment_body = comment["body"]["storage"].get("value", "")
-
-                        comment_author = comment.get("version", {}).get(
-                            "authorId", "Unknown"
-                        )
-                        comment_date = comment.get("version", {}).get("createdAt", "")
-
-                        comments_content += f"**Comment by {comment_author}** ({comment_date}):\n{comment_body}\n\n"
+        async def prepare_page(page):
+            page_id = page.get("id")
+            page_title = page.get("title", "")
+            space_id = page.get("spaceId", "")
 
-                # Combine page content with comments
-                full_content = f"# {page_title}\n\n{page_content}{comments_content}"
-
-                if not full_content.strip():
-                    logger.warning(f"Skipping page with no content: {page_title}")
-                    skipped_pages.append(f"{page_title} (no content)")
-                    documents_skipped += 1
-                    continue
-
-                # Create a simple summary
-                summary_content = (
-                    f"Confluence Page: {page_title}\n\nSpace ID: {space_id}\n\n"
-                )
-                if page_content:
-                    # Take first 500 characters of content for summary
-                    content_preview = page_content[:500]
-                    if len(page_content) > 500:
-                        content_preview += "..."
-                    summary_content += f"Content Preview: {content_preview}\n\n"
-
-                # Add comment count
-                comment_count = len(comments)
-                summary_content += f"Comments: {comment_count}"
-
-                # Generate content hash
-                content_hash = generate_content_hash(full_content, search_space_id)
-
-                # Check if document already exists
-                existing_doc_by_hash_result = await session.execute(
-                    select(Document).where(Document.content_hash == content_hash)
+            if not page_id or not page_title:
+                logger.warning(
+                    f"Skipping page with missing ID or title: {page_id or 'Unknown'}"
                 )
-                existing_document_by_hash = (
-                    existing_doc_by_hash_result.scalars().first()
+                stats.skip(f"{page_title or 'Unknown'} (missing data)")
+                return None
+
+            # Skip pages that are unchanged since the last sync before
+            # building their content. Comments do not change the page
+            # version, so they are part of the item version.
+            version = _confluence_page_version(page)
+            if sync_state.is_unchanged(page_id, version):
+                logger.info(
+                    f"Page {page_title} is unchanged since the last sync. Skipping processing."
                 )
-
-                if existing_document_by_hash:
-                    logger.info(
-                        f"Document with content hash {content_hash} already exists for page {page_title}. Skipping processing."
+                stats.skip()
+                return None
+
+            # Extract page content
+            page_content = ""
+            if page.get("body") and page["body"].get("storage"):
+                page_content = page["body"]["storage"].get("value", "")
+
+            # Add comments to content
+            comments = page.get("comments", [])
+            comments_content = ""
+            if comments:
+                comments_content = "\n\n## Comments\n\n"
+                for comment in comments:
+                    comment_body = ""
+                    if comment.get("body") and comment["body"].get("storage"):
+                        comment_body = comment["body"]["storage"].get("value", "")
+
+                    comment_author = comment.get("version", {}).get(
+                        "authorId", "Unknown"
                     )
-                    documents_skipped += 1
-                    continue
+                    comment_date = comment.get("version", {}).get("createdAt", "")
 
-                # Generate embedding for the summary
-                summary_embedding = config.embedding_model_instance.embed(
-                    summary_content
-                )
+                    comments_content += f"**Comment by {comment_author}** ({comment_date}):\n{comment_body}\n\n"
 
-                # Process chunks - using the full page content with comments
-                chunks = [
-                    Chunk(
-                        content=chunk.text,
-                        embedding=config.embedding_model_instance.embed(chunk.text),
-                    )
-                    for chunk in config.chunker_instance.chunk(full_content)
-                ]
-
-                # Create and store new document
-                logger.info(f"Creating new document for page {page_title}")
-                document = Document(
-                    search_space_id=search_space_id,
-                    title=f"Confluence - {page_title}",
-                    document_type=DocumentType.CONFLUENCE_CONNECTOR,
-                    document_metadata={
+            # Combine page content with comments
+            full_content = f"# {page_title}\n\n{page_content}{comments_content}"
+
+            if not full_content.strip():
+                logger.warning(f"Skipping page with no content: {page_title}")
+                stats.skip(f"{page_title} (no content)")
+                return None
+
+            # Create a simple summary
+            summary_content = (
+                f"Confluence Page: {page_title}\n\nSpace ID: {space_id}\n\n"
+            )
+            if page_content:
+                # Take first 500 characters of content for summary
+                content_preview = page_content[:500]
+                if len(page_content) > 500:
+                    content_preview += "..."
+                summary_content += f"Content Preview: {content_preview}\n\n"
+
+            # Add comment count
+            comment_count = len(comments)
+            summary_content += f"Comments: {comment_count}"
+
+            # Generate content hash
+            content_hash = generate_content_hash(full_content, search_space_id)
+
+            return DocumentWork(
+                item_key=page_id,
+                version=version or content_hash,
+                label=f"page {page_title}",
+                content_hash=content_hash,
+                chunk_content=full_content,
+                document_fields={
+                    "search_space_id": search_space_id,
+                    "title": f"Confluence - {page_title}",
+                    "document_type": DocumentType.CONFLUENCE_CONNECTOR,
+                    "document_metadata": {
                         "page_id": page_id,
                         "page_title": page_title,
                         "space_id": space_id,
                         "comment_count": comment_count,
                         "indexed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     },
-                    content=summary_content,
-                    content_hash=content_hash,
-                    embedding=summary_embedding,
-                    chunks=chunks,
-                )
-
-                session.add(document)
-                documents_indexed += 1
-                logger.info(f"Successfully indexed new page {page_title}")
+                    "content": summary_content,
+                },
+            )
 
-            except Exception as e:
-                logger.error(
-                    f"Error processing page {page.get('title', 'Unknown')}: {e!s}",
-                    exc_info=True,
-                )
-                skipped_pages.append(
-                    f"{page.get('title', 'Unknown')} (processing error)"
-                )
-                documents_skipped += 1
-                continue  # Skip this page and continue with others
+        # Format, embed and store the pages through the staged indexing pipeline
+        await index_documents(
+            session,
+            sync_state,
+            pages,
+            prepare_page,
+            stats,
+            describe_item=lambda page: f"page {page.get('title', 'Unknown')}",
+        )
+        documents_indexed = stats.indexed
+        documents_skipped = stats.skipped
+        skipped_pages = stats.skipped_items
 
         # Update the last_indexed_at timestamp for the connector only if requested
         total_processed = documents_indexed
@@ -2652,6 +2577,9 @@ async def index_confluence_pages(
             connector.last_indexed_at = datetime.now()
             logger.info(f"Updated last_indexed_at to {connector.last_indexed_at}")
 
+        # Persist the per-item sync state with the indexed documents
+        sync_state.save()
+
         # Commit all changes
         await session.commit()
         logger.info(
@@ -0,0 +1,390 @@
+"""
+Postgres-backed job queue for background ingestion work.
+
+Jobs are rows in the ``jobs`` table. Workers claim them with
+``SELECT ... FOR UPDATE SKIP LOCKED``, so any number of worker processes on any
+number of nodes can share the queue without a separate broker.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config
+from app.db import Job, JobStatus, async_session_maker
+
+logger = logging.getLogger(__name__)
+
+# Running jobs refresh locked_at this often; jobs whose lock is older than
+# JOB_STALE_AFTER_SECONDS belonged to a dead worker and are requeued.
+JOB_HEARTBEAT_SECONDS = 30
+JOB_STALE_AFTER_SECONDS = 300
+# Failed attempts are retried after JOB_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+JOB_RETRY_BACKOFF_SECONDS = 30
+
+# Claim the next runnable job, preferring users with the fewest running jobs so
+# one large backlog cannot starve everyone else.
+CLAIM_JOB_SQL = text(
+    """
+    WITH running AS (
+        SELECT user_id, count(*) AS running_count
+        FROM jobs
+        WHERE status = 'RUNNING'
+        GROUP BY user_id
+    ),
+    next_job AS (
+        SELECT jobs.id
+        FROM jobs
+        LEFT JOIN running ON running.user_id = jobs.user_id
+        WHERE jobs.status = 'QUEUED'
+          AND jobs.run_after <= now()
+          AND (
+              :max_running_per_user = 0
+              OR coalesce(running.running_count, 0) < :max_running_per_user
+          )
+        ORDER BY coalesce(running.running_count, 0), jobs.run_after, jobs.id
+        LIMIT 1
+        FOR UPDATE OF jobs SKIP LOCKED
+    )
+    UPDATE jobs
+    SET status = 'RUNNING',
+        attempts = jobs.attempts + 1,
+        locked_at = now(),
+        locked_by = :worker_id
+    FROM next_job
+    WHERE jobs.id = next_job.id
+    RETURNING jobs.id, jobs.task_name, jobs.payload, jobs.attempts, jobs.max_attempts
+    """
+)
+
+REQUEUE_STALE_JOBS_SQL = text(
+    """
+    UPDATE jobs
+    SET status = CASE
+            WHEN attempts < max_attempts THEN 'QUEUED'::jobstatus
+            ELSE 'FAILED'::jobstatus
+        END,
+        finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE now() END,
+        run_after = now(),
+        locked_at = NULL,
+        locked_by = NULL,
+        last_error = 'Worker stopped responding while running the job'
+    WHERE status = 'RUNNING'
+      AND locked_at < now() - make_interval(secs => :stale_after_seconds)
+    RETURNING id
+    """
+)
+
+
+class JobFailedError(Exception):
+    """
+    Raised by a job handler whose work reported a failure instead of raising,
+    so the worker retries the job and eventually marks it failed.
+    """
+
+
+def get_job_handlers() -> dict[str, Callable[..., Awaitable[Any]]]:
+    """
+    Get the coroutine functions that run each job type.
+
+    Handlers are called with the job payload as keyword arguments and open
+    their own database session. A job succeeds when its handler returns and
+    fails when it raises.
+    """
+    from app.routes.documents_routes import (
+        process_crawled_url_with_new_session,
+        process_extension_document_with_new_session,
+        process_file_in_background_with_new_session,
+        process_youtube_video_with_new_session,
+    )
+    from app.routes.search_source_connectors_routes import (
+        run_confluence_indexing_with_new_session,
+        run_discord_indexing_with_new_session,
+        run_github_indexing_with_new_session,
+        run_jira_indexing_with_new_session,
+        run_linear_indexing_with_new_session,
+        run_notion_indexing_with_new_session,
+        run_slack_indexing_with_new_session,
+    )
+
+    return {
+        "run_slack_indexing": run_slack_indexing_with_new_session,
+        "run_notion_indexing": run_notion_indexing_with_new_session,
+        "run_github_indexing": run_github_indexing_with_new_session,
+        "run_linear_indexing": run_linear_indexing_with_new_session,
+        "run_jira_indexing": run_jira_indexing_with_new_session,
+        "run_confluence_indexing": run_confluence_indexing_with_new_session,
+        "run_discord_indexing": run_discord_indexing_with_new_session,
+        "process_file_in_background": process_file_in_background_with_new_session,
+        "process_extension_document": process_extension_document_with_new_session,
+        "process_crawled_url": process_crawled_url_with_new_session,
+        "process_youtube_video": process_youtube_video_with_new_session,
+    }
+
+
+async def enqueue_job(
+    session: AsyncSession,
+    task_name: str,
+    user_id,
+    payload: dict[str, Any],
+    max_attempts: int | None = None,
+) -> Job:
+    """
+    Add a job to the queue. The job becomes visible to workers once the
+    caller commits the session.
+
+    Args:
+        session: Database session
+        task_name: Name of the job handler, see get_job_handlers
+        user_id: ID of the user the job runs for, used for fair scheduling
+        payload: JSON-serializable keyword arguments for the handler
+        max_attempts: Attempts before the job is marked failed
+
+    Returns:
+        The queued Job
+    """
+    job = Job(
+        task_name=task_name,
+        payload=payload,
+        user_id=user_id,
+        max_attempts=max_attempts or config.JOB_MAX_ATTEMPTS,
+    )
+    session.add(job)
+    await session.flush()
+    logger.info(f"Queued job {job.id} ({task_name}) for user {user_id}")
+    return job
+
+
+class JobWorker:
+    """
+    Consumes jobs from the queue with bounded concurrency, retries failed
+    jobs with exponential backoff and requeues jobs abandoned by dead workers.
+    """
+
+    def __init__(
+        self,
+        concurrency: int | None = None,
+        max_running_per_user: int | None = None,
+        poll_interval: float | None = None,
+        worker_id: str | None = None,
+    ):
+        """
+        Initialize the job worker
+
+        Args:
+            concurrency: Maximum number of jobs this worker runs at once
+            max_running_per_user: Maximum running jobs per user across all
+                workers, 0 for no limit
+            poll_interval: Seconds to wait before polling an empty queue again
+            worker_id: Identifier recorded on claimed jobs
+        """
+        self.concurrency = max(1, concurrency or config.JOB_WORKER_CONCURRENCY)
+        self.max_running_per_user = max(
+            0,
+            config.JOB_MAX_RUNNING_PER_USER
+            if max_running_per_user is None
+            else max_running_per_user,
+        )
+        self.poll_interval = poll_interval or config.JOB_POLL_INTERVAL_SECONDS
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+
+        self._handlers: dict[str, Callable[..., Awaitable[Any]]] = {}
+        self._running: dict[int, asyncio.Task] = {}
+        self._stop_event = asyncio.Event()
+
+    async def run(self) -> None:
+        """Run until stop() is called, then requeue any unfinished jobs."""
+        self._handlers = get_job_handlers()
+        heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        logger.info(
+            f"Job worker {self.worker_id} started with concurrency {self.concurrency}"
+        )
+
+        try:
+            while not self._stop_event.is_set():
+                job = None
+                if len(self._running) < self.concurrency:
+                    try:
+                        job = await self._claim_job()
+                    except Exception as e:
+                        logger.error(f"Failed to claim job: {e!s}")
+
+                if job is not None:
+                    self._start_job(job)
+                else:
+                    await self._wait_for_capacity()
+        finally:
+            heartbeat_task.cancel()
+            await self._cancel_running_jobs()
+            logger.info(f"Job worker {self.worker_id} stopped")
+
+    def stop(self) -> None:
+        """Stop claiming jobs; running jobs are cancelled and requeued."""
+        self._stop_event.set()
+
+    def _start_job(self, job) -> None:
+        task = asyncio.create_task(self._execute_job(job))
+        self._running[job.id] = task
+        task.add_done_callback(lambda _: self._running.pop(job.id, None))
+
+    async def _wait_for_capacity(self) -> None:
+        """Sleep for the poll interval, waking early on stop or a finished job."""
+        stop_waiter = asyncio.create_task(self._stop_event.wait())
+        try:
+            await asyncio.wait(
+                {stop_waiter, *self._running.values()},
+                timeout=self.poll_interval,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            stop_waiter.cancel()
+
+    async def _claim_job(self):
+        async with async_session_maker() as session:
+            result = await session.execute(
+                CLAIM_JOB_SQL,
+                {
+                    "worker_id": self.worker_id,
+                    "max_running_per_user": self.max_running_per_user,
+                },
+            )
+            job = result.first()
+            await session.commit()
+            return job
+
+    async def _execute_job(self, job) -> None:
+        handler = self._handlers.get(job.task_name)
+        if handler is None:
+            logger.error(f"Job {job.id} has unknown task {job.task_name}")
+            await self._update_job(
+                job.id,
+                status=JobStatus.FAILED,
+                finished_at=datetime.now(UTC),
+                last_error=f"Unknown task: {job.task_name}",
+            )
+            return
+
+        logger.info(f"Running job {job.id} ({job.task_name}), attempt {job.attempts}")
+        try:
+            await handler(**(job.payload or {}))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._handle_job_failure(job, e)
+            return
+
+        await self._update_job(
+            job.id, status=JobStatus.SUCCEEDED, finished_at=datetime.now(UTC)
+        )
+        logger.info(f"Job {job.id} ({job.task_name}) succeeded")
+
+    async def _handle_job_failure(self, job, error: Exception) -> None:
+        if job.attempts < job.max_attempts:
+            delay = JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+            logger.warning(
+                f"Job {job.id} ({job.task_name}) failed on attempt {job.attempts}, "
+                f"retrying in {delay}s: {error!s}"
+            )
+            await self._update_job(
+                job.id,
+                status=JobStatus.QUEUED,
+                run_after=datetime.now(UTC) + timedelta(seconds=delay),
+                last_error=str(error),
+            )
+        else:
+            logger.error(
+                f"Job {job.id} ({job.task_name}) failed after {job.attempts} attempts: {error!s}"
+            )
+            await self._update_job(
+                job.id,
+                status=JobStatus.FAILED,
+                finished_at=datetime.now(UTC),
+                last_error=str(error),
+            )
+
+    async def _update_job(self, job_id: int, **values) -> None:
+        """
+        Record the outcome of a job this worker is running. A job requeued as
+        stale, and possibly claimed by another worker, is left untouched.
+        """
+        async with async_session_maker() as session:
+            result = await session.execute(
+                update(Job)
+                .where(
+                    Job.id == job_id,
+                    Job.locked_by == self.worker_id,
+                    Job.status == JobStatus.RUNNING,
+                )
+                .values(locked_at=None, locked_by=None, **values)
+            )
+            await session.commit()
+
+        if result.rowcount == 0:
+            logger.warning(
+                f"Job {job_id} is no longer locked by worker {self.worker_id}; "
+                "it was requeued as stale, so this attempt's outcome is dropped"
+            )
+
+    async def _heartbeat_loop(self) -> None:
+        """Keep locks on running jobs fresh and requeue jobs of dead workers."""
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                async with async_session_maker() as session:
+                    if self._running:
+                        await session.execute(
+                            update(Job)
+                            .where(
+                                Job.id.in_(list(self._running)),
+                                Job.locked_by == self.worker_id,
+                            )
+                            .values(locked_at=datetime.now(UTC))
+                        )
+                    result = await session.execute(
+                        REQUEUE_STALE_JOBS_SQL,
+                        {"stale_after_seconds": JOB_STALE_AFTER_SECONDS},
+                    )
+                    requeued = result.scalars().all()
+                    await session.commit()
+
+                if requeued:
+                    logger.warning(f"Requeued stale jobs: {requeued}")
+            except Exception as e:
+                logger.error(f"Job heartbeat failed: {e!s}")
+
+    async def _cancel_running_jobs(self) -> None:
+        """Cancel unfinished jobs and put them back on the queue."""
+        if not self._running:
+            return
+
+        job_ids = list(self._running)
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # The interrupted attempt does not count towards max_attempts
+        async with async_session_maker() as session:
+            await session.execute(
+                update(Job)
+                .where(
+                    Job.id.in_(job_ids),
+                    Job.locked_by == self.worker_id,
+                    Job.status == JobStatus.RUNNING,
+                )
+                .values(
+                    status=JobStatus.QUEUED,
+                    attempts=Job.attempts - 1,
+                    locked_at=None,
+                    locked_by=None,
+                )
+            )
+            await session.commit()
+        logger.info(f"Requeued interrupted jobs: {job_ids}")
@@ -9,6 +9,13 @@ from app.agents.researcher.graph import graph as researcher_graph
 from app.agents.researcher.state import State
 from app.services.streaming_service import StreamingService
 
+# Retrieval profiles of research modes whose latency budget differs from the
+# default: quick answers search less thoroughly than the deepest reports
+RESEARCH_MODE_RETRIEVAL_PROFILES = {
+    "QNA": "fast",
+    "REPORT_DEEPER": "thorough",
+}
+
 
 async def stream_connector_search_results(
     user_query: str,
@@ -20,6 +27,10 @@ async def stream_connector_search_results(
     langchain_chat_history: list[Any],
     search_mode_str: str,
     document_ids_to_add_in_context: list[int],
+    retrieval_profile: str | None = None,
+    connector_retrieval_profiles: dict[str, str] | None = None,
+    semantic_weight: float | None = None,
+    keyword_weight: float | None = None,
 ) -> AsyncGenerator[str, None]:
     """
     Stream connector search results to the client
@@ -31,6 +42,11 @@ async def stream_connector_search_results(
         session: The database session
         research_mode: The research mode
         selected_connectors: List of selected connectors
+        retrieval_profile: Retrieval profile of connector searches, defaulting
+            to the research mode's
+        connector_retrieval_profiles: Retrieval profiles of individual connectors
+        semantic_weight: Overrides the profiles' RRF weight of semantic ranks
+        keyword_weight: Overrides the profiles' RRF weight of keyword ranks
 
     Yields:
         str: Formatted response strings
@@ -47,6 +63,9 @@ async def stream_connector_search_results(
         # Default fallback
         num_sections = 1
 
+    if retrieval_profile is None:
+        retrieval_profile = RESEARCH_MODE_RETRIEVAL_PROFILES.get(research_mode)
+
     # Convert UUID to string if needed
     user_id_str = str(user_id) if isinstance(user_id, UUID) else user_id
 
@@ -66,6 +85,10 @@ async def stream_connector_search_results(
             "search_mode": search_mode,
             "research_mode": research_mode,
             "document_ids_to_add_in_context": document_ids_to_add_in_context,
+            "retrieval_profile": retrieval_profile,
+            "connector_retrieval_profiles": connector_retrieval_profiles or {},
+            "semantic_weight": semantic_weight,
+            "keyword_weight": keyword_weight,
         }
     }
     # Initialize state with database session and streaming service
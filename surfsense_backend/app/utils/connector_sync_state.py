@@ -0,0 +1,228 @@
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+
+from app.db import Chunk, Document, SearchSourceConnector
+from app.utils.document_converters import create_document_chunks
+from app.utils.document_persistence import create_document, replace_document_chunks
+
+
+class ConnectorSyncState:
+    """
+    Per-item sync state of a connector, stored in
+    ``SearchSourceConnector.sync_state`` next to ``last_indexed_at``.
+
+    For every source item (channel, page, issue, file, ...) indexed into a
+    search space it remembers the item's version (an updated timestamp, a git
+    blob SHA, a content hash, or for channels the last message indexed) and
+    the document created for it, so later syncs can skip unchanged items and
+    update changed ones in place. It can also hold connector-wide values
+    cached across syncs with a TTL.
+    """
+
+    def __init__(self, connector: SearchSourceConnector, search_space_id: int):
+        """
+        Load the sync state of a connector for one search space.
+
+        Args:
+            connector: The connector being indexed
+            search_space_id: ID of the search space documents are stored in
+        """
+        self.connector = connector
+        self.search_space_id = search_space_id
+        self.search_space_key = str(search_space_id)
+
+        search_spaces = (connector.sync_state or {}).get("search_spaces", {})
+        self._items: dict[str, dict[str, Any]] = dict(
+            search_spaces.get(self.search_space_key, {}).get("items", {})
+        )
+        self._cache_updates: dict[str, dict[str, Any]] = {}
+
+    def is_unchanged(self, item_key: str, version: str | None) -> bool:
+        """Whether the item was already indexed at this version."""
+        item = self._items.get(str(item_key))
+        return version is not None and item is not None and item["version"] == version
+
+    def get_version(self, item_key: str) -> str | None:
+        """Version the item was last indexed at, if any."""
+        item = self._items.get(str(item_key))
+        return item["version"] if item else None
+
+    def get_document_id(self, item_key: str) -> int | None:
+        """ID of the document previously created for the item, if any."""
+        item = self._items.get(str(item_key))
+        return item["document_id"] if item else None
+
+    def mark_synced(self, item_key: str, version: str, document_id: int) -> None:
+        """Record that the item is indexed at this version as the given document."""
+        self._items[str(item_key)] = {"version": version, "document_id": document_id}
+
+    async def prune_missing_documents(self, session: AsyncSession) -> None:
+        """Forget items whose documents were deleted so they get indexed again."""
+        document_ids = {item["document_id"] for item in self._items.values()}
+        if not document_ids:
+            return
+
+        result = await session.execute(
+            select(Document.id).where(Document.id.in_(document_ids))
+        )
+        existing_ids = set(result.scalars().all())
+        self._items = {
+            key: item
+            for key, item in self._items.items()
+            if item["document_id"] in existing_ids
+        }
+
+    def get_cached(self, key: str, ttl_seconds: float) -> Any | None:
+        """Connector-wide cached value, or None if missing or older than the TTL."""
+        entry = (self.connector.sync_state or {}).get("cache", {}).get(key)
+        if not entry or ttl_seconds <= 0:
+            return None
+
+        age = datetime.now(UTC).timestamp() - entry["cached_at"]
+        return entry["value"] if age < ttl_seconds else None
+
+    def set_cached(self, key: str, value: Any) -> None:
+        """Cache a JSON-serializable connector-wide value, written on save()."""
+        self._cache_updates[key] = {
+            "value": value,
+            "cached_at": datetime.now(UTC).timestamp(),
+        }
+
+    def save(self) -> None:
+        """Write the state back to the connector; committed with the session."""
+        sync_state = dict(self.connector.sync_state or {})
+        search_spaces = dict(sync_state.get("search_spaces", {}))
+        search_spaces[self.search_space_key] = {"items": dict(self._items)}
+        sync_state["search_spaces"] = search_spaces
+        if self._cache_updates:
+            sync_state["cache"] = {
+                **sync_state.get("cache", {}),
+                **self._cache_updates,
+            }
+        # Assign a new dict so SQLAlchemy detects the JSON change
+        self.connector.sync_state = sync_state
+
+
+async def get_synced_document(
+    session: AsyncSession, sync_state: ConnectorSyncState, item_key: str
+) -> Document | None:
+    """
+    Load the document previously indexed for an item, with its chunks.
+
+    Args:
+        session: Database session
+        sync_state: The connector's sync state
+        item_key: Key of the source item
+
+    Returns:
+        The existing document, or None if the item was never indexed
+    """
+    documents = await get_synced_documents(session, sync_state, [item_key])
+    return documents.get(item_key)
+
+
+async def get_synced_documents(
+    session: AsyncSession, sync_state: ConnectorSyncState, item_keys: list[str]
+) -> dict[str, Document]:
+    """
+    Load the documents previously indexed for several items in one query.
+
+    Args:
+        session: Database session
+        sync_state: The connector's sync state
+        item_keys: Keys of the source items
+
+    Returns:
+        Dictionary mapping the keys of previously indexed items to their
+        documents, with chunks loaded
+    """
+    document_ids = {
+        item_key: document_id
+        for item_key in item_keys
+        if (document_id := sync_state.get_document_id(item_key)) is not None
+    }
+    if not document_ids:
+        return {}
+
+    result = await session.execute(
+        select(Document)
+        .options(selectinload(Document.chunks))
+        .where(Document.id.in_(set(document_ids.values())))
+    )
+    documents = {document.id: document for document in result.scalars()}
+    return {
+        item_key: documents[document_id]
+        for item_key, document_id in document_ids.items()
+        if document_id in documents
+    }
+
+
+async def prepare_synced_chunks(
+    existing_document: Document | None, chunk_content: str, chunker=None
+) -> list[Chunk]:
+    """
+    Chunk and embed the content of an item without touching the session,
+    reusing the embeddings of unchanged chunks of the existing document.
+
+    Args:
+        existing_document: Document from get_synced_document, if any
+        chunk_content: Text to chunk for the document
+        chunker: Optional chunker to use (defaults to config.chunker_instance)
+
+    Returns:
+        The chunks for the document
+    """
+    return await create_document_chunks(
+        chunk_content,
+        chunker,
+        reusable_chunks=existing_document.chunks if existing_document else None,
+    )
+
+
+async def save_synced_document(
+    session: AsyncSession,
+    sync_state: ConnectorSyncState,
+    item_key: str,
+    version: str,
+    existing_document: Document | None,
+    chunk_content: str,
+    chunker=None,
+    chunks: list[Chunk] | None = None,
+    **document_fields,
+) -> Document:
+    """
+    Create the document for an item, or update the previously indexed one in
+    place. On update only chunks whose text changed are re-embedded.
+
+    Args:
+        session: Database session
+        sync_state: The connector's sync state
+        item_key: Key of the source item
+        version: Version of the item being indexed
+        existing_document: Document from get_synced_document, if any
+        chunk_content: Text to chunk for the document
+        chunker: Optional chunker to use (defaults to config.chunker_instance)
+        chunks: Chunks already prepared with prepare_synced_chunks, if any
+        **document_fields: Column values for the document
+
+    Returns:
+        The created or updated document
+    """
+    if chunks is None:
+        chunks = await prepare_synced_chunks(existing_document, chunk_content, chunker)
+
+    if existing_document is None:
+        document = await create_document(session, chunks, **document_fields)
+    else:
+        document = existing_document
+        for field, value in document_fields.items():
+            setattr(document, field, value)
+        await session.flush()
+        await replace_document_chunks(session, document, chunks)
+
+    sync_state.mark_synced(item_key, version, document.id)
+    return document
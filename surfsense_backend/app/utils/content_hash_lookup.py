@@ -0,0 +1,140 @@
+"""
+Batched lookup of already indexed content hashes.
+
+Connector indexing checks whether an item's content is already stored before
+summarizing and embedding it. Hashes are resolved a batch at a time with one
+``content_hash = ANY(:hashes)`` query that returns only document IDs, and a
+bloom filter of the hashes stored in the search space, built at the start of
+each indexing run, answers most misses without querying at all.
+"""
+
+import hashlib
+import logging
+import math
+from collections.abc import Iterable
+
+from sqlalchemy import String, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.config import config
+from app.db import Document
+
+logger = logging.getLogger(__name__)
+
+# Smallest number of hashes a filter is sized for, leaving room for new documents
+MIN_FILTER_CAPACITY = 1024
+
+
+class ContentHashBloomFilter:
+    """
+    Bloom filter of content hashes. A miss means the hash is certainly not in
+    the set; a hit only means it probably is.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01):
+        """
+        Initialize an empty filter
+
+        Args:
+            capacity: Number of hashes the filter is sized for
+            false_positive_rate: Rate of false hits once it holds capacity hashes
+        """
+        capacity = max(1, capacity)
+        self.size = max(
+            8,
+            math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2),
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str) -> Iterable[int]:
+        # Double hashing over one 128-bit digest
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, value: str) -> None:
+        """Add a hash to the filter."""
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+async def build_content_hash_filter(
+    session: AsyncSession, search_space_id: int
+) -> ContentHashBloomFilter | None:
+    """
+    Build the bloom filter of the content hashes stored in a search space.
+
+    The filter only knows the documents committed when it was built, so it
+    must not outlive the indexing run it was built for: a document stored
+    later by another process would be a false miss.
+
+    Args:
+        session: Database session
+        search_space_id: ID of the search space
+
+    Returns:
+        The filter, or None if filtering is disabled
+    """
+    if not config.CONTENT_HASH_FILTER_ENABLED:
+        return None
+
+    result = await session.execute(
+        select(Document.content_hash).where(Document.search_space_id == search_space_id)
+    )
+    content_hashes = result.scalars().all()
+
+    content_hash_filter = ContentHashBloomFilter(
+        max(MIN_FILTER_CAPACITY, 2 * len(content_hashes))
+    )
+    for content_hash in content_hashes:
+        content_hash_filter.add(content_hash)
+
+    logger.info(
+        f"Built content hash filter for search space {search_space_id} "
+        f"with {len(content_hashes)} documents"
+    )
+    return content_hash_filter
+
+
+async def find_documents_by_content_hash(
+    session: AsyncSession,
+    content_hashes: Iterable[str],
+    content_hash_filter: ContentHashBloomFilter | None = None,
+) -> dict[str, int]:
+    """
+    Find the documents already storing any of the given content hashes.
+
+    Args:
+        session: Database session
+        content_hashes: Hashes to look up
+        content_hash_filter: Filter from build_content_hash_filter, if any;
+            hashes it does not contain are not queried
+
+    Returns:
+        Dictionary mapping each found hash to the ID of its document
+    """
+    candidates = [
+        content_hash
+        for content_hash in dict.fromkeys(content_hashes)
+        if content_hash_filter is None or content_hash in content_hash_filter
+    ]
+    if not candidates:
+        return {}
+
+    result = await session.execute(
+        select(Document.content_hash, Document.id).where(
+            Document.content_hash
+            == any_(bindparam("content_hashes", candidates, type_=ARRAY(String)))
+        )
+    )
+    return {row.content_hash: row.id for row in result}
@@ -1,4 +1,14 @@
+import asyncio
 import hashlib
+import logging
+from typing import Any
+
+from sqlalchemy.future import select
+
+from app.config import config
+from app.db import Chunk, async_session_maker
+
+logger = logging.getLogger(__name__)
 
 
 async def convert_element_to_markdown(element) -> str:
@@ -145,3 +155,93 @@ def generate_content_hash(content: str, search_space_id: int) -> str:
     """Generate SHA-256 hash for the given content combined with search space ID."""
     combined_data = f"{search_space_id}:{content}"
     return hashlib.sha256(combined_data.encode("utf-8")).hexdigest()
+
+
+def generate_chunk_embedding_hash(chunk_text: str) -> str:
+    """Generate SHA-256 hash identifying a chunk text's embedding under the current model."""
+    combined_data = f"{config.EMBEDDING_MODEL}\n{chunk_text}"
+    return hashlib.sha256(combined_data.encode("utf-8")).hexdigest()
+
+
+async def get_stored_chunk_embeddings(embedding_hashes: list[str]) -> dict[str, Any]:
+    """
+    Look up embeddings already stored in the chunks table by embedding hash.
+
+    Args:
+        embedding_hashes: Hashes from generate_chunk_embedding_hash
+
+    Returns:
+        Dictionary mapping each found hash to its stored embedding
+    """
+    if not embedding_hashes:
+        return {}
+
+    try:
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(Chunk.embedding_hash, Chunk.embedding)
+                .where(
+                    Chunk.embedding_hash.in_(embedding_hashes),
+                    Chunk.embedding.is_not(None),
+                )
+                .distinct(Chunk.embedding_hash)
+            )
+            return {row.embedding_hash: row.embedding for row in result}
+    except Exception as e:
+        # Reuse is only an optimization; fall back to embedding everything
+        logger.warning(f"Failed to look up stored chunk embeddings: {e!s}")
+        return {}
+
+
+async def create_document_chunks(
+    content: str, chunker=None, reusable_chunks: list[Chunk] | None = None
+) -> list[Chunk]:
+    """
+    Chunk content and embed all chunks in one batched, off-loop call.
+
+    Chunk texts that were embedded before with the same model reuse their
+    stored vectors from the chunks table; only new texts are embedded.
+
+    Args:
+        content: The text to chunk
+        chunker: Optional chunker to use (defaults to config.chunker_instance)
+        reusable_chunks: Existing chunks (e.g. of a previous version of the same
+            document) whose embeddings are reused without a database lookup
+
+    Returns:
+        List of Chunk objects with embeddings, ready to attach to a Document
+    """
+    chunker = chunker or config.chunker_instance
+    raw_chunks = await asyncio.to_thread(chunker.chunk, content)
+    chunk_texts = [chunk.text for chunk in raw_chunks]
+    chunk_hashes = [generate_chunk_embedding_hash(text) for text in chunk_texts]
+
+    known_embeddings = {
+        generate_chunk_embedding_hash(chunk.content): chunk.embedding
+        for chunk in reusable_chunks or []
+        if chunk.embedding is not None
+    }
+    missing_hashes = list(
+        dict.fromkeys(h for h in chunk_hashes if h not in known_embeddings)
+    )
+    known_embeddings.update(await get_stored_chunk_embeddings(missing_hashes))
+
+    # Embed each remaining distinct text once
+    texts_to_embed = {
+        h: text
+        for h, text in zip(chunk_hashes, chunk_texts, strict=True)
+        if h not in known_embeddings
+    }
+    new_embeddings = await config.embedding_service.embed_texts(
+        list(texts_to_embed.values())
+    )
+    known_embeddings.update(zip(texts_to_embed, new_embeddings, strict=True))
+
+    return [
+        Chunk(
+            content=chunk_text,
+            embedding=known_embeddings[chunk_hash],
+            embedding_hash=chunk_hash,
+        )
+        for chunk_text, chunk_hash in zip(chunk_texts, chunk_hashes, strict=True)
+    ]
@@ -0,0 +1,228 @@
+"""
+Bulk persistence of documents and their chunks.
+
+Adding a ``Document`` with a ``chunks`` relationship makes SQLAlchemy insert
+every chunk as its own row with a text pgvector literal. Here the document row
+is inserted on its own and its chunks are written in one ``COPY ... FROM STDIN``
+in PostgreSQL's binary format (vectors in pgvector's binary representation)
+when the session runs on asyncpg, or in one executemany INSERT otherwise.
+"""
+
+import logging
+import struct
+from collections.abc import AsyncIterator, Iterable, Iterator
+from datetime import UTC, datetime
+
+import asyncpg
+from pgvector import Vector
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import Chunk, Document, DocumentType
+
+logger = logging.getLogger(__name__)
+
+CHUNK_COPY_COLUMNS = (
+    "content",
+    "embedding",
+    "embedding_hash",
+    "document_id",
+    "search_space_id",
+    "document_type",
+    "created_at",
+)
+
+# Rows encoded into one piece of the COPY data stream
+COPY_ROWS_PER_PIECE = 256
+
+_PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_PGCOPY_TRAILER = struct.pack("!h", -1)
+_PGCOPY_NULL = struct.pack("!i", -1)
+_POSTGRES_EPOCH = datetime(2000, 1, 1, tzinfo=UTC)
+
+
+def _encode_copy_field(value: bytes | None) -> bytes:
+    """Encode one field of a binary COPY row: its length followed by its bytes."""
+    if value is None:
+        return _PGCOPY_NULL
+    return struct.pack("!i", len(value)) + value
+
+
+def _encode_text(value: str | None) -> bytes | None:
+    return value.encode("utf-8") if value is not None else None
+
+
+def _encode_vector(value) -> bytes | None:
+    if value is None:
+        return None
+    return (value if isinstance(value, Vector) else Vector(value)).to_binary()
+
+
+def _encode_timestamptz(value: datetime) -> bytes:
+    # Microseconds since 2000-01-01 UTC
+    delta = value - _POSTGRES_EPOCH
+    microseconds = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return struct.pack("!q", microseconds)
+
+
+def encode_chunk_copy_data(
+    document: Document,
+    chunks: Iterable[Chunk],
+    created_at: datetime | None = None,
+    rows_per_piece: int = COPY_ROWS_PER_PIECE,
+) -> Iterator[bytes]:
+    """
+    Encode chunks as a binary COPY data stream for CHUNK_COPY_COLUMNS.
+
+    Args:
+        document: The flushed document the chunks belong to
+        chunks: Chunks to encode
+        created_at: Creation time of the rows (defaults to now)
+        rows_per_piece: Rows encoded into each yielded piece
+
+    Yields:
+        Consecutive pieces of the COPY data, header and trailer included
+    """
+    # Columns copied from the document are the same in every row
+    document_fields = (
+        _encode_copy_field(struct.pack("!i", document.id))
+        + _encode_copy_field(struct.pack("!i", document.search_space_id))
+        + _encode_copy_field(_encode_text(_document_type_name(document)))
+    )
+    created_at_field = _encode_copy_field(
+        _encode_timestamptz(created_at or datetime.now(UTC))
+    )
+    field_count = struct.pack("!h", len(CHUNK_COPY_COLUMNS))
+
+    piece = bytearray(_PGCOPY_HEADER)
+    rows_in_piece = 0
+    for chunk in chunks:
+        piece += field_count
+        piece += _encode_copy_field(_encode_text(chunk.content))
+        piece += _encode_copy_field(_encode_vector(chunk.embedding))
+        piece += _encode_copy_field(_encode_text(chunk.embedding_hash))
+        piece += document_fields
+        piece += created_at_field
+
+        rows_in_piece += 1
+        if rows_in_piece >= rows_per_piece:
+            yield bytes(piece)
+            piece = bytearray()
+            rows_in_piece = 0
+
+    piece += _PGCOPY_TRAILER
+    yield bytes(piece)
+
+
+def _document_type_name(document: Document) -> str:
+    # Enum columns store member names, like SQLAlchemy does
+    document_type = document.document_type
+    return (
+        document_type.name if isinstance(document_type, DocumentType) else document_type
+    )
+
+
+async def _iterate(pieces: Iterable[bytes]) -> AsyncIterator[bytes]:
+    for piece in pieces:
+        yield piece
+
+
+async def _get_asyncpg_connection(session: AsyncSession):
+    """The session's asyncpg connection, or None when it uses another driver."""
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+    return (
+        driver_connection if isinstance(driver_connection, asyncpg.Connection) else None
+    )
+
+
+async def insert_chunks(
+    session: AsyncSession, document: Document, chunks: list[Chunk]
+) -> int:
+    """
+    Insert the chunks of a document in bulk, within the session's transaction.
+
+    The chunks are only read from, not added to the session, so they stay
+    transient (without IDs).
+
+    Args:
+        session: Database session
+        document: The document the chunks belong to, already flushed
+        chunks: Chunks to insert, e.g. from create_document_chunks
+
+    Returns:
+        Number of inserted chunks
+    """
+    if not chunks:
+        return 0
+
+    driver_connection = await _get_asyncpg_connection(session)
+    if driver_connection is not None:
+        await driver_connection.copy_to_table(
+            Chunk.__tablename__,
+            source=_iterate(encode_chunk_copy_data(document, chunks)),
+            columns=CHUNK_COPY_COLUMNS,
+            format="binary",
+        )
+    else:
+        created_at = datetime.now(UTC)
+        await session.execute(
+            insert(Chunk.__table__),
+            [
+                {
+                    "content": chunk.content,
+                    "embedding": chunk.embedding,
+                    "embedding_hash": chunk.embedding_hash,
+                    "document_id": document.id,
+                    "search_space_id": document.search_space_id,
+                    "document_type": document.document_type,
+                    "created_at": created_at,
+                }
+                for chunk in chunks
+            ],
+        )
+
+    return len(chunks)
+
+
+async def create_document(
+    session: AsyncSession, chunks: list[Chunk], **document_fields
+) -> Document:
+    """
+    Create a document and bulk insert its chunks, without committing.
+
+    Args:
+        session: Database session
+        chunks: Chunks of the document, e.g. from create_document_chunks
+        **document_fields: Column values for the document
+
+    Returns:
+        The created document (its chunks relationship is not loaded)
+    """
+    document = Document(**document_fields)
+    session.add(document)
+    await session.flush()
+
+    await insert_chunks(session, document, chunks)
+    return document
+
+
+async def replace_document_chunks(
+    session: AsyncSession, document: Document, chunks: list[Chunk]
+) -> None:
+    """
+    Replace all chunks of an existing document, without committing.
+
+    Args:
+        session: Database session
+        document: The persisted document
+        chunks: The document's new chunks
+    """
+    await session.execute(
+        delete(Chunk.__table__).where(Chunk.__table__.c.document_id == document.id)
+    )
+    await insert_chunks(session, document, chunks)
+
+    # The loaded collection no longer matches the table
+    session.expire(document, ["chunks"])
@@ -0,0 +1,145 @@
+"""
+Shared async HTTP client for connector API calls.
+
+One pooled ``httpx.AsyncClient`` is kept per event loop so indexing tasks reuse
+keep-alive (and, where the server supports it, HTTP/2) connections instead of
+opening a new TLS connection for every request. ``ConnectorRequestLimiter``
+bounds how many requests a connector has in flight and backs off on 429s.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import random
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create a pooled async HTTP client from the CONNECTOR_HTTP_* settings.
+
+    Returns:
+        A new httpx.AsyncClient
+    """
+    from app.config import config
+
+    # HTTP/2 needs the optional h2 package
+    http2 = config.CONNECTOR_HTTP2 and importlib.util.find_spec("h2") is not None
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=config.CONNECTOR_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=config.CONNECTOR_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(config.CONNECTOR_HTTP_TIMEOUT_SECONDS),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client of the running event loop, creating it on first use.
+
+    Returns:
+        The shared httpx.AsyncClient
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = create_http_client()
+        _clients[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client of the running event loop, if any."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+        logger.info("Closed shared connector HTTP client")
+
+
+class ConnectorRequestLimiter:
+    """
+    Caps the number of concurrent requests a connector makes and retries
+    rate-limited (429) responses. When one request is rate limited, all
+    requests sharing the limiter pause until the backoff has passed.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        """
+        Initialize the request limiter
+
+        Args:
+            max_concurrency: Maximum number of requests in flight at once
+            max_retries: Retries of a rate-limited request before giving up
+            base_delay: Initial backoff in seconds when no Retry-After is sent
+            max_delay: Upper bound for a single backoff in seconds
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._resume_at = 0.0
+
+    async def request(
+        self, client: httpx.AsyncClient, method: str, url: str, **kwargs
+    ) -> httpx.Response:
+        """
+        Send a request once a concurrency slot is free, retrying on 429.
+
+        Args:
+            client: HTTP client to send the request with
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed to httpx.AsyncClient.request
+
+        Returns:
+            The response; the last 429 response if retries are exhausted
+        """
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            # Wait out a backoff triggered by any request sharing this limiter
+            delay = self._resume_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            async with self._semaphore:
+                response = await client.request(method, url, **kwargs)
+
+            if response.status_code != 429 or attempt >= self.max_retries:
+                return response
+
+            delay = self._get_retry_delay(response, attempt)
+            self._resume_at = max(self._resume_at, loop.time() + delay)
+            attempt += 1
+            logger.warning(
+                f"Rate limited by {response.url.host}, retrying in {delay:.1f}s "
+                f"(attempt {attempt}/{self.max_retries})"
+            )
+
+    def _get_retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """Use the Retry-After header if given, else exponential backoff with jitter."""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(self.max_delay, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+
+        delay = min(self.max_delay, self.base_delay * 2**attempt)
+        return delay * random.uniform(0.5, 1.0)
@@ -0,0 +1,457 @@
+"""
+Staged producer/consumer pipeline for connector indexing.
+
+Items flow from a source through async stages (e.g. fetch/transform, dedupe,
+summarize, embed, persist) connected by bounded queues. Each stage runs with
+its own concurrency, a full queue holds back the stages before it, and stages
+that use the database session take turns on it. Finished items are committed
+in batches, so the LLM summary and embeddings of one item overlap with the
+network fetch of the next ones instead of everything running in sequence.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterable, Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config
+from app.db import Chunk, Document
+from app.prompts import SUMMARY_PROMPT_TEMPLATE
+from app.utils.connector_sync_state import (
+    ConnectorSyncState,
+    get_synced_documents,
+    prepare_synced_chunks,
+    save_synced_document,
+)
+from app.utils.content_hash_lookup import (
+    build_content_hash_filter,
+    find_documents_by_content_hash,
+)
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the items on a stage's input queue
+_DONE = object()
+
+
+@dataclass
+class PipelineStage:
+    """A step of an IndexingPipeline."""
+
+    name: str
+    handler: Callable[[Any], Awaitable[Any]]
+    concurrency: int = 1
+    uses_session: bool = False
+    batch_size: int = 1
+
+
+class IndexingPipeline:
+    """
+    Runs items through stages connected by bounded asyncio queues.
+
+    A stage handler receives the output of the previous stage and returns the
+    input of the next one, or None to drop the item. Batched stages receive a
+    list of the items that are ready (at most batch_size) and return a list
+    with one result per item. Handler errors are reported through
+    ``on_error`` and drop only the failing item (or batch).
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        queue_size: int = 16,
+        commit_every: int = 0,
+        before_commit: Callable[[], None] | None = None,
+    ):
+        """
+        Initialize the pipeline
+
+        Args:
+            session: Database session shared by the stages that use it
+            queue_size: Maximum number of items waiting between two stages
+            commit_every: Commit after this many items finished the last stage
+                (0 to leave committing to the caller)
+            before_commit: Called right before each batch commit, e.g. to
+                persist the connector's sync state with the batch
+        """
+        self.session = session
+        self.queue_size = max(1, queue_size)
+        self.commit_every = commit_every
+        self.before_commit = before_commit
+        self.stages: list[PipelineStage] = []
+
+        self.completed = 0
+        self._session_lock = asyncio.Lock()
+
+    def add_stage(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        concurrency: int = 1,
+        uses_session: bool = False,
+        batch_size: int = 1,
+    ) -> "IndexingPipeline":
+        """
+        Append a stage to the pipeline.
+
+        Args:
+            name: Stage name used in logs
+            handler: Async function processing one item
+            concurrency: Number of items the stage works on at once
+            uses_session: Whether the handler uses the database session; such
+                handlers never run at the same time as each other
+            batch_size: When above 1, the handler receives a list of up to
+                this many items that are already waiting, instead of one item
+
+        Returns:
+            The pipeline, for chaining
+        """
+        self.stages.append(
+            PipelineStage(
+                name, handler, max(1, concurrency), uses_session, max(1, batch_size)
+            )
+        )
+        return self
+
+    async def run(
+        self,
+        items: Iterable[Any] | AsyncIterable[Any],
+        on_error: Callable[[Any, str, Exception], None] | None = None,
+    ) -> None:
+        """
+        Feed items through all stages and wait until every item is done.
+
+        Args:
+            items: Source items, consumed lazily as the first stage has room
+            on_error: Called with the item, the stage name and the exception
+                when a handler fails (defaults to logging the error)
+        """
+        if not self.stages:
+            raise ValueError("IndexingPipeline has no stages")
+
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        tasks = [asyncio.create_task(self._feed(items, queues[0]))]
+        for index, stage in enumerate(self.stages):
+            output = queues[index + 1] if index + 1 < len(queues) else None
+            next_stage = self.stages[index + 1] if output is not None else None
+            tasks.append(
+                asyncio.create_task(
+                    self._run_stage(stage, queues[index], output, next_stage, on_error)
+                )
+            )
+
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _feed(
+        self, items: Iterable[Any] | AsyncIterable[Any], queue: asyncio.Queue
+    ) -> None:
+        """Put the source items on the first queue, waiting while it is full."""
+        if isinstance(items, AsyncIterable):
+            async for item in items:
+                await queue.put(item)
+        else:
+            for item in items:
+                await queue.put(item)
+
+        for _ in range(self.stages[0].concurrency):
+            await queue.put(_DONE)
+
+    async def _run_stage(
+        self,
+        stage: PipelineStage,
+        input_queue: asyncio.Queue,
+        output_queue: asyncio.Queue | None,
+        next_stage: PipelineStage | None,
+        on_error: Callable[[Any, str, Exception], None] | None,
+    ) -> None:
+        """Run the workers of one stage, then signal the next stage to finish."""
+
+        async def worker():
+            done = False
+            while not done:
+                item = await input_queue.get()
+                if item is _DONE:
+                    return
+
+                # Batched stages also take the items already waiting, without
+                # holding back the first one for more to arrive
+                items = [item]
+                while stage.batch_size > 1 and len(items) < stage.batch_size:
+                    try:
+                        item = input_queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if item is _DONE:
+                        done = True
+                        break
+                    items.append(item)
+
+                handler_input = items if stage.batch_size > 1 else items[0]
+                try:
+                    if stage.uses_session:
+                        async with self._session_lock:
+                            result = await stage.handler(handler_input)
+                    else:
+                        result = await stage.handler(handler_input)
+                except Exception as e:
+                    for failed_item in items:
+                        if on_error:
+                            on_error(failed_item, stage.name, e)
+                        else:
+                            logger.error(
+                                f"Indexing stage '{stage.name}' failed: {e!s}",
+                                exc_info=True,
+                            )
+                    continue
+
+                outputs = result if stage.batch_size > 1 else [result]
+                for output in outputs:
+                    if output is None:
+                        continue
+                    if output_queue is not None:
+                        await output_queue.put(output)
+                    else:
+                        await self._item_completed()
+
+        await asyncio.gather(*(worker() for _ in range(stage.concurrency)))
+
+        if output_queue is not None:
+            for _ in range(next_stage.concurrency):
+                await output_queue.put(_DONE)
+
+    async def _item_completed(self) -> None:
+        """Count a finished item and commit once a batch is complete."""
+        self.completed += 1
+        if self.commit_every and self.completed % self.commit_every == 0:
+            async with self._session_lock:
+                if self.before_commit:
+                    self.before_commit()
+                await self.session.commit()
+            logger.info(f"Committed a batch of {self.commit_every} indexed documents")
+
+
+@dataclass
+class IndexingStats:
+    """Counts of a connector indexing run."""
+
+    indexed: int = 0
+    skipped: int = 0
+    skipped_items: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+    def skip(self, reason: str | None = None) -> None:
+        """Count a skipped item, listing it in the result message if a reason is given."""
+        self.skipped += 1
+        if reason:
+            self.skipped_items.append(reason)
+
+
+@dataclass
+class DocumentWork:
+    """A source item on its way to becoming a document."""
+
+    item_key: str
+    version: str | None
+    label: str
+    content_hash: str
+    chunk_content: str
+    document_fields: dict[str, Any]
+    # Document text summarized by the user's LLM into the document content;
+    # when None, document_fields must already contain the content
+    summary_input: str | None = None
+    chunker: Any = None
+    # Index as a new document instead of updating the item's previous one,
+    # for items like channels whose syncs each fetch only new content
+    new_document: bool = False
+    existing_document: Document | None = None
+    chunks: list[Chunk] | None = None
+
+
+async def index_documents(
+    session: AsyncSession,
+    sync_state: ConnectorSyncState,
+    items: Iterable[Any] | AsyncIterable[Any],
+    prepare: Callable[[Any], Awaitable[DocumentWork | None]],
+    stats: IndexingStats,
+    describe_item: Callable[[Any], str] = str,
+    user_llm=None,
+    prepare_concurrency: int | None = None,
+) -> None:
+    """
+    Index source items as documents through a staged pipeline:
+
+    1. prepare: fetch and format an item (connector specific, concurrent)
+    2. dedupe: skip content that is already indexed and load the documents
+       previously created for the items, a batch of items per query; a
+       bloom filter of the stored hashes, built when the run starts, skips
+       the query for hashes it certainly does not hold
+    3. summarize: summarize the document with the user's LLM (concurrent)
+    4. embed: embed the summary and the chunks (concurrent)
+    5. persist: create or update the document in a savepoint, committed in
+       batches
+
+    Args:
+        session: Database session
+        sync_state: The connector's sync state; saved with every batch commit
+        items: Source items, consumed lazily
+        prepare: Turns a source item into a DocumentWork, or returns None
+            (after counting the skip in stats) to skip it
+        stats: Counters updated while indexing
+        describe_item: Describes a source item in error reports
+        user_llm: LLM for summaries; required if prepare sets summary_input
+        prepare_concurrency: Items prepared at once (defaults to
+            CONNECTOR_MAX_CONCURRENCY)
+    """
+    claimed_hashes: set[str] = set()
+    # Built for this run only: documents stored afterwards by other processes
+    # are missing from it, which persist tolerates as a hash conflict
+    content_hash_filter = None
+    content_hash_filter_built = False
+
+    async def dedupe(batch: list[DocumentWork]) -> list[DocumentWork | None]:
+        nonlocal content_hash_filter, content_hash_filter_built
+        if not content_hash_filter_built:
+            content_hash_filter = await build_content_hash_filter(
+                session, sync_state.search_space_id
+            )
+            content_hash_filter_built = True
+
+        existing_document_ids = await find_documents_by_content_hash(
+            session,
+            [work.content_hash for work in batch],
+            content_hash_filter,
+        )
+
+        new_work = []
+        results: list[DocumentWork | None] = []
+        for work in batch:
+            existing_document_id = existing_document_ids.get(work.content_hash)
+            if existing_document_id is not None:
+                sync_state.mark_synced(
+                    work.item_key, work.version, existing_document_id
+                )
+                logger.info(
+                    f"Document with content hash {work.content_hash} already exists for {work.label}. Skipping processing."
+                )
+                stats.skip()
+                results.append(None)
+            elif work.content_hash in claimed_hashes:
+                # Another item of this run already produced the same content
+                logger.info(
+                    f"Content of {work.label} is already being indexed in this run. Skipping."
+                )
+                stats.skip()
+                results.append(None)
+            else:
+                claimed_hashes.add(work.content_hash)
+                new_work.append(work)
+                results.append(work)
+
+        existing_documents = await get_synced_documents(
+            session,
+            sync_state,
+            [work.item_key for work in new_work if not work.new_document],
+        )
+        for work in new_work:
+            work.existing_document = existing_documents.get(work.item_key)
+        return results
+
+    async def summarize(work: DocumentWork) -> DocumentWork | None:
+        if work.summary_input is None:
+            return work
+        if not user_llm:
+            stats.skip(f"{work.label} (no LLM configured)")
+            return None
+
+        summary_chain = SUMMARY_PROMPT_TEMPLATE | user_llm
+        summary_result = await summary_chain.ainvoke({"document": work.summary_input})
+        work.document_fields["content"] = summary_result.content
+        return work
+
+    async def embed(work: DocumentWork) -> DocumentWork:
+        work.document_fields["embedding"] = await config.embedding_service.embed_text(
+            work.document_fields["content"]
+        )
+        work.chunks = await prepare_synced_chunks(
+            work.existing_document, work.chunk_content, work.chunker
+        )
+        return work
+
+    async def persist(work: DocumentWork) -> DocumentWork | None:
+        # Create the document, or update the previously indexed one in place.
+        # The savepoint confines a database error to this item; otherwise it
+        # would abort the transaction holding the rest of the batch.
+        try:
+            async with session.begin_nested():
+                await save_synced_document(
+                    session,
+                    sync_state,
+                    work.item_key,
+                    work.version,
+                    work.existing_document,
+                    work.chunk_content,
+                    chunks=work.chunks,
+                    content_hash=work.content_hash,
+                    **work.document_fields,
+                )
+        except IntegrityError:
+            # The content was stored by another process since dedupe checked it
+            existing_document_ids = await find_documents_by_content_hash(
+                session, [work.content_hash]
+            )
+            existing_document_id = existing_document_ids.get(work.content_hash)
+            if existing_document_id is None:
+                raise
+            sync_state.mark_synced(work.item_key, work.version, existing_document_id)
+            logger.info(
+                f"Document with content hash {work.content_hash} was stored concurrently for {work.label}. Skipping."
+            )
+            stats.skip()
+            return None
+        stats.indexed += 1
+        logger.info(
+            f"Successfully indexed {'updated' if work.existing_document else 'new'} {work.label}"
+        )
+        return work
+
+    def on_error(item: Any, stage: str, error: Exception) -> None:
+        label = item.label if isinstance(item, DocumentWork) else describe_item(item)
+        logger.error(f"Error indexing {label} ({stage}): {error!s}", exc_info=True)
+        stats.skip(f"{label} (processing error)")
+        stats.errors.append(f"{label}: {error!s}")
+
+    pipeline = (
+        IndexingPipeline(
+            session,
+            queue_size=config.INDEXING_QUEUE_SIZE,
+            commit_every=config.INDEXING_COMMIT_BATCH_SIZE,
+            before_commit=sync_state.save,
+        )
+        .add_stage(
+            "prepare",
+            prepare,
+            concurrency=prepare_concurrency or config.CONNECTOR_MAX_CONCURRENCY,
+        )
+        .add_stage(
+            "dedupe",
+            dedupe,
+            uses_session=True,
+            batch_size=config.INDEXING_DEDUPE_BATCH_SIZE,
+        )
+        .add_stage(
+            "summarize", summarize, concurrency=config.INDEXING_SUMMARIZE_CONCURRENCY
+        )
+        .add_stage("embed", embed, concurrency=config.INDEXING_EMBED_CONCURRENCY)
+        .add_stage("persist", persist, uses_session=True)
+    )
+    await pipeline.run(items, on_error=on_error)
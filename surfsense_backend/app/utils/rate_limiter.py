@@ -0,0 +1,67 @@
+"""
+Async token-bucket rate limiter for connector API calls.
+
+Waits are non-blocking (``asyncio.sleep``), so many concurrent fetches can share
+one limiter without stalling the event loop.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucketRateLimiter:
+    """
+    Allows ``rate`` requests per ``per`` seconds on average, with bursts of up
+    to ``capacity`` requests. Waiting callers are served in arrival order.
+    """
+
+    def __init__(self, rate: float, per: float = 1.0, capacity: float = 1.0):
+        """
+        Initialize the rate limiter
+
+        Args:
+            rate: Number of requests allowed per period
+            per: Length of the period in seconds
+            capacity: Maximum burst size
+        """
+        self.tokens_per_second = rate / per
+        self.capacity = max(1.0, capacity)
+
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated_at) * self.tokens_per_second,
+                )
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.tokens_per_second)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back all requests for the given time, e.g. after the API answered
+        with a Retry-After header.
+
+        Args:
+            seconds: How long to pause
+        """
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0.0
+        self._updated_at = now
@@ -0,0 +1,55 @@
+import argparse
+import asyncio
+import logging
+import signal
+
+from dotenv import load_dotenv
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+load_dotenv()
+
+
+async def run_worker(args):
+    from app.tasks.job_queue import JobWorker
+    from app.utils.http_client import close_http_client
+
+    worker = JobWorker(
+        concurrency=args.concurrency,
+        max_running_per_user=args.max_running_per_user,
+    )
+
+    # Stop claiming jobs and requeue unfinished ones on shutdown
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await close_http_client()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run a SurfSense ingestion worker consuming the job queue"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Maximum number of jobs run at once (defaults to JOB_WORKER_CONCURRENCY)",
+    )
+    parser.add_argument(
+        "--max-running-per-user",
+        type=int,
+        default=None,
+        help="Maximum running jobs per user across all workers, 0 for no limit (defaults to JOB_MAX_RUNNING_PER_USER)",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(run_worker(args))